@@ -1,7 +1,15 @@
-import os, json, requests, openai
+import os, json
 
-def analyze_findings(findings_path="data/results/final_reports/"):
-    openai.api_key = os.getenv("OPENAI_API_KEY")
+from ai.llm_client import LLMClient, BATCH_TOKENS
+from ai.prompt_builder import PromptBuilder, collect_findings
+from core.notifier import shared_notifier
+
+TRIAGE_INSTRUCTION = ("You are a security analyst. Summarize and classify vulnerabilities by severity "
+                      "(Critical/High/Medium/Low). Each finding group carries a count of the findings "
+                      "collapsed into it:")
+TRIAGE_PROMPTS = 4  # most LLM calls one triage run may take (cached groups are free)
+
+def analyze_findings(findings_path="data/results/final_reports/", client=None):
     reports = []
     for file in os.listdir(findings_path):
         if file.endswith(".json"):
@@ -13,20 +21,17 @@ def analyze_findings(findings_path="data/results/final_reports/"):
         print("🚫 No reports found for triage.")
         return None
 
-    summaries = []
-    for rep in reports:
-        summary_prompt = f"""You are a security analyst. Summarize and classify vulnerabilities by severity (Critical/High/Medium/Low):
-        Data: {json.dumps(rep, indent=2)}"""
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "system", "content": "You are a cybersecurity triage AI."},
-                          {"role": "user", "content": summary_prompt}]
-            )
-            ai_summary = response.choices[0].message.content
-            summaries.append(ai_summary)
-        except Exception as e:
-            print("❌ OpenAI triage failed:", e)
+    # Findings are collapsed into ranked (host, signature) groups and cut to TRIAGE_PROMPTS
+    # prompts' worth; the client packs them into requests sent concurrently as compact
+    # JSON, and groups triaged before are answered from the LLM cache
+    findings, other = collect_findings(reports)
+    groups, omitted = PromptBuilder().select(findings, budget_tokens=TRIAGE_PROMPTS * BATCH_TOKENS)
+    items = groups + ([omitted] if omitted else []) + other
+    print(f"🧾 {len(findings)} findings → {len(groups)} groups for triage"
+          + (f" ({omitted['omitted']['findings']} lower-ranked findings summarised)" if omitted else ""))
+    client = client or LLMClient()
+    summaries = client.triage(items, TRIAGE_INSTRUCTION, system="You are a cybersecurity triage AI.")
+    client.metrics.report("triage")
     return summaries
 
 
@@ -35,10 +40,11 @@ def send_to_discord(summaries):
     if not webhook:
         print("⚠️ No Discord webhook configured.")
         return
+    # One embed per summary; the notifier packs them up to 10 per message and paces delivery
+    notifier = shared_notifier()
     for s in summaries:
-        payload = {"content": f"🧠 **AI-Triage Summary:**\n{s}"}
-        requests.post(webhook, json=payload)
-    print("✅ AI summaries sent to Discord.")
+        notifier.notify(embeds=[{"title": "🧠 AI-Triage Summary", "description": s}], webhook_url=webhook)
+    print(f"📨 {len(summaries)} AI summaries queued for Discord.")
 
 
 if __name__ == "__main__":
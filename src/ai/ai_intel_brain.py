@@ -1,71 +1,84 @@
 # src/ai/ai_intel_brain.py
 import os
-import json
-import openai
 from datetime import datetime
 
+from core.memory_store import MemoryStore
+from ai.llm_client import LLMClient
+from ai.prompt_builder import PromptBuilder, PROMPT_BUDGET, DIGEST_HEADER, collect_findings
+from ai.pattern_memory import PatternMemory, PATTERN_WINDOW, PATTERN_MAX_AGE, SEVERITIES
+
 # =========================
 # 🧠 DIGITAL SENTINEL - AI BRAIN
 # =========================
 
 class AIIntelBrain:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, max_patterns=PATTERN_WINDOW, max_pattern_age=PATTERN_MAX_AGE,
+                 prompt_budget=PROMPT_BUDGET):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("❌ Missing OpenAI API Key (set OPENAI_API_KEY env var).")
-        openai.api_key = self.api_key
-        self.memory_file = "data/intel_memory.json"
+        self.llm = LLMClient(api_key=self.api_key)  # cached: identical reports are not re-sent
+        self.prompts = PromptBuilder(budget_tokens=prompt_budget)
+        self.memory_path = "data/intel_memory"
+        self.legacy_memory_file = "data/intel_memory.json"
+        self.max_patterns = max_patterns
+        self.max_pattern_age = max_pattern_age
         self.load_memory()
 
     def load_memory(self):
-        """Load or initialize memory for adaptive learning"""
-        if os.path.exists(self.memory_file):
-            with open(self.memory_file, "r") as f:
-                self.memory = json.load(f)
-        else:
-            self.memory = {"patterns": [], "stats": {"total_scans": 0}}
-            os.makedirs(os.path.dirname(self.memory_file), exist_ok=True)
-            self.save_memory()
+        """Load or initialize memory for adaptive learning (append-only; see core.memory_store)"""
+        self.memory = MemoryStore(self.memory_path)
+        self.memory.import_json(self.legacy_memory_file, convert=lambda data: [
+            ("patterns", data.get("patterns", [])),
+            ("total_scans", data.get("stats", {}).get("total_scans", 0)),
+        ])
+        # Recent analyses in full, older ones rolled up — query through self.patterns
+        self.patterns = PatternMemory(self.memory, window=self.max_patterns, max_age=self.max_pattern_age)
 
     def save_memory(self):
-        with open(self.memory_file, "w") as f:
-            json.dump(self.memory, f, indent=4)
+        """Every update is already on disk; this folds the log into a fresh snapshot."""
+        self.memory.compact()
 
-    def analyze_vulnerabilities(self, report_text: str):
+    def analyze_vulnerabilities(self, report_text, target: str = None):
         """
         Use GPT to analyze vulnerability report and return:
         - Vulnerability summary
         - Risk score
         - CWE/CVSS classifications
         - Recommendations
+
+        `report_text` is free text (cut to the prompt budget) or findings —
+        Finding objects / issue dicts / a report with an "issues" list — which
+        are grouped, de-duplicated and ranked to fit the budget.
         """
-        prompt = f"""
-        You are a cybersecurity AI assistant analyzing vulnerability reports.
-        Analyze the following scan data and summarize:
-        1. Number of vulnerabilities
-        2. Count of high/medium/low severity
-        3. Mention CWE or CVSS scores if available
-        4. Provide overall AI Risk Score (0-100)
-        5. Write 1-2 clear mitigation recommendations.
-        \n\nREPORT DATA:\n{report_text}
-        """
+        if isinstance(report_text, str):
+            report_data = self.prompts.truncate(report_text.strip())
+        else:
+            report_data = "\n".join([DIGEST_HEADER] + self.prompts.digest(collect_findings(report_text)[0]))
+        prompt = (
+            "You are a cybersecurity AI assistant analyzing vulnerability reports.\n"
+            "Analyze the following scan data and summarize:\n"
+            "1. Number of vulnerabilities\n"
+            "2. Count of high/medium/low severity\n"
+            "3. Mention CWE or CVSS scores if available\n"
+            "4. Provide overall AI Risk Score (0-100)\n"
+            "5. Write 1-2 clear mitigation recommendations.\n\n"
+            f"REPORT DATA:\n{report_data}"
+        )
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "system", "content": "You are a cybersecurity analyst."},
-                          {"role": "user", "content": prompt}],
-                max_tokens=600,
-                temperature=0.3
-            )
-            output = response.choices[0].message["content"].strip()
+            output = self.llm.complete(prompt, system="You are a cybersecurity analyst.", max_tokens=600,
+                                       temperature=0.3)
+            if output is None:
+                return {"error": "LLM request failed"}
             ai_data = {
                 "timestamp": str(datetime.utcnow()),
                 "summary": output,
                 "risk_score": self.extract_risk_score(output),
+                "severity_counts": self.extract_severity_counts(output),
+                "target": target or "unknown",
             }
-            self.memory["stats"]["total_scans"] += 1
-            self.memory["patterns"].append(ai_data)
-            self.save_memory()
+            self.memory.incr("total_scans")
+            self.patterns.add(ai_data)
             return ai_data
         except Exception as e:
             return {"error": str(e)}
@@ -79,6 +92,16 @@ class AIIntelBrain:
             return min(max(score, 0), 100)
         return 50  # fallback average
 
+    def extract_severity_counts(self, text: str) -> dict:
+        """Per-severity vulnerability counts from AI output ("High: 2", "3 medium", ...)"""
+        import re
+        counts = {}
+        for severity in SEVERITIES:
+            match = re.search(rf'\b{severity}\b\W{{0,3}}(\d+)|(\d+)\s+{severity}\b', text, re.IGNORECASE)
+            if match:
+                counts[severity] = int(match.group(1) or match.group(2))
+        return counts
+
 # Example standalone usage
 if __name__ == "__main__":
     brain = AIIntelBrain()
@@ -1,7 +1,7 @@
 # src/ai/discord_ai_reporter.py
 import os
-import json
-import requests
+
+from core.notifier import shared_notifier
 
 # =========================
 # 🔔 DIGITAL SENTINEL - DISCORD AI REPORTER
@@ -26,15 +26,9 @@ class DiscordAIReporter:
             "footer": {"text": "Digital Sentinel vInfinity • Adaptive Intelligence Engine"}
         }
 
-        payload = {"embeds": [embed]}
-        try:
-            response = requests.post(self.webhook_url, json=payload)
-            if response.status_code == 204:
-                print(f"✅ Sent AI report to Discord: {target}")
-            else:
-                print(f"⚠️ Discord response: {response.status_code} → {response.text}")
-        except Exception as e:
-            print(f"❌ Discord send error: {e}")
+        # Queued; reports for many targets go out batched up to 10 embeds per message
+        if shared_notifier().notify(embeds=[embed], webhook_url=self.webhook_url):
+            print(f"📨 Queued AI report for Discord: {target}")
 
 # Example standalone usage
 if __name__ == "__main__":
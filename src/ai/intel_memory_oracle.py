@@ -1,23 +1,39 @@
-import os, json, datetime
+import datetime
 
-MEMORY_PATH = "data/cache/validated/memory_oracle.json"
+from core.memory_store import MemoryStore
 
-def load_memory():
-    if os.path.exists(MEMORY_PATH):
-        with open(MEMORY_PATH, "r") as f:
-            return json.load(f)
-    return {"memory_log": []}
+MEMORY_PATH = "data/cache/validated/memory_oracle"
+LEGACY_MEMORY_FILE = "data/cache/validated/memory_oracle.json"
+
+_memory = None
+
+
+def _legacy_entries(data):
+    """memory_oracle.json's log, replayed oldest first so the latest finding per target wins."""
+    for entry in data.get("memory_log", []):
+        for target, finding in entry.get("findings", {}).items():
+            yield target, {"timestamp": entry.get("timestamp"), "findings": finding}
+
+
+def load_memory() -> MemoryStore:
+    """Target → {"timestamp", "findings"}: the latest findings recorded for each target."""
+    global _memory
+    if _memory is None:
+        _memory = MemoryStore(MEMORY_PATH)
+        _memory.import_json(LEGACY_MEMORY_FILE, convert=_legacy_entries)
+    return _memory
 
-def save_memory(memory):
-    with open(MEMORY_PATH, "w") as f:
-        json.dump(memory, f, indent=2)
 
 def update_memory(new_findings):
     memory = load_memory()
     now = datetime.datetime.utcnow().isoformat()
-    memory["memory_log"].append({"timestamp": now, "findings": new_findings})
-    save_memory(memory)
-    print(f"🧬 Memory Oracle updated at {now}")
+    changed = 0
+    for target, findings in new_findings.items():
+        known = memory.get(target)
+        if known is None or known["findings"] != findings:
+            memory.set(target, {"timestamp": now, "findings": findings})
+            changed += 1
+    print(f"🧬 Memory Oracle updated at {now} — {changed} of {len(new_findings)} targets new or changed")
 
 if __name__ == "__main__":
     # Example usage
@@ -0,0 +1,309 @@
+# src/ai/llm_client.py
+import os
+import time
+import random
+import sqlite3
+import asyncio
+import hashlib
+import threading
+
+import aiohttp
+
+from core.record_stream import encode, decode
+from core.rate_limiter import retry_after_seconds
+
+# =========================
+# 🤖 DIGITAL SENTINEL - LLM CLIENT
+# =========================
+# One layer for every chat-completion call the AI modules make:
+#   • OpenAI-compatible HTTP API (OPENAI_BASE_URL, e.g. a local stub or proxy)
+#   • concurrent requests under a cap, retried on 429/5xx
+#   • triage(): many small items packed into one prompt, oversized items split
+#     across prompts, everything sent as compact JSON
+#   • content-hash result cache (SQLite): a prompt or triage batch already
+#     answered is never sent again
+#   • metrics: latency, prompt/completion tokens, cache hits
+
+LLM_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "gpt-4o-mini"
+LLM_CONCURRENCY = 8        # completions in flight at once
+BATCH_TOKENS = 3000        # prompt budget for the items packed into one triage call
+BUCKET_FILL = 0.75         # share of BATCH_TOKENS a triage hash bucket is sized to hold on average
+REQUEST_TIMEOUT = 120      # seconds per completion
+MAX_RETRIES = 3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+CACHE_PATH = os.path.join("data", "cache", "llm", "results.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key        TEXT PRIMARY KEY,
+    response   TEXT NOT NULL,
+    model      TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local estimate: ~4 characters per token for English and JSON."""
+    return len(text) // 4 + 1
+
+
+def content_key(*parts) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+def split_item(item, budget_chars: int) -> list:
+    """
+    Break an item whose compact JSON exceeds `budget_chars` into pieces that
+    fit: lists by element, dicts by halving their largest list, anything
+    else by slicing its JSON text.
+    """
+    if len(encode(item)) <= budget_chars:
+        return [item]
+    if isinstance(item, list):
+        if len(item) == 1:
+            return split_item(item[0], budget_chars)
+        half = len(item) // 2
+        return split_item(item[:half], budget_chars) + split_item(item[half:], budget_chars)
+    if isinstance(item, dict):
+        lists = [(len(encode(v)), k) for k, v in item.items() if isinstance(v, list) and len(v) > 1]
+        if lists:
+            _, key = max(lists)
+            half = len(item[key]) // 2
+            return (split_item(dict(item, **{key: item[key][:half]}), budget_chars)
+                    + split_item(dict(item, **{key: item[key][half:]}), budget_chars))
+    text = encode(item)
+    return [text[i:i + budget_chars] for i in range(0, len(text), budget_chars)]
+
+
+def item_lines(items, budget_tokens: int = BATCH_TOKENS):
+    """Compact JSON line per item, oversized items split into several lines that each fit."""
+    budget_chars = budget_tokens * 4
+    for item in items:
+        for piece in split_item(item, budget_chars):
+            yield piece if isinstance(piece, str) else encode(piece)
+
+
+def pack(lines, budget_tokens: int = BATCH_TOKENS) -> list:
+    """Greedy packing of lines into batches of at most `budget_tokens`; returns lists of line indexes."""
+    budget_chars = budget_tokens * 4
+    batches, current, used = [], [], 0
+    for idx, line in enumerate(lines):
+        if current and used + len(line) + 1 > budget_chars:
+            batches.append(current)
+            current, used = [], 0
+        current.append(idx)
+        used += len(line) + 1
+    if current:
+        batches.append(current)
+    return batches
+
+
+def bucket_pack(lines, budget_tokens: int = BATCH_TOKENS) -> list:
+    """
+    pack(), but batches are drawn by content instead of position: each line
+    goes to the bucket its hash prefix names (a power-of-two bucket count,
+    sized so a bucket averages BUCKET_FILL of the budget) and only a bucket
+    that overflows is split. Adding, dropping or re-ranking one item changes
+    its own batch and leaves every other batch — and its cache key — alone.
+    """
+    budget_chars = budget_tokens * 4
+    total = sum(len(line) + 1 for line in lines)
+    buckets = 1
+    while total > buckets * budget_chars * BUCKET_FILL:
+        buckets *= 2
+    grouped = {}
+    for digest, idx in sorted((hashlib.sha1(line.encode()).digest(), idx) for idx, line in enumerate(lines)):
+        grouped.setdefault(int.from_bytes(digest[:8], "big") * buckets >> 64, []).append(idx)
+    batches = []
+    for bucket in sorted(grouped):
+        members = grouped[bucket]
+        batches += [[members[i] for i in batch] for batch in pack([lines[i] for i in members], budget_tokens)]
+    return batches
+
+
+class LLMCache:
+    """Completion text by content hash."""
+
+    def __init__(self, path: str = CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def get(self, key: str):
+        with self.lock:
+            row = self.conn.execute("SELECT response FROM results WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, keys, response: str, model: str):
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results (key, response, model, created_at) VALUES (?, ?, ?, ?)",
+                [(key, response, model, time.time()) for key in keys])
+
+    def close(self):
+        self.conn.close()
+
+
+class LLMMetrics:
+    FIELDS = ("requests", "errors", "retries", "cache_hits", "cache_misses", "prompt_tokens",
+              "completion_tokens", "latency_s")
+
+    def __init__(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+        self.latencies = []
+
+    def snapshot(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def report(self, label: str = "llm") -> dict:
+        stats = self.snapshot()
+        latencies = sorted(self.latencies)
+        p50 = latencies[len(latencies) // 2] if latencies else 0.0
+        print(f"🤖 LLM [{label}] {self.requests} requests ({self.errors} failed, {self.retries} retried), "
+              f"{self.cache_hits} cache hits / {self.cache_misses} misses, "
+              f"{self.prompt_tokens} prompt + {self.completion_tokens} completion tokens, p50 {p50:.2f}s")
+        return stats
+
+
+class LLMClient:
+    def __init__(self, api_key=None, base_url=None, model=DEFAULT_MODEL, concurrency=LLM_CONCURRENCY,
+                 cache=None, timeout=REQUEST_TIMEOUT):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = (base_url or os.getenv("OPENAI_BASE_URL") or LLM_BASE_URL).rstrip("/")
+        self.model = model
+        self.concurrency = concurrency
+        self.cache = cache if cache is not None else LLMCache()
+        self.timeout = timeout
+        self.metrics = LLMMetrics()
+
+    # ---------- one completion ----------
+    async def _post(self, session, messages, max_tokens, temperature) -> str:
+        payload = {"model": self.model, "messages": messages, "temperature": temperature}
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            async with session.post(f"{self.base_url}/chat/completions", data=encode(payload), headers=headers,
+                                    timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                body = await response.read()
+                status, response_headers = response.status, response.headers
+            elapsed = time.perf_counter() - started
+            self.metrics.requests += 1
+            self.metrics.latency_s += elapsed
+            self.metrics.latencies.append(elapsed)
+            if status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                delay = retry_after_seconds(response_headers)
+                if delay is not None and delay > self.timeout:
+                    # A quota reset, not a blip: fail this call rather than hold its slot for that long
+                    raise RuntimeError(f"LLM API returned {status} with Retry-After {delay:.0f}s")
+                self.metrics.retries += 1
+                await asyncio.sleep(delay if delay is not None else 2 ** attempt * random.uniform(0.8, 1.2))
+                attempt += 1
+                continue
+            if status != 200:
+                raise RuntimeError(f"LLM API returned {status}: {body[:200].decode(errors='replace')}")
+            data = decode(body)
+            usage = data.get("usage") or {}
+            prompt = "".join(m["content"] for m in messages)
+            text = data["choices"][0]["message"]["content"].strip()
+            self.metrics.prompt_tokens += usage.get("prompt_tokens") or estimate_tokens(prompt)
+            self.metrics.completion_tokens += usage.get("completion_tokens") or estimate_tokens(text)
+            return text
+
+    async def _complete(self, session, limit, messages, keys, max_tokens, temperature):
+        """Completion for `messages`, stored under every cache key in `keys`; None on failure."""
+        async with limit:
+            try:
+                text = await self._post(session, messages, max_tokens, temperature)
+            except Exception as e:
+                self.metrics.errors += 1
+                print(f"❌ LLM request failed: {e}")
+                return None
+        self.cache.put_many(keys, text, self.model)
+        return text
+
+    async def complete_many(self, prompts, system="You are a cybersecurity analyst.", max_tokens=None,
+                            temperature=0.3) -> list:
+        """Answer each prompt (cached ones without a request), concurrently; None where a call failed."""
+        keys = [content_key(self.model, system, prompt) for prompt in prompts]
+        answers = {}
+        pending = {}  # key → prompt, each distinct prompt sent once
+        for key, prompt in zip(keys, prompts):
+            if key in answers or key in pending:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.metrics.cache_hits += 1
+                answers[key] = cached
+            else:
+                self.metrics.cache_misses += 1
+                pending[key] = prompt
+
+        if pending:
+            limit = asyncio.Semaphore(self.concurrency)
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            async with aiohttp.ClientSession(connector=connector) as session:
+                replies = await asyncio.gather(*(
+                    self._complete(session, limit, [{"role": "system", "content": system},
+                                                    {"role": "user", "content": prompt}],
+                                   [key], max_tokens, temperature)
+                    for key, prompt in pending.items()))
+            answers.update(zip(pending, replies))
+        return [answers[key] for key in keys]
+
+    def complete(self, prompt, system="You are a cybersecurity analyst.", max_tokens=None, temperature=0.3):
+        """Blocking single completion for synchronous callers."""
+        return asyncio.run(self.complete_many([prompt], system, max_tokens, temperature))[0]
+
+    # ---------- batched triage ----------
+    async def triage_async(self, items, instruction, system="You are a cybersecurity triage AI.",
+                           budget_tokens=BATCH_TOKENS, max_tokens=None, temperature=0.3) -> list:
+        """
+        Analyse many items in few calls. One reply covers a whole batch, so it
+        is cached under the batch's content (instruction + its item lines, in
+        any order): a batch whose items are unchanged is not sent again, and
+        changing any item re-asks about its batch-mates rather than serving a
+        reply written about the item's old version. Batches are drawn by
+        content hash (bucket_pack), so a new or re-ranked item only costs its
+        own batch. Returns the distinct answers.
+        """
+        lines = list(dict.fromkeys(item_lines(items, budget_tokens)))
+        answers, batches = [], []
+        for batch in bucket_pack(lines, budget_tokens):
+            batch_lines = [lines[i] for i in batch]
+            key = content_key(self.model, system, instruction, *sorted(batch_lines))
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.metrics.cache_hits += 1
+                if cached not in answers:
+                    answers.append(cached)
+            else:
+                self.metrics.cache_misses += 1
+                batches.append(([key], batch_lines))
+
+        if batches:
+            limit = asyncio.Semaphore(self.concurrency)
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            async with aiohttp.ClientSession(connector=connector) as session:
+                replies = await asyncio.gather(*(
+                    self._complete(session, limit,
+                                   [{"role": "system", "content": system},
+                                    {"role": "user", "content": f"{instruction}\nData (one JSON item per line):\n"
+                                                                + "\n".join(batch_lines)}],
+                                   keys, max_tokens, temperature)
+                    for keys, batch_lines in batches))
+            answers.extend(reply for reply in replies if reply is not None)
+        return answers
+
+    def triage(self, items, instruction, **kwargs) -> list:
+        return asyncio.run(self.triage_async(items, instruction, **kwargs))
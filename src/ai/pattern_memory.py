@@ -0,0 +1,139 @@
+# src/ai/pattern_memory.py
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+# =========================
+# 🧠 DIGITAL SENTINEL - PATTERN MEMORY
+# =========================
+# Tiered memory of AI analyses, kept in a core.memory_store.MemoryStore:
+#   • recent window — the last `window` analyses in full ("pattern:<seq>")
+#   • aggregates    — anything older is rolled into per-target statistics
+#                     ("aggregate:<target>"): analysis count, per-severity
+#                     counts, a risk-score histogram, first/last seen
+# Analyses leave the window when it is full or when they are older than
+# `max_age` seconds, so memory and the on-disk snapshot stay bounded.
+
+PATTERN_WINDOW = 200                 # analyses kept in full
+PATTERN_MAX_AGE = 30 * 24 * 3600     # seconds before an analysis is rolled up regardless
+RISK_BUCKETS = 10                    # histogram bins over the 0-100 risk score
+SEVERITIES = ("critical", "high", "medium", "low")
+
+PATTERN_PREFIX = "pattern:"
+AGGREGATE_PREFIX = "aggregate:"
+
+
+def empty_aggregate() -> dict:
+    return {"analyses": 0, "severity_counts": {s: 0 for s in SEVERITIES},
+            "risk_histogram": [0] * RISK_BUCKETS, "first_seen": None, "last_seen": None}
+
+
+def risk_bucket(score) -> int:
+    return min(RISK_BUCKETS - 1, max(0, int(score or 0)) * RISK_BUCKETS // 100)
+
+
+def fold(aggregate: dict, entry: dict) -> dict:
+    """`aggregate` with one analysis added (a new dict; the stored one is never mutated)."""
+    merged = {
+        "analyses": aggregate["analyses"] + 1,
+        "severity_counts": dict(aggregate["severity_counts"]),
+        "risk_histogram": list(aggregate["risk_histogram"]),
+        "first_seen": min(filter(None, (aggregate["first_seen"], entry["recorded_at"]))),
+        "last_seen": max(filter(None, (aggregate["last_seen"], entry["recorded_at"]))),
+    }
+    for severity, count in (entry.get("severity_counts") or {}).items():
+        merged["severity_counts"][severity] = merged["severity_counts"].get(severity, 0) + count
+    merged["risk_histogram"][risk_bucket(entry.get("risk_score"))] += 1
+    return merged
+
+
+class PatternMemory:
+    def __init__(self, store, window=PATTERN_WINDOW, max_age=PATTERN_MAX_AGE):
+        self.store = store
+        self.window = window
+        self.max_age = max_age
+        # (seq, recorded_at) of the analyses still held in full, oldest first
+        self.order = deque(sorted(
+            (int(key[len(PATTERN_PREFIX):]), entry["recorded_at"])
+            for key, entry in store.items() if key.startswith(PATTERN_PREFIX)
+        ))
+        self._migrate_pattern_list()
+        self.evict()
+
+    def _migrate_pattern_list(self):
+        """Fold in the unbounded "patterns" list older versions of AIIntelBrain kept."""
+        legacy = self.store.get("patterns")
+        if legacy is None:
+            return
+        for entry in legacy:
+            try:
+                recorded_at = datetime.fromisoformat(entry["timestamp"]).replace(tzinfo=timezone.utc).timestamp()
+            except (KeyError, TypeError, ValueError):
+                recorded_at = None
+            self.add(dict(entry, recorded_at=recorded_at), evict=False)
+        self.store.delete("patterns")
+
+    # ---------- writes ----------
+    def add(self, entry: dict, evict=True) -> dict:
+        """Record one analysis ({"target", "risk_score", "severity_counts", ...})."""
+        entry = dict(entry, target=entry.get("target") or "unknown",
+                     recorded_at=entry.get("recorded_at") or time.time())
+        seq = self.store.incr("pattern_seq")
+        self.store.set(f"{PATTERN_PREFIX}{seq:010d}", entry)
+        self.order.append((seq, entry["recorded_at"]))
+        if evict:
+            self.evict()
+        return entry
+
+    def evict(self, now=None) -> int:
+        """Roll analyses beyond the window or older than max_age into aggregates; returns how many."""
+        now = now or time.time()
+        evicted = 0
+        while self.order and (len(self.order) > self.window or now - self.order[0][1] > self.max_age):
+            seq, _ = self.order.popleft()
+            key = f"{PATTERN_PREFIX}{seq:010d}"
+            entry = self.store.get(key)
+            if entry is not None:
+                aggregate_key = AGGREGATE_PREFIX + entry["target"]
+                self.store.set(aggregate_key, fold(self.store.get(aggregate_key) or empty_aggregate(), entry))
+                self.store.delete(key)
+            evicted += 1
+        return evicted
+
+    # ---------- queries ----------
+    def recent(self, limit=None, target=None) -> list:
+        """Analyses still held in full, newest first."""
+        found = []
+        for seq, _ in reversed(self.order):
+            entry = self.store.get(f"{PATTERN_PREFIX}{seq:010d}")
+            if entry is not None and (target is None or entry["target"] == target):
+                found.append(entry)
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def targets(self) -> list:
+        names = {key[len(AGGREGATE_PREFIX):] for key in self.store.keys() if key.startswith(AGGREGATE_PREFIX)}
+        names.update(entry["target"] for entry in self.recent())
+        return sorted(names)
+
+    def stats(self, target=None) -> dict:
+        """Whole-history statistics (rolled-up aggregates + the recent window), for one target or all."""
+        total = empty_aggregate()
+        for key, aggregate in list(self.store.items()):
+            if key.startswith(AGGREGATE_PREFIX) and (target is None or key[len(AGGREGATE_PREFIX):] == target):
+                total["analyses"] += aggregate["analyses"]
+                for severity, count in aggregate["severity_counts"].items():
+                    total["severity_counts"][severity] = total["severity_counts"].get(severity, 0) + count
+                total["risk_histogram"] = [a + b for a, b in zip(total["risk_histogram"],
+                                                                 aggregate["risk_histogram"])]
+                total["first_seen"] = min(filter(None, (total["first_seen"], aggregate["first_seen"])),
+                                          default=None)
+                total["last_seen"] = max(filter(None, (total["last_seen"], aggregate["last_seen"])),
+                                         default=None)
+        for entry in self.recent(target=target):
+            total = fold(total, entry)
+        return total
+
+    def __len__(self) -> int:
+        return len(self.order)
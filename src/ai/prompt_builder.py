@@ -0,0 +1,137 @@
+# src/ai/prompt_builder.py
+import re
+from textwrap import dedent
+
+from core.findings import Finding, SEVERITY_RANK, url_path
+from core.record_stream import encode
+from ai.llm_client import estimate_tokens
+
+# =========================
+# 🧾 DIGITAL SENTINEL - PROMPT BUILDER
+# =========================
+# Turns raw findings into the densest prompt that fits a token budget:
+#   1. group by (host, signature)
+#   2. collapse near-duplicates — same severity and same URL shape once ids,
+#      numbers and query values are masked — into one entry with a count
+#   3. if the per-host groups don't fit the budget, merge the same issue
+#      across hosts into one group with a host count
+#   4. rank groups by severity, then by how many findings they cover
+#   5. emit compact JSON lines until the budget (chars/4 estimate) is spent;
+#      whatever doesn't fit is summarised in one closing "omitted" line
+
+PROMPT_BUDGET = 3000     # tokens of finding data per prompt
+MAX_EXAMPLES = 3         # example URLs kept per group
+DIGEST_HEADER = "Findings (one JSON group per line; count = findings collapsed into it):"
+VARIABLE_TOKENS = re.compile(r"[0-9a-f]{8,}(?:-[0-9a-f]{4,})*|\d+", re.IGNORECASE)
+
+
+def url_shape(url: str) -> str:
+    """/users/1234/orders?id=9&sort=asc → /users/{n}/orders?id&sort"""
+    query = url.split("#", 1)[0].partition("?")[2]
+    keys = sorted({pair.split("=", 1)[0] for pair in query.split("&") if pair})
+    shape = VARIABLE_TOKENS.sub("{n}", url_path(url))
+    return f"{shape}?{'&'.join(keys)}" if keys else shape
+
+
+def collect_findings(reports) -> tuple:
+    """
+    (findings, other): the issue/finding records inside `reports` (report
+    dicts with an "issues" or "findings" list, bare lists, or single issue
+    dicts) as Finding objects, and whatever isn't shaped like a finding.
+    """
+    findings, other = [], []
+    for report in reports if isinstance(reports, list) else [reports]:
+        if isinstance(report, Finding):
+            findings.append(report)
+        elif isinstance(report, dict) and isinstance(report.get("issues", report.get("findings")), list):
+            findings.extend(Finding.from_dict(issue) for issue in report.get("issues", report.get("findings"))
+                            if isinstance(issue, dict))
+        elif isinstance(report, dict) and any(k in report for k in ("url", "target", "endpoint")):
+            findings.append(Finding.from_dict(report))
+        elif isinstance(report, list):
+            more, rest = collect_findings(report)
+            findings.extend(more)
+            other.extend(rest)
+        else:
+            other.append(report)
+    return findings, other
+
+
+class PromptBuilder:
+    def __init__(self, budget_tokens=PROMPT_BUDGET, max_examples=MAX_EXAMPLES):
+        self.budget_tokens = budget_tokens
+        self.max_examples = max_examples
+
+    def groups(self, findings) -> list:
+        """Collapsed, ranked groups: most severe first, then the most widespread."""
+        groups = {}
+        for finding in findings:
+            if not isinstance(finding, Finding):
+                finding = Finding.from_dict(finding)
+            key = (finding.host, finding.signature, finding.severity, url_shape(finding.url))
+            group = groups.get(key)
+            if group is None:
+                groups[key] = group = {"host": finding.host, "signature": finding.signature or "unknown",
+                                       "severity": finding.severity, "shape": key[3], "count": 0, "examples": []}
+                if finding.description:
+                    description = finding.description.replace(finding.url, "{url}") if finding.url else \
+                        finding.description
+                    group["description"] = VARIABLE_TOKENS.sub("{n}", description)
+            group["count"] += 1
+            if finding.url and len(group["examples"]) < self.max_examples and finding.url not in group["examples"]:
+                group["examples"].append(finding.url)
+        return sorted(groups.values(), key=lambda g: (-SEVERITY_RANK[g["severity"]], -g["count"], g["host"]))
+
+    def merge_hosts(self, groups) -> list:
+        """The same signature, severity and URL shape on many hosts as one group."""
+        merged = {}
+        for group in groups:
+            key = (group["signature"], group["severity"], group["shape"])
+            target = merged.get(key)
+            if target is None:
+                merged[key] = target = {k: v for k, v in group.items() if k != "host"}
+                target.update(hosts=0, count=0, host_examples=[], examples=list(group["examples"]))
+            target["hosts"] += 1
+            target["count"] += group["count"]
+            if len(target["host_examples"]) < self.max_examples:
+                target["host_examples"].append(group["host"])
+        return sorted(merged.values(), key=lambda g: (-SEVERITY_RANK[g["severity"]], -g["count"], g["shape"]))
+
+    def select(self, findings, budget_tokens=None) -> tuple:
+        """
+        (groups, omitted): the highest-ranked groups whose compact JSON fits
+        the budget, and a summary of the rest (None when everything fit).
+        """
+        budget = budget_tokens or self.budget_tokens
+        groups = self.groups(findings)
+        if sum(estimate_tokens(encode(group)) for group in groups) > budget:
+            groups = self.merge_hosts(groups)
+        used = 0
+        for idx, group in enumerate(groups):
+            used += estimate_tokens(encode(group))
+            if used > budget:
+                rest = groups[idx:]
+                by_severity = {}
+                for g in rest:
+                    by_severity[g["severity"]] = by_severity.get(g["severity"], 0) + g["count"]
+                return groups[:idx], {"omitted": {"groups": len(rest), "findings": sum(g["count"] for g in rest),
+                                                  "by_severity": by_severity}}
+        return groups, None
+
+    def digest(self, findings, budget_tokens=None) -> list:
+        """select() as compact JSON lines, the "omitted" summary last."""
+        kept, omitted = self.select(findings, budget_tokens)
+        return [encode(item) for item in kept + ([omitted] if omitted else [])]
+
+    def build(self, instruction: str, findings, budget_tokens=None) -> str:
+        """One prompt: the instruction followed by the digest of `findings`."""
+        lines = self.digest(findings, budget_tokens)
+        return "\n".join([dedent(instruction).strip(), DIGEST_HEADER] + lines)
+
+    def truncate(self, text: str, budget_tokens=None) -> str:
+        """Free text cut to the budget on a line boundary."""
+        limit = (budget_tokens or self.budget_tokens) * 4
+        if len(text) <= limit:
+            return text
+        cut = text.rfind("\n", 0, limit)
+        return text[:cut if cut > 0 else limit] + "\n[truncated]"
@@ -0,0 +1 @@
+# marks benchmarks as a Python package
@@ -0,0 +1,99 @@
+"""
+Digital Sentinel - Link Extractor Benchmark
+===========================================
+Generates real-world-sized HTML fixtures, checks every extractor returns
+exactly what the BeautifulSoup reference returns, then times each one.
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_extractors.py [rounds]
+"""
+
+import sys
+import time
+import random
+
+from crawler.extractors import EXTRACTORS, SoupExtractor, get_extractor, etree
+
+BASE_URL = "https://shop.example.com/catalog/index.html"
+
+
+def make_fixture(seed: int, sections: int) -> str:
+    """A storefront-like page: nav, product grid, forms, inline JS, comments and entities."""
+    rnd = random.Random(seed)
+    parts = [
+        "<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\">",
+        "<title>Shop &amp; Save — Catalog</title>",
+        "<link rel=\"stylesheet\" href=\"/assets/site.css\">",
+        "<script src=\"/assets/vendor.js\" defer></script>",
+        "<script async src=\"https://cdn.example.net/analytics.js?v=3\"></script>",
+        "<script>window.CONFIG = {api: \"/api/v2/\", cdn: 'https://cdn.example.net/img/'};",
+        " fetch(\"/api/v2/session?ref=home\").then(r => r.json());</script>",
+        "</head><body><!-- <a href=\"/commented-out\">hidden</a> -->",
+        "<nav><ul>",
+    ]
+    for i in range(40):
+        parts.append(f"<li class=\"nav-item\"><a href=\"/category/{i}?sort=price&amp;dir=asc\">Cat {i}</a></li>")
+    parts.append("</ul></nav><main>")
+    for s in range(sections):
+        parts.append(f"<section id=\"s{s}\"><h2>Section {s}</h2><div class=\"grid\">")
+        for p in range(rnd.randint(20, 40)):
+            pid = rnd.randint(1, 10 ** 6)
+            parts.append(
+                f"<div class=\"card\" data-id=\"{pid}\"><a href=\"/product/{pid}#reviews\">"
+                f"<img src=\"/img/{pid}.jpg\" alt=\"Product {pid}\"></a>"
+                f"<p>Great product &lt;{pid}&gt; with a long marketing description that pads the page "
+                f"out to something closer to real storefront sizes.</p>"
+                f"<a href=\"HTTPS://SHOP.EXAMPLE.COM/cart/add?id={pid}\" class=btn>Add</a></div>"
+            )
+        parts.append("</div>")
+        if s % 5 == 0:
+            parts.append(
+                f"<form action=\"/search/{s}\" method=\"POST\"><input type=\"text\" name=\"q\">"
+                f"<select name=\"cat\"><option>all</option></select><textarea name=\"note\"></textarea>"
+                f"<input type=\"hidden\" name=\"csrf\" value=\"{rnd.random()}\"><button name=\"go\">Go</button></form>"
+            )
+        if s % 7 == 0:
+            parts.append(f"<script>var track{s} = '/track/{s}?t=' + Date.now(); if (a < b) {{ x(); }}</script>")
+        parts.append("</section>")
+    parts.append("</main><footer><a href=\"mailto:help@example.com\">Mail</a>")
+    parts.append("<a href=\"javascript:void(0)\">Top</a><a href=\"\">Self</a><a href>Bare</a>")
+    parts.append("<script src=\"../legacy/old.js\"></script></footer></body></html>")
+    return "".join(parts)
+
+
+FIXTURES = {
+    "small (~60KB)": make_fixture(1, 6),
+    "medium (~300KB)": make_fixture(2, 30),
+    "large (~1.5MB)": make_fixture(3, 150),
+}
+
+
+def check_parity():
+    reference = SoupExtractor()
+    for label, html in FIXTURES.items():
+        expected = reference.extract(html, BASE_URL).as_dict()
+        for name in EXTRACTORS:
+            if name == "soup" or (name == "lxml" and etree is None):
+                continue
+            got = get_extractor(name).extract(html, BASE_URL).as_dict()
+            for key in expected:
+                assert got[key] == expected[key], f"{name} differs from soup on {label}: {key}"
+    print("✅ Parity: every extractor matches BeautifulSoup on all fixtures.")
+
+
+def bench(rounds: int = 5):
+    for label, html in FIXTURES.items():
+        print(f"\n📄 {label} — {len(html) / 1024:.0f} KB")
+        for name in EXTRACTORS:
+            if name == "lxml" and etree is None:
+                continue
+            extractor = get_extractor(name)
+            start = time.perf_counter()
+            for _ in range(rounds):
+                extractor.extract(html, BASE_URL)
+            per_page = (time.perf_counter() - start) / rounds
+            print(f"   {name:<10} {per_page * 1000:8.1f} ms/page  {len(html) / per_page / 2 ** 20:6.1f} MB/s")
+
+
+if __name__ == "__main__":
+    check_parity()
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
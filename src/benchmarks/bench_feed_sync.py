@@ -0,0 +1,86 @@
+"""
+Digital Sentinel - Threat Feed Sync Benchmark
+=============================================
+Phase 10 against local stand-ins for OTX, CISA KEV and AbuseIPDB
+(latency + a bandwidth cap per response):
+
+  • before — the old flow: each feed downloaded in full, one after another,
+             every file rewritten as indented JSON
+  • cold   — core.feed_sync into an empty store: sources fetched concurrently
+  • warm   — nothing changed upstream (304 / unchanged version marker)
+  • churn  — a few pulses touched, KEV entries added, blacklist IPs replaced
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_feed_sync.py [num_pulses]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+
+import requests
+
+from core.feed_sync import AbuseIPDBSource, AlienVaultSource, CisaKevSource, FeedStore, FeedSync
+from benchmarks.local_servers import FEED_DATA, FEED_STATS, make_feed_app, serve, update_feeds
+
+
+def before(base: str, workdir: str):
+    """Sequential full downloads, whole-file rewrites."""
+    iocs, url = [], f"{base}/otx/pulses/subscribed?limit=50"
+    while url:
+        page = requests.get(url, timeout=60).json()
+        iocs += [{"type": ioc.get("type"), "indicator": ioc.get("indicator"), "title": pulse.get("name"),
+                  "date": pulse.get("modified")} for pulse in page["results"] for ioc in pulse["indicators"]]
+        url = page.get("next")
+    kev = requests.get(f"{base}/kev/feed.json", timeout=60).json()
+    ips = requests.get(f"{base}/abuseipdb/blacklist", timeout=60).json()
+    for name, data in (("ioc_feed", iocs), ("cve_feed", kev.get("vulnerabilities", [])), ("ip_feed", ips)):
+        with open(os.path.join(workdir, f"{name}.json"), "w") as f:
+            json.dump(data, f, indent=2)
+
+
+def sources(base: str) -> list:
+    abuse = AbuseIPDBSource(f"{base}/abuseipdb/blacklist", api_key="bench")
+    abuse.min_interval = 0   # the real quota would skip it on back-to-back runs
+    return [AlienVaultSource(f"{base}/otx/pulses/subscribed", api_key="bench"),
+            CisaKevSource(f"{base}/kev/feed.json"), abuse]
+
+
+async def bench(pulses: int):
+    workdir = tempfile.mkdtemp(prefix="sentinel_feeds_")
+    app = make_feed_app(pulses=pulses)
+    stats = app[FEED_STATS]
+    async with serve(app) as port:
+        base = f"http://127.0.0.1:{port}"
+        store = FeedStore(os.path.join(workdir, "feeds.db"))
+        sync = FeedSync(sources(base), store)
+        print(f"🛰️ {pulses} OTX pulses, {len(app[FEED_DATA]['kev'])} KEV entries, "
+              f"{len(app[FEED_DATA]['ips'])} blacklisted IPs")
+
+        async def churn():
+            update_feeds(app, pulses=10, kevs=5, ips=200)
+            return await sync.sync_async()
+
+        runs = [("before", lambda: asyncio.to_thread(before, base, workdir)),
+                ("cold", sync.sync_async), ("warm", sync.sync_async), ("churn", churn)]
+        for name, run in runs:
+            requests_before, bytes_before = stats["requests"], stats["bytes"]
+            started = time.perf_counter()
+            results = await run()
+            elapsed = time.perf_counter() - started
+            print(f"  {name:<7} {elapsed:6.2f}s  {stats['requests'] - requests_before:>4} requests  "
+                  f"{(stats['bytes'] - bytes_before) / 1e6:6.1f} MB")
+            for result in results or ():
+                print(f"            {result.name:<11} {result.summary()}")
+        print(f"  store holds {store.count():,} active indicators")
+
+
+def main():
+    pulses = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    asyncio.run(bench(pulses))
+
+
+if __name__ == "__main__":
+    main()
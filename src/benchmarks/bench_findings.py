@@ -0,0 +1,70 @@
+"""
+Digital Sentinel - Finding Codec Benchmark
+==========================================
+Per-million-findings cost of the typed Finding model against the loosely
+shaped dicts it replaced: memory held by N records, encode/decode
+throughput (json keyed dicts vs. the positional orjson rows
+core.findings writes) and the old "[HIGH] ..." text round trip that
+export_bugcrowd used to re-parse.
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_findings.py [num_findings]
+"""
+
+import sys
+import json
+import time
+import tracemalloc
+
+from core import record_stream
+from core.findings import Finding
+
+
+def make(n: int):
+    for i in range(n):
+        url = f"https://host{i % 1000}.example.com/page{i % 3}?id={i}"
+        yield url, ("high", "medium", "info")[i % 3], ("sqli", "xss", "")[i % 3], f"Pattern {i % 3} at {url}"
+
+
+def as_dict(url, severity, signature, description, i):
+    return {"id": i, "url": url, "host": url.split("/")[2], "severity": severity, "signature": signature,
+            "parameter": "id", "description": description, "status": "open", "validated": None,
+            "validated_timestamp": None, "error": None, "found_at": 1700000000.0 + i}
+
+
+def memory(build) -> tuple:
+    tracemalloc.start()
+    records = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return records, size
+
+
+def timed(label: str, fn, n: int):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<34} {elapsed:6.2f}s  → {elapsed * 1e6 / n:5.2f}s per million")
+    return result
+
+
+def bench(n: int = 1000000):
+    print(f"\n🧾 {n} findings (orjson {'on' if record_stream.orjson else 'off'})")
+    dicts, dict_bytes = memory(lambda: [as_dict(*f, i) for i, f in enumerate(make(n))])
+    findings, finding_bytes = memory(lambda: [Finding(u, s, sig, d, parameter="id", id=i, found_at=1700000000.0 + i)
+                                              for i, (u, s, sig, d) in enumerate(make(n))])
+    print(f"   memory: dicts {dict_bytes / n:.0f} B/record, Finding {finding_bytes / n:.0f} B/record")
+
+    lines = timed("encode dicts (json, keyed)", lambda: [json.dumps(d) for d in dicts], n)
+    timed("decode dicts (json, keyed)", lambda: [json.loads(line) for line in lines], n)
+    rows = timed("encode Finding (positional rows)", lambda: [f.encode() for f in findings], n)
+    decoded = timed("decode Finding (positional rows)", lambda: [Finding.decode(row) for row in rows], n)
+    print(f"   bytes/record: keyed {sum(map(len, lines)) / n:.0f}, positional {sum(map(len, rows)) / n:.0f}")
+
+    report = timed("legacy: format [SEV] lines", lambda: [f.as_report_line() for f in findings], n)
+    timed("legacy: re-parse [SEV] lines", lambda: [Finding.from_report_line(line) for line in report], n)
+
+    assert all(a.to_row() == b.to_row() for a, b in zip(findings[:1000], decoded[:1000]))
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,86 @@
+"""
+Digital Sentinel - Findings Store Benchmark
+===========================================
+Replays several scan cycles over a mostly unchanged target set into
+core.findings_store and reports, per cycle, how many findings validation
+and export still have to touch (everything, before the store existed)
+plus the cost of the upsert. Then times the indexed severity / host /
+date queries against a linear scan of findings.jsonl.
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_findings_store.py [findings_per_cycle] [cycles]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+from core.findings import Finding, write_findings, iter_findings
+from core.findings_store import FindingsStore
+
+CHURN = 0.02  # share of findings that appear or change between cycles
+
+
+def cycle_findings(n: int, cycle: int):
+    """The same n findings every cycle, except CHURN of them changed and CHURN replaced by new ones."""
+    churn = int(n * CHURN)
+    for i in range(n):
+        key = n + cycle * churn + i if i < churn else i      # first `churn` slots are new each cycle
+        variant = cycle if churn <= i < 2 * churn else 0     # next `churn` slots change severity each cycle
+        url = f"https://host{key % 500}.example.com/page{key}?id={key}"
+        severity = ("high", "medium", "low")[(key + variant) % 3]
+        yield Finding(url, severity, ("sqli", "xss")[key % 2], f"Pattern at {url}", found_at=time.time())
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    workdir = tempfile.mkdtemp(prefix="sentinel_findings_store_")
+    store = FindingsStore(os.path.join(workdir, "findings.db"))
+    stream = os.path.join(workdir, "findings.jsonl")
+
+    print(f"🗃️ {n:,} findings per cycle, {cycles} cycles, {CHURN:.0%} new + {CHURN:.0%} changed per cycle")
+    for cycle in range(cycles):
+        write_findings(stream, cycle_findings(n, cycle))
+        started = time.perf_counter()
+        new, changed = store.upsert(iter_findings(stream), seen_at=1_700_000_000 + cycle * 86_400)
+        upsert_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        pending = store.pending_validation()
+        for finding in pending:
+            finding.validated = finding.severity == "high"
+        store.mark_validated(pending)
+        exports = store.pending_export("bench", validated_only=True)
+        store.mark_exported(exports, "bench")
+        bookkeeping_s = time.perf_counter() - started
+
+        print(f"  cycle {cycle}: {len(new):>7,} new {len(changed):>6,} changed | to validate "
+              f"{len(pending):>7,} (was {n:,}) | to export {len(exports):>6,} | "
+              f"upsert {upsert_s:.2f}s, bookkeeping {bookkeeping_s:.2f}s")
+
+    total = store.count()
+    queries = {
+        "severity=high": (lambda: store.by_severity("high"),
+                          lambda: [f for f in iter_findings(stream) if f.severity == "high"]),
+        "host=host7": (lambda: store.by_host("host7.example.com"),
+                       lambda: [f for f in iter_findings(stream) if f.host == "host7.example.com"]),
+        # findings.jsonl carries no first-seen date, so there is nothing linear to compare with
+        "first seen last day": (lambda: store.seen_between(1_700_000_000 + (cycles - 1) * 86_400), None),
+    }
+    print(f"\n🔎 Queries over {total:,} stored findings (linear = scanning findings.jsonl)")
+    for name, (indexed, linear) in queries.items():
+        started = time.perf_counter()
+        hits = len(indexed())
+        line = f"  {name:<20} {hits:>7,} hits  indexed {(time.perf_counter() - started) * 1000:8.1f} ms"
+        if linear is not None:
+            started = time.perf_counter()
+            linear()
+            line += f"  linear {(time.perf_counter() - started) * 1000:8.1f} ms"
+        print(line)
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Digital Sentinel - IOC Index Benchmark
+======================================
+Synthetic feeds at realistic sizes written to a FeedStore:
+
+  • OTX        OTX_INDICATORS indicators (IPs, domains, URLs, hashes, CIDRs)
+  • AbuseIPDB  ABUSE_IPS blacklisted addresses
+  • KEV        KEV_ENTRIES entries over a few hundred products
+
+then core.ioc_index.IOCIndex is built from it and fed millions of scan
+artifacts. "naive" is the straightforward join — every artifact checked
+against the feed lists, CIDRs via ipaddress — timed on a small sample.
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_ioc_index.py [num_ip_artifacts]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import ipaddress
+
+from core.feed_sync import FeedStore
+from core.ioc_index import IOCIndex
+
+OTX_INDICATORS = 1_000_000
+CIDRS = 50_000
+ABUSE_IPS = 100_000
+KEV_ENTRIES = 1_200
+HIT_RATE = 0.05
+NAIVE_SAMPLE = 200
+
+
+def random_ip(rng) -> str:
+    return f"{rng.randrange(1, 224)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}"
+
+
+def build_store(path: str, rng) -> tuple:
+    store = FeedStore(path)
+    otx, ips, domains = [], [], []
+    for i in range(OTX_INDICATORS):
+        roll = rng.random()
+        if roll < 0.4:
+            value, kind, type_name = random_ip(rng), "ip", "IPv4"
+            ips.append(value)
+        elif roll < 0.7:
+            value, kind, type_name = f"c2-{i}.evil{i % 5000}.net", "domain", "domain"
+            domains.append(value)
+        elif roll < 0.8:
+            value, kind, type_name = f"http://drop{i}.example/payload{i}.exe", "url", "URL"
+        else:
+            value, kind, type_name = f"{rng.getrandbits(256):064x}", "hash", "FileHash-SHA256"
+        otx.append((f"{type_name}:{value}", kind, value, {"type": type_name, "indicator": value}))
+    cidrs = []
+    for i in range(CIDRS):
+        prefix = rng.choice((16, 20, 24, 24, 24, 28, 32))
+        network = ipaddress.ip_network(f"{random_ip(rng)}/{prefix}", strict=False)
+        cidrs.append(network)
+        otx.append((f"CIDR:{network}", "cidr", str(network), {"type": "CIDR", "indicator": str(network)}))
+    store.merge("alienvault", otx, {})
+    abuse = [random_ip(rng) for _ in range(ABUSE_IPS)]
+    ips += abuse
+    store.merge("abuseipdb", [(ip, "ip", ip, {"ipAddress": ip, "abuseConfidenceScore": 100}) for ip in abuse], {})
+    store.merge("cisa_kev", [(f"CVE-2024-{k}", "cve", f"CVE-2024-{k}",
+                              {"cveID": f"CVE-2024-{k}", "vendorProject": f"vendor{k % 150}",
+                               "product": f"product{k % 400}"}) for k in range(KEV_ENTRIES)], {})
+    return store, ips, domains, cidrs
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    rng = random.Random(23)
+    workdir = tempfile.mkdtemp(prefix="sentinel_ioc_")
+
+    started = time.perf_counter()
+    store, feed_ips, feed_domains, cidrs = build_store(os.path.join(workdir, "feeds.db"), rng)
+    print(f"🗂️  Synthetic feeds: {store.count():,} indicators ({CIDRS:,} CIDRs) written in "
+          f"{time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    index = IOCIndex.from_store(store)
+    print(f"  index build   {time.perf_counter() - started:6.2f}s  {len(index):,} entries, "
+          f"{len(index.cidrs[4].starts):,} CIDR segments")
+
+    ip_artifacts = [rng.choice(feed_ips) if rng.random() < HIT_RATE else random_ip(rng) for _ in range(n)]
+    host_artifacts = [f"www.{rng.choice(feed_domains)}" if rng.random() < HIT_RATE else f"app{i}.example.com"
+                      for i in range(n // 2)]
+    tech_artifacts = [(f"product{rng.randrange(1000)}", "1.0") for _ in range(100_000)]
+
+    for name, values, run in (("IPs", ip_artifacts, index.match_ips),
+                              ("hosts", host_artifacts, index.match_domains),
+                              ("technologies", tech_artifacts, index.match_technologies)):
+        started = time.perf_counter()
+        hits = run(values)
+        elapsed = time.perf_counter() - started
+        print(f"  {name:<13} {len(values):>10,} artifacts  {elapsed:6.2f}s  "
+              f"{len(values) / elapsed / 1e6:5.2f} M/s  {len(hits):,} hits")
+
+    exact = list(feed_ips)
+    sample = ip_artifacts[:NAIVE_SAMPLE]
+    started = time.perf_counter()
+    for value in sample:
+        address = ipaddress.ip_address(value)
+        _ = value in exact or any(address in network for network in cidrs)
+    elapsed = time.perf_counter() - started
+    rate = NAIVE_SAMPLE / elapsed
+    print(f"  naive IPs     {NAIVE_SAMPLE:>10,} artifacts  {elapsed:6.2f}s  {rate:9,.0f} /s  "
+          f"(≈ {n / rate / 3600:,.1f} h for {n:,})")
+
+    # Spot check the index against the naive join
+    for value in sample:
+        address = ipaddress.ip_address(value)
+        expected = value in exact or any(address in network for network in cidrs)
+        assert bool(index.match_ip(value)) == expected, value
+    print(f"\n✅ Index agrees with the naive join on the {NAIVE_SAMPLE} sampled addresses")
+
+
+if __name__ == "__main__":
+    main()
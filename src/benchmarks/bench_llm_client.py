@@ -0,0 +1,97 @@
+"""
+Digital Sentinel - LLM Client Benchmark
+=======================================
+Triage of a directory's worth of reports against a local stub
+OpenAI-compatible server (latency + a per-prompt-token cost):
+
+  • before — one blocking request per report, json.dumps(indent=2), in series
+  • cold   — ai.llm_client.LLMClient.triage(): compact JSON, small reports
+             packed together, big ones split, requests concurrent
+  • warm   — the same reports again (all answered from the cache)
+  • churn  — CHURN of the reports changed
+  • added  — one new report in front of the rest: only its own batch is sent
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_llm_client.py [num_reports]
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import tempfile
+
+import aiohttp
+
+from ai.llm_client import LLMCache, LLMClient
+from benchmarks.local_servers import COMPLETION_STATS, make_completion_app, serve
+
+LATENCY = 0.2        # seconds per completion
+PER_TOKEN = 0.0002   # seconds per prompt token (prefill)
+CHURN = 0.05
+INSTRUCTION = "Summarize and classify vulnerabilities by severity (Critical/High/Medium/Low):"
+
+
+def make_reports(n: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    reports = []
+    for r in range(n):
+        issues = 400 if r % 25 == 0 else rng.randint(1, 6)
+        reports.append({"target": f"target{r}.example.com", "issues": [
+            {"signature": rng.choice(("sqli", "xss", "csrf")), "severity": rng.choice(("high", "medium", "low")),
+             "url": f"https://target{r}.example.com/page{i}?id={i}"} for i in range(issues)]})
+    return reports
+
+
+async def before(base_url: str, reports: list):
+    async with aiohttp.ClientSession() as session:
+        for report in reports:
+            prompt = f"You are a security analyst. {INSTRUCTION}\n        Data: {json.dumps(report, indent=2)}"
+            payload = {"model": "gpt-4o-mini", "messages": [
+                {"role": "system", "content": "You are a cybersecurity triage AI."},
+                {"role": "user", "content": prompt}]}
+            async with session.post(f"{base_url}/chat/completions", json=payload) as response:
+                await response.read()
+
+
+async def bench(n: int):
+    reports = make_reports(n)
+    app = make_completion_app(LATENCY, PER_TOKEN)
+    stats = app[COMPLETION_STATS]
+    async with serve(app) as port:
+        base_url = f"http://127.0.0.1:{port}/v1"
+        client = LLMClient(api_key="bench", base_url=base_url,
+                           cache=LLMCache(f"{tempfile.mkdtemp(prefix='sentinel_llm_')}/results.db"))
+
+        changed = [dict(r, target=r["target"] + ".v2") if i % int(1 / CHURN) == 0 else r
+                   for i, r in enumerate(reports)]
+        added = [{"target": "new.example.com", "issues": [
+            {"signature": "xss", "severity": "high", "url": "https://new.example.com/search?q=1"}]}] + changed
+        runs = [("before", lambda: before(base_url, reports)),
+                ("cold", lambda: client.triage_async(reports, INSTRUCTION)),
+                ("warm", lambda: client.triage_async(reports, INSTRUCTION)),
+                (f"churn {CHURN:.0%}", lambda: client.triage_async(changed, INSTRUCTION)),
+                ("added", lambda: client.triage_async(added, INSTRUCTION))]
+
+        print(f"🤖 {n} reports, stub latency {LATENCY}s + {PER_TOKEN * 1000:.1f}s per 1k prompt tokens")
+        sent = {}
+        for name, run in runs:
+            requests_before, chars_before = stats["requests"], stats["prompt_chars"]
+            started = time.perf_counter()
+            await run()
+            elapsed = time.perf_counter() - started
+            sent[name] = stats["requests"] - requests_before
+            print(f"  {name:<10} {elapsed:7.2f}s  {sent[name]:>5} requests  "
+                  f"{(stats['prompt_chars'] - chars_before) // 4:>9,} prompt tokens")
+        client.metrics.report("bench")
+        assert sent["warm"] == 0, "unchanged reports were sent again"
+        assert sent["added"] == 1, f"one new report re-sent {sent['added']} batches"
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    asyncio.run(bench(n))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Digital Sentinel - Memory Store Benchmark
+=========================================
+Write latency as a memory grows: the old load-mutate-rewrite JSON file
+(memory_core / intel_memory_oracle / AIIntelBrain before core.memory_store)
+against the append-only, compacting MemoryStore, plus the time to reopen
+the store (snapshot load + log replay). The max column includes the
+interpreter's own full garbage-collection passes over millions of live
+entries, which no file format avoids; p50/p99 are the write path.
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_memory_store.py [entries]
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+
+from core.memory_store import MemoryStore
+
+JSON_SIZES = (1_000, 10_000, 50_000)
+SLICES = 10
+
+
+def rewrite_json(path: str, key: str):
+    """One update the way the memories used to do it."""
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            memory = json.load(f)
+    else:
+        memory = {}
+    memory[key] = memory.get(key, 0) + 1
+    with open(path, "w") as f:
+        json.dump(memory, f, indent=2)
+
+
+def percentile(samples: list, p: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def bench_json(workdir: str):
+    print("📄 Rewrite-the-whole-file JSON (per update)")
+    path = os.path.join(workdir, "learning.json")
+    for size in JSON_SIZES:
+        with open(path, "w") as f:
+            json.dump({f"sig-{i}": 1 for i in range(size)}, f, indent=2)
+        rounds = max(3, 20_000 // size)
+        started = time.perf_counter()
+        for i in range(rounds):
+            rewrite_json(path, f"sig-{i}")
+        print(f"  {size:>9,} entries  {(time.perf_counter() - started) / rounds * 1000:9.2f} ms/update")
+
+
+def bench_store(workdir: str, entries: int):
+    print(f"\n🧬 MemoryStore, growing to {entries:,} entries (one set + one incr per step)")
+    store = MemoryStore(os.path.join(workdir, "store"))
+    per_slice = entries // SLICES
+    for s in range(SLICES):
+        samples = []
+        for i in range(s * per_slice, (s + 1) * per_slice):
+            started = time.perf_counter_ns()
+            store.set(f"pattern-{i}", {"severity": "high", "hits": 1})
+            store.incr(f"sig-{i % 1000}")
+            samples.append(time.perf_counter_ns() - started)
+        samples.sort()
+        print(f"  {len(store):>10,} entries  p50 {percentile(samples, 0.5) / 1000:6.1f} µs  "
+              f"p99 {percentile(samples, 0.99) / 1000:7.1f} µs  max {samples[-1] / 1e6:7.1f} ms  "
+              f"mean {sum(samples) / len(samples) / 1000:6.1f} µs")
+    store.close()
+    print(f"  {store.generation} compactions along the way")
+
+    files = os.listdir(store.path)
+    size = sum(os.path.getsize(os.path.join(store.path, name)) for name in files)
+    started = time.perf_counter()
+    reopened = MemoryStore(store.path)
+    print(f"\n♻️ Reopened {len(reopened):,} entries from {len(files)} files ({size / 1e6:.0f} MB) "
+          f"in {time.perf_counter() - started:.2f}s — identical: {reopened.data == store.data}")
+    reopened.close()
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workdir = tempfile.mkdtemp(prefix="sentinel_memory_")
+    bench_json(workdir)
+    bench_store(workdir, entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Digital Sentinel - Discord Notifier Benchmark
+=============================================
+Sends a burst of AI-report embeds to a local webhook stand-in that
+enforces Discord-style limits (WEBHOOK_LIMIT messages per WEBHOOK_WINDOW
+seconds, 429 beyond that):
+
+  • before — one blocking requests.post per embed, new connection each
+             time, 429s ignored (what every sender used to do)
+  • after  — core.notifier: notify() only enqueues; the background worker
+             batches 10 embeds per message and paces by the rate-limit headers
+  • restart — payloads queued by a process that never delivered them go out
+             from the durable outbox on the next start
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_notifier.py [num_embeds]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+
+import requests
+
+from core.notifier import DiscordNotifier
+from benchmarks.local_servers import WEBHOOK_STATS, make_webhook_app, serve
+
+WEBHOOK_LIMIT = 5
+WEBHOOK_WINDOW = 2.0
+
+
+def embed(i: int) -> dict:
+    return {"title": f"🧠 Digital Sentinel AI Report — target{i}.example.com", "color": 0xFF4C4C,
+            "fields": [{"name": "📊 AI Risk Score", "value": str(i % 100), "inline": True},
+                       {"name": "🧩 Summary", "value": "SQL injection in /login; patch input validation.",
+                        "inline": False}]}
+
+
+def before(url: str, n: int) -> int:
+    delivered = 0
+    for i in range(n):
+        response = requests.post(url, json={"embeds": [embed(i)]})
+        delivered += response.status_code == 204
+    return delivered
+
+
+def after(url: str, n: int, outbox: str):
+    notifier = DiscordNotifier(url, path=outbox, rate=WEBHOOK_LIMIT / WEBHOOK_WINDOW, burst=WEBHOOK_LIMIT)
+    started = time.perf_counter()
+    for i in range(n):
+        notifier.notify(embeds=[embed(i)])
+    enqueue_s = time.perf_counter() - started
+    notifier.flush()
+    notifier.stop()
+    return enqueue_s
+
+
+def restart(url: str, n: int, outbox: str) -> int:
+    crashed = DiscordNotifier(url, path=outbox, background=False)  # queues, never delivers
+    for i in range(n):
+        crashed.notify(embeds=[embed(i)])
+    revived = DiscordNotifier(url, path=outbox)
+    revived.flush()
+    revived.stop()
+    return revived.stats["embeds"]
+
+
+async def bench(n: int):
+    workdir = tempfile.mkdtemp(prefix="sentinel_notifier_")
+    print(f"📨 {n} embeds → webhook stand-in allowing {WEBHOOK_LIMIT} messages / {WEBHOOK_WINDOW}s")
+
+    for name in ("before", "after"):
+        app = make_webhook_app(WEBHOOK_LIMIT, WEBHOOK_WINDOW)
+        stats = app[WEBHOOK_STATS]
+        async with serve(app) as port:
+            url = f"http://127.0.0.1:{port}/webhook"
+            started = time.perf_counter()
+            if name == "before":
+                await asyncio.to_thread(before, url, n)
+                extra = ""
+            else:
+                enqueue_s = await asyncio.to_thread(after, url, n, os.path.join(workdir, "outbox.db"))
+                extra = f"  (callers blocked {enqueue_s * 1000:.0f} ms in total)"
+            elapsed = time.perf_counter() - started
+        print(f"  {name:<7} {elapsed:6.2f}s  {stats['embeds']:>5}/{n} embeds delivered in {stats['messages']:>4} "
+              f"messages, {stats['throttled']:>4}×429, {stats['rejected']} rejected{extra}")
+
+    app = make_webhook_app(WEBHOOK_LIMIT, WEBHOOK_WINDOW)
+    async with serve(app) as port:
+        delivered = await asyncio.to_thread(restart, f"http://127.0.0.1:{port}/webhook", 25,
+                                            os.path.join(workdir, "restart.db"))
+    print(f"  restart  {delivered}/25 embeds queued before the 'crash' delivered after it")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    asyncio.run(bench(n))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Digital Sentinel - Pattern Memory Benchmark
+===========================================
+AIIntelBrain's pattern memory across many immortal-loop cycles: the old
+unbounded "patterns" list against ai.pattern_memory's recent window +
+rolled-up aggregates. Reports on-disk size after compaction, reopen time
+and the cost of the whole-history stats() query, then checks that the
+aggregated counts match the ones computed from the full list.
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_pattern_memory.py [analyses]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+from core.memory_store import MemoryStore
+from ai.pattern_memory import PatternMemory, SEVERITIES, risk_bucket
+
+SUMMARY = "Summary of findings: SQL injection on login form, reflected XSS in search. " * 8
+
+
+def analyses(n: int):
+    rng = random.Random(7)
+    start = time.time() - n * 60
+    for i in range(n):
+        yield {"timestamp": str(i), "summary": SUMMARY, "risk_score": rng.randint(0, 100),
+               "severity_counts": {s: rng.randint(0, 3) for s in SEVERITIES},
+               "target": f"target{rng.randint(0, 49)}.example.com", "recorded_at": start + i * 60}
+
+
+def disk_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def reopen(path: str):
+    started = time.perf_counter()
+    store = MemoryStore(path)
+    return store, time.perf_counter() - started
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    workdir = tempfile.mkdtemp(prefix="sentinel_patterns_")
+
+    unbounded = MemoryStore(os.path.join(workdir, "unbounded"))
+    tiered_store = MemoryStore(os.path.join(workdir, "tiered"))
+    tiered = PatternMemory(tiered_store)
+    expected = {"analyses": 0, "severity": dict.fromkeys(SEVERITIES, 0), "histogram": [0] * 10}
+    for entry in analyses(n):
+        unbounded.append("patterns", entry)
+        tiered.add(entry)
+        expected["analyses"] += 1
+        for severity, count in entry["severity_counts"].items():
+            expected["severity"][severity] += count
+        expected["histogram"][risk_bucket(entry["risk_score"])] += 1
+    for store in (unbounded, tiered_store):
+        store.compact()
+        store.close()
+
+    print(f"🧠 {n:,} analyses")
+    for name in ("unbounded", "tiered"):
+        path = os.path.join(workdir, name)
+        store, load_s = reopen(path)
+        if name == "tiered":
+            memory = PatternMemory(store)
+            started = time.perf_counter()
+            stats = memory.stats()
+            query_s = time.perf_counter() - started
+            held = len(memory)
+        else:
+            started = time.perf_counter()
+            patterns = store.get("patterns")
+            hist = [0] * 10
+            for entry in patterns:
+                hist[risk_bucket(entry["risk_score"])] += 1
+            query_s = time.perf_counter() - started
+            held = len(patterns)
+        print(f"  {name:<10} {held:>7,} analyses held  {disk_size(path) / 1e6:8.2f} MB on disk  "
+              f"reopen {load_s * 1000:7.1f} ms  stats {query_s * 1000:6.1f} ms")
+        store.close()
+
+    ok = (stats["analyses"] == expected["analyses"] and stats["risk_histogram"] == expected["histogram"]
+          and stats["severity_counts"] == expected["severity"])
+    print(f"\n✅ Aggregates match the full history: {ok}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Digital Sentinel - Pipeline Latency Benchmark
+=============================================
+Simulated four-stage recon (enumerate → probe → crawl → scan) with fixed
+per-item delays, run once with strict phase barriers and once through the
+streaming Pipeline. Reports end-to-end time, time to first scan result and
+peak queue depth (backpressure).
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_pipeline.py [num_targets]
+"""
+
+import sys
+import time
+import asyncio
+
+from core.pipeline import Pipeline, Stage
+
+# (name, delay per item in seconds, outputs per item, workers)
+STAGES = [
+    ("enumeration", 0.20, 20, 4),
+    ("probing", 0.05, 1, 50),
+    ("crawling", 0.10, 5, 10),
+    ("scanning", 0.002, 1, 2),
+]
+
+
+def make_stage(name: str, delay: float, fanout: int, workers: int, sink=None) -> Stage:
+    async def handler(item):
+        await asyncio.sleep(delay)
+        return [f"{item}/{name}{i}" for i in range(fanout)]
+    return Stage(name, handler, workers=workers, queue_size=200, sink=sink)
+
+
+class Collect(list):
+    """Sink that keeps a barrier phase's outputs as the next phase's input."""
+    write = list.append
+
+    def close(self):
+        pass
+
+
+async def run_barriers(targets: list) -> tuple:
+    started = time.perf_counter()
+    items = targets
+    first_final = None
+    for spec in STAGES:
+        outputs = Collect()
+        stage_pipeline = Pipeline([make_stage(*spec, sink=outputs)])
+        await stage_pipeline.run(items)
+        items = outputs
+        first_final = stage_pipeline.stages[0].first_output_at
+    elapsed = time.perf_counter() - started
+    return elapsed, elapsed - stage_pipeline.elapsed + first_final, len(items)
+
+
+async def run_streaming(targets: list) -> tuple:
+    pipeline = Pipeline([make_stage(*spec) for spec in STAGES])
+    outputs = await pipeline.run(targets)
+    return pipeline.elapsed, pipeline.stages[-1].first_output_at, outputs["scanning"], pipeline
+
+
+async def bench(num_targets: int = 40):
+    targets = [f"target{i}.example" for i in range(num_targets)]
+
+    barrier_total, barrier_first, barrier_count = await run_barriers(targets)
+    stream_total, stream_first, stream_count, pipeline = await run_streaming(targets)
+
+    assert barrier_count == stream_count
+    print(f"🧱 Barriers : {barrier_total:6.2f}s total, first scan result after {barrier_first:6.2f}s")
+    print(f"🌊 Pipeline : {stream_total:6.2f}s total, first scan result after {stream_first:6.2f}s")
+    print(f"🏁 {stream_count} scan results — {barrier_total / stream_total:.2f}x faster end-to-end")
+    pipeline.report()
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(int(sys.argv[1]) if len(sys.argv) > 1 else 40))
@@ -0,0 +1,65 @@
+"""
+Digital Sentinel - Probing Benchmark
+====================================
+Runs the async prober against a local stand-in server with thousands of
+virtual hosts and reports hosts/sec.
+
+Sequential and raced scheme strategies are both measured, on two fixtures:
+  • vhosts      — plain-HTTP virtual hosts, a third of them answering 404
+  • https-only  — hosts serving HTTPS on 443 while port 80 accepts and never
+                  answers: sequential probing sits out the whole timeout on
+                  HTTP first, the race falls over to HTTPS after its head start
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_probing.py [num_hosts]
+"""
+
+import sys
+import time
+import asyncio
+
+from core.probing_engine import probe_hosts_async
+from benchmarks.local_servers import (BENCH_ZONE, LoopbackResolver, PortMapResolver, blackhole, make_vhost_app,
+                                      self_signed_context, serve, vhost_name, vhost_is_alive)
+
+HTTPS_ONLY_HOSTS = 200
+PROBE_TIMEOUT = 5
+
+
+async def bench(num_hosts: int = 5000, concurrency: int = 500, strategy: str = "race"):
+    async with serve(make_vhost_app()) as port:
+        targets = [f"{vhost_name(i)}:{port}" for i in range(num_hosts)]
+        expected = {t for t in targets if vhost_is_alive(t.split(":", 1)[0])}
+
+        start = time.perf_counter()
+        results = await probe_hosts_async(targets, concurrency=concurrency, resolver=LoopbackResolver(),
+                                          verbose=False, strategy=strategy)
+        elapsed = time.perf_counter() - start
+
+    alive = [r["host"] for r in results]
+    assert set(alive) == expected, f"alive mismatch: {len(alive)} vs {len(expected)}"
+    print(f"🏁 {num_hosts} hosts probed in {elapsed:.2f}s → {num_hosts / elapsed:.0f} hosts/sec "
+          f"({len(alive)} alive, concurrency={concurrency}, strategy={strategy})")
+
+
+async def bench_https_only(num_hosts: int = HTTPS_ONLY_HOSTS, strategy: str = "race"):
+    async with serve(make_vhost_app(), ssl_context=self_signed_context()) as tls_port, blackhole() as dead_port:
+        targets = [f"secure{i}.{BENCH_ZONE}" for i in range(num_hosts)]
+        resolver = PortMapResolver({80: dead_port, 443: tls_port})
+
+        start = time.perf_counter()
+        results = await probe_hosts_async(targets, concurrency=100, resolver=resolver, verbose=False,
+                                          strategy=strategy, timeout=PROBE_TIMEOUT)
+        elapsed = time.perf_counter() - start
+
+    assert {r["host"] for r in results} == set(targets), f"alive mismatch: {len(results)} vs {num_hosts}"
+    assert all(r["scheme"] == "https" for r in results)
+    print(f"🏁 {num_hosts} HTTPS-only hosts (port 80 blackholed) probed in {elapsed:.2f}s "
+          f"(timeout={PROBE_TIMEOUT}s, strategy={strategy})")
+
+
+if __name__ == "__main__":
+    hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    for strategy in ("sequential", "race"):
+        asyncio.run(bench(hosts, strategy=strategy))
+    for strategy in ("sequential", "race"):
+        asyncio.run(bench_https_only(strategy=strategy))
@@ -0,0 +1,68 @@
+"""
+Digital Sentinel - Prompt Builder Benchmark
+===========================================
+What a large scan costs to put in front of an LLM: the whole report
+dumped with json.dumps(indent=2) (one call per context window of
+CONTEXT_TOKENS) against ai.prompt_builder's grouped, de-duplicated,
+severity-ranked digest, and how long preprocessing takes. Checks that
+every high/critical group survives the budget.
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_prompt_builder.py [num_findings]
+"""
+
+import sys
+import json
+import math
+import time
+import random
+
+from ai.llm_client import estimate_tokens
+from ai.prompt_builder import PromptBuilder, PROMPT_BUDGET
+
+CONTEXT_TOKENS = 100_000   # usable prompt per call for the raw dump
+HOSTS = 200
+
+
+def make_report(n: int) -> dict:
+    rng = random.Random(11)
+    issues = []
+    for i in range(n):
+        host = f"app{rng.randrange(HOSTS)}.example.com"
+        signature, severity = rng.choices((("sqli", "high"), ("xss", "medium"), ("csrf", "low"), ("rce", "critical")),
+                                          weights=(30, 50, 19, 1))[0]
+        path = rng.choice(("/item/{}", "/user/{}/profile", "/search", "/api/v1/order/{}"))
+        url = f"https://{host}{path.format(rng.randrange(10**6))}?id={rng.randrange(10**6)}"
+        issues.append({"signature": signature, "severity": severity, "url": url,
+                       "description": f"{signature.upper()} pattern detected at {url}"})
+    return {"issues": issues}
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    report = make_report(n)
+
+    started = time.perf_counter()
+    raw = json.dumps(report, indent=2)
+    raw_tokens = estimate_tokens(raw)
+    raw_s = time.perf_counter() - started
+
+    builder = PromptBuilder()
+    started = time.perf_counter()
+    prompt = builder.build("Summarize and classify these vulnerabilities.", report["issues"])
+    digest_s = time.perf_counter() - started
+    groups = builder.groups(report["issues"])
+    kept, omitted = builder.select(report["issues"])
+
+    # Every critical/high issue shape must still be in front of the model, per host or merged
+    severe = {(g["signature"], g["severity"], g["shape"]) for g in groups if g["severity"] in ("critical", "high")}
+    covered = {(g["signature"], g["severity"], g["shape"]) for g in kept}
+    print(f"🧾 {n:,} findings over {HOSTS} hosts")
+    print(f"  raw dump   {raw_tokens:>12,} tokens  {math.ceil(raw_tokens / CONTEXT_TOKENS):>4} calls  "
+          f"{raw_s * 1000:8.0f} ms")
+    print(f"  digest     {estimate_tokens(prompt):>12,} tokens  {1:>4} calls  {digest_s * 1000:8.0f} ms  "
+          f"({len(groups):,} per-host groups → {len(kept):,} groups within the {PROMPT_BUDGET:,}-token budget)")
+    print(f"  omitted    {omitted['omitted'] if omitted else 'nothing'}")
+    print(f"\n✅ All {len(severe)} critical/high issue shapes kept: {severe <= covered}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Digital Sentinel - Record Stream Benchmark
+==========================================
+Writes and reads back N synthetic findings the old way (build a list,
+json.dump(indent=2), json.load) and through core.record_stream (JSONL,
+plain / gzip / zstd when installed). Reports time, file size and peak
+Python memory (tracemalloc) for each, plus the cost of materialising the
+classic JSON file from the stream.
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_record_stream.py [num_records]
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import tracemalloc
+
+from core import record_stream
+from core.record_stream import RecordWriter, iter_records, materialize_json
+
+
+def findings(n: int):
+    for i in range(n):
+        yield {"id": i, "severity": ("high", "medium", "info")[i % 3],
+               "description": f"[HIGH] Reflected parameter at https://host{i % 500}.example.com/p/{i}?q=test",
+               "status": "open"}
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def row(label: str, write_s: float, write_peak: int, read_s: float, read_peak: int, path: str):
+    print(f"   {label:<16} write {write_s:6.2f}s ({write_peak / 1e6:7.1f} MB peak)   "
+          f"read {read_s:6.2f}s ({read_peak / 1e6:7.1f} MB peak)   {os.path.getsize(path) / 1e6:7.1f} MB on disk")
+
+
+def bench(n: int = 500000):
+    print(f"\n📼 {n} records (orjson {'on' if record_stream.orjson else 'off'})")
+    with tempfile.TemporaryDirectory() as tmp:
+        whole = os.path.join(tmp, "export.json")
+
+        def dump_whole():
+            with open(whole, "w") as f:
+                json.dump({"findings": list(findings(n))}, f, indent=4)
+
+        def load_whole():
+            with open(whole) as f:
+                return sum(1 for _ in json.load(f)["findings"])
+
+        _, ws, wp = measure(dump_whole)
+        count, rs, rp = measure(load_whole)
+        row("json.dump/load", ws, wp, rs, rp, whole)
+
+        compressions = [None, "gzip"] + (["zstd"] if record_stream.zstandard else [])
+        for compress in compressions:
+            base = os.path.join(tmp, "export.jsonl")
+
+            def write_stream():
+                with RecordWriter(base, append=False, compress=compress, flush_every=1000) as out:
+                    out.write_many(findings(n))
+                return out.path
+
+            path, ws, wp = measure(write_stream)
+            streamed, rs, rp = measure(lambda: sum(1 for _ in iter_records(path)))
+            assert streamed == count
+            row(f"jsonl {compress or 'plain'}", ws, wp, rs, rp, path)
+
+        materialized = os.path.join(tmp, "materialized.json")
+        _, ms, mp = measure(lambda: materialize_json(os.path.join(tmp, "export.jsonl"), materialized,
+                                                     key="findings", indent=4))
+        same = open(materialized).read() == open(whole).read()
+        print(f"   materialise JSON {ms:6.2f}s ({mp / 1e6:7.1f} MB peak), identical to json.dump: "
+              f"{'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
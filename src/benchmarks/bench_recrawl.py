@@ -0,0 +1,58 @@
+"""
+Digital Sentinel - Recrawl Benchmark
+====================================
+Crawls a local site twice in recrawl mode and compares the second pass with
+a plain crawl. With ETags the repeat pass is all 304s; without them every
+page is downloaded again but matched by body hash. Either way no unchanged
+page should be parsed twice, and the extracted links must not differ.
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_recrawl.py [num_pages]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+
+from crawler import CrawlConfig, CrawlEngine, ExtractionMemo, PageResult
+from core.response_cache import ResponseCache
+from benchmarks.local_servers import SITE_STATS, make_site_app, serve
+
+
+async def crawl(port: int, num_pages: int, **kwargs):
+    config = CrawlConfig(max_depth=10, max_pages=num_pages, concurrency=50, per_host=50, **kwargs)
+    links = set()
+    start = time.perf_counter()
+    async for item in CrawlEngine(config).crawl([f"http://127.0.0.1:{port}/"]):
+        if isinstance(item, PageResult) and item.ok:
+            links |= item.links
+    return time.perf_counter() - start, links
+
+
+async def bench(num_pages: int = 2000):
+    for label, etags in (("ETag / 304", True), ("body hash only", False)):
+        app = make_site_app(num_pages, etags=etags)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(os.path.join(tmp, "http"))
+            memo = ExtractionMemo(os.path.join(tmp, "extractions.db"))
+            async with serve(app) as port:
+                plain, plain_links = await crawl(port, num_pages)
+                cold, _ = await crawl(port, num_pages, cache=cache, recrawl=True, memo=memo)
+                cold_stats = memo.stats.snapshot()
+                memo.stats.parsed = memo.stats.skipped = 0
+                sent_before = dict(app[SITE_STATS])
+                warm, warm_links = await crawl(port, num_pages, cache=cache, recrawl=True, memo=memo)
+            stats = app[SITE_STATS]
+            cache.close()
+            memo.close()
+        print(f"\n♻️ {label}: plain {plain:.2f}s, recrawl cold {cold:.2f}s "
+              f"({cold_stats['parsed']} parsed), recrawl warm {warm:.2f}s")
+        print(f"   warm pass: {memo.stats.parsed} re-parsed, {memo.stats.skipped} skipped; server sent "
+              f"{stats['full'] - sent_before['full']} full pages, "
+              f"{stats['not_modified'] - sent_before['not_modified']} × 304")
+        print(f"   links match plain crawl: {'✅' if warm_links == plain_links else '❌'} ({len(plain_links)} links)")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,49 @@
+"""
+Digital Sentinel - Response Cache Benchmark
+===========================================
+Crawls a local ETag-aware site twice through the shared response cache:
+once with TTL 0 (every repeat is a conditional request answered by 304) and
+once with a long TTL (repeats never touch the network). Reports hit rate,
+bytes saved and what the server actually had to send.
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_response_cache.py [num_pages]
+"""
+
+import sys
+import time
+import asyncio
+import tempfile
+
+from crawler import CrawlConfig, CrawlEngine
+from core.response_cache import ResponseCache
+from benchmarks.local_servers import SITE_STATS, make_site_app, serve
+
+
+async def crawl(port: int, cache: ResponseCache, num_pages: int) -> float:
+    config = CrawlConfig(max_depth=10, max_pages=num_pages, concurrency=50, per_host=50, cache=cache)
+    start = time.perf_counter()
+    async for _ in CrawlEngine(config).crawl([f"http://127.0.0.1:{port}/"]):
+        pass
+    return time.perf_counter() - start
+
+
+async def bench(num_pages: int = 2000):
+    for label, ttl in (("revalidate (TTL 0)", 0), ("fresh (TTL 1h)", 3600)):
+        app = make_site_app(num_pages, etags=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(tmp, default_ttl=ttl)
+            async with serve(app) as port:
+                cold = await crawl(port, cache, num_pages)
+                sent_cold = dict(app[SITE_STATS])
+                warm = await crawl(port, cache, num_pages)
+            cache.close()
+        stats = app[SITE_STATS]
+        print(f"\n🗃️ {label}: cold {cold:.2f}s, warm {warm:.2f}s")
+        print(f"   server sent {sent_cold['full']} full pages cold; warm run: "
+              f"{stats['full'] - sent_cold['full']} full, {stats['not_modified']} × 304")
+        print(f"   hit rate {cache.stats.hit_rate:.1%}, {cache.stats.bytes_saved / 1024:.0f} KB not downloaded, "
+              f"{cache.stats.bytes_deduped / 1024:.1f} KB deduped, {cache.total_bytes / 1024:.0f} KB on disk")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,175 @@
+"""
+Digital Sentinel - Signature Engine Benchmark
+=============================================
+The default rule set plus NUM_RULES synthetic rules (error strings, token
+regexes, header checks, URL patterns) against synthetic crawled pages of
+a few KB, a small share of them planted with what some rule looks for:
+
+  • naive     — every rule checked against every response on its own
+                (substring tests and precompiled regexes), timed on a sample
+  • engine    — core.signature_engine.SignatureEngine: compile once, one
+                literal scan per response part, only triggered rules evaluated
+  • scan_url  — the Phase 4 path end to end: responses read back from a
+                ResponseCache and turned into findings
+
+The engine's matches are checked against the naive evaluation on the sample.
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_signature_engine.py [num_responses] [num_rules]
+"""
+
+import re
+import sys
+import time
+import random
+import tempfile
+
+from core.response_cache import ResponseCache
+from core.signature_engine import SignatureEngine, load_rules
+from core.vulnerability_scanner import scan_url
+
+NUM_RULES = 5_000
+PLANT_RATE = 0.02
+NAIVE_SAMPLE = 300
+CACHED_RESPONSES = 5_000
+WORDS = ("the", "account", "settings", "profile", "search", "results", "error", "login", "page", "server",
+         "request", "update", "session", "cart", "order", "product", "news", "contact", "help", "about")
+
+
+def make_rules(count: int, rng) -> list:
+    rules = []
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            matchers = [{"part": "body", "type": "word",
+                         "words": [f"E{i:05d}: {rng.choice(WORDS)} failed", f"ERR_{i:05d}_FATAL"]}]
+        elif kind == 1:
+            matchers = [{"part": "body", "type": "regex", "regex": [rf"module_{i}\.(php|asp)x? line \d+"]}]
+        elif kind == 2:
+            matchers = [{"part": "body", "type": "word", "case_insensitive": True, "words": [f"Vendor{i} Debug Console"]},
+                        {"part": "status", "type": "status", "status": [200, 500]}]
+        elif kind == 3:
+            matchers = [{"part": "header", "name": "Server", "type": "regex", "regex": [rf"product{i}/\d+\.\d+"]}]
+        else:
+            matchers = [{"part": "url", "type": "word", "words": [f"/admin{i}/", f"/install{i}.php"]}]
+        rules.append({"id": f"synthetic-{i}", "name": f"Synthetic rule {i}", "signature": f"synthetic-{i}",
+                      "severity": rng.choice(("low", "medium", "high")), "matchers": matchers})
+    return rules
+
+
+def plant(rule_index: int, rng) -> tuple:
+    """(url suffix, header, body snippet) that trip synthetic rule `rule_index`."""
+    kind = rule_index % 5
+    if kind == 0:
+        return "", None, f"ERR_{rule_index:05d}_FATAL"
+    if kind == 1:
+        return "", None, f"in module_{rule_index}.php line {rng.randrange(999)}"
+    if kind == 2:
+        return "", None, f"vendor{rule_index} debug console"
+    if kind == 3:
+        return "", ("Server", f"product{rule_index}/1.{rng.randrange(9)}"), ""
+    return f"admin{rule_index}/", None, ""
+
+
+def make_responses(count: int, num_rules: int, rng) -> list:
+    filler = [" ".join(rng.choice(WORDS) for _ in range(600)) for _ in range(64)]
+    responses = []
+    for i in range(count):
+        url, headers = f"http://app{i % 500}.example.com/page/{i}/", {"Content-Type": "text/html; charset=utf-8",
+                                                                        "Server": "nginx"}
+        body = f"<html><head><title>Page {i}</title></head><body><p>{rng.choice(filler)}</p>"
+        if rng.random() < PLANT_RATE:
+            suffix, header, snippet = plant(rng.randrange(num_rules), rng)
+            url += suffix
+            if header:
+                headers[header[0]] = header[1]
+            body += f"<pre>{snippet}</pre>"
+        responses.append((url, 200, headers, body + "</body></html>"))
+    return responses
+
+
+class NaiveRules:
+    """Each rule evaluated directly from its spec, one at a time."""
+
+    def __init__(self, rules: list):
+        self.rules = rules
+        self.regexes = {}
+
+    def regex(self, pattern: str, ignore_case: bool):
+        key = (pattern, ignore_case)
+        if key not in self.regexes:
+            self.regexes[key] = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        return self.regexes[key]
+
+    def matcher(self, spec: dict, url, status, headers, body) -> bool:
+        part = spec.get("part", "body")
+        lowered = {name.lower(): value for name, value in headers.items()}
+        if part == "status":
+            result = status in spec["status"]
+        else:
+            text = {"url": url, "body": body, "headers": "\n".join(f"{k}: {v}" for k, v in headers.items()),
+                    "header": lowered.get(spec.get("name", "").lower(), "")}[part]
+            ignore_case = spec.get("case_insensitive", False)
+            if spec["type"] == "word":
+                haystack = text.lower() if ignore_case else text
+                outcomes = [(word.lower() if ignore_case else word) in haystack for word in spec["words"]]
+            else:
+                outcomes = [self.regex(p, ignore_case).search(text) is not None for p in spec["regex"]]
+            result = all(outcomes) if spec.get("condition") == "and" else any(outcomes)
+        return result != bool(spec.get("negative"))
+
+    def match(self, url, status, headers, body) -> list:
+        hits = []
+        for rule in self.rules:
+            outcomes = [self.matcher(m, url, status, headers, body) for m in rule["matchers"]]
+            if all(outcomes) if rule.get("condition", "and") == "and" else any(outcomes):
+                hits.append(rule["id"])
+        return hits
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    num_rules = int(sys.argv[2]) if len(sys.argv) > 2 else NUM_RULES
+    rng = random.Random(25)
+    rules = load_rules() + make_rules(num_rules, rng)
+    responses = make_responses(n, num_rules, rng)
+    size = sum(len(body) for _, _, _, body in responses)
+    print(f"⚡ {len(rules):,} rules × {n:,} responses ({size / 1e6:,.0f} MB of bodies)")
+
+    started = time.perf_counter()
+    engine = SignatureEngine(rules)
+    print(f"  compile   {time.perf_counter() - started:7.2f}s  {engine.literal_count:,} literals, "
+          f"{len(engine.always)} rules evaluated for every response")
+
+    naive = NaiveRules(rules)
+    sample = responses[:NAIVE_SAMPLE]
+    started = time.perf_counter()
+    expected = [naive.match(*response) for response in sample]
+    naive_rate = NAIVE_SAMPLE / (time.perf_counter() - started)
+    print(f"  naive     {n / naive_rate:7.2f}s  {naive_rate:9,.0f} responses/s  (extrapolated from {NAIVE_SAMPLE})")
+
+    started = time.perf_counter()
+    matched = sum(len(engine.match(*response)) for response in responses)
+    elapsed = time.perf_counter() - started
+    print(f"  engine    {elapsed:7.2f}s  {n / elapsed:9,.0f} responses/s  {size / elapsed / 1e6:6.1f} MB/s  "
+          f"{matched:,} matches  ({naive_rate and n / elapsed / naive_rate:,.0f}× naive)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(tmp)
+        cached = responses[:CACHED_RESPONSES]
+        for url, status, headers, body in cached:
+            cache.store("GET", url, None, status, headers, body.encode())
+        started = time.perf_counter()
+        findings = [finding for url, _, _, _ in cached for finding in scan_url(url, engine=engine, cache=cache)]
+        elapsed = time.perf_counter() - started
+        cache.close()
+    flagged = sum(finding.severity != "info" for finding in findings)
+    print(f"  scan_url  {elapsed:7.2f}s  {len(cached) / elapsed:9,.0f} responses/s from the response cache, "
+          f"{flagged:,} findings")
+
+    got = [[rule.id for rule in engine.match(*response)] for response in sample]
+    assert got == expected, next((g, e) for g, e in zip(got, expected) if g != e)
+    print(f"\n✅ Engine agrees with the naive evaluation on the {NAIVE_SAMPLE} sampled responses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Digital Sentinel - Validation Benchmark
+=======================================
+Validates the same generated report with AutoValidator's sequential mode
+(blocking requests, one issue at a time) and its async mode (shared
+aiohttp client, grouped per host). HOSTS local servers answer after
+FAST_LATENCY seconds, except one that takes SLOW_LATENCY — the host that
+used to stall the whole run. Checks both modes reach the same verdicts.
+
+Usage:  PYTHONPATH=src python3 src/benchmarks/bench_validation.py [num_issues]
+"""
+
+import sys
+import time
+import asyncio
+from contextlib import AsyncExitStack
+
+from core.rate_limiter import RateLimiter
+from validator import AutoValidator
+from benchmarks.local_servers import make_latency_app, serve
+
+HOSTS = 10
+FAST_LATENCY = 0.05
+SLOW_LATENCY = 1.0
+
+
+def make_issues(ports: list, num_issues: int) -> list:
+    issues = []
+    for i in range(num_issues):
+        port = ports[i % len(ports)]
+        path = "reflect" if i % 2 else "static"
+        issues.append({"signature": ("xss", "sqli", "csrf")[i % 3],
+                       "url": f"http://127.0.0.1:{port}/{path}/{i}"})
+    return issues
+
+
+def run_sequential(issues: list):
+    validator = AutoValidator(limiter=RateLimiter(host_rate=1e6, host_burst=1e6))
+    return [validator.validate_issue(dict(issue)) for issue in issues]
+
+
+async def bench(num_issues: int = 100):
+    async with AsyncExitStack() as stack:
+        ports = [await stack.enter_async_context(serve(make_latency_app(SLOW_LATENCY if h == 0 else FAST_LATENCY)))
+                 for h in range(HOSTS)]
+        issues = make_issues(ports, num_issues)
+
+        start = time.perf_counter()
+        sequential = await asyncio.to_thread(run_sequential, issues)
+        seq_time = time.perf_counter() - start
+
+        validator = AutoValidator(limiter=RateLimiter(host_rate=1e6, host_burst=1e6))
+        streamed = []
+        first = []
+
+        def on_result(issue):
+            if not first:
+                first.append(time.perf_counter() - start)
+            streamed.append(issue)
+
+        start = time.perf_counter()
+        await validator.validate_all([dict(issue) for issue in issues], on_result)
+        async_time = time.perf_counter() - start
+
+    seq_verdicts = {i.url: i.validated for i in sequential}
+    async_verdicts = {i.url: i.validated for i in streamed}
+    print(f"\n🧪 {num_issues} issues over {HOSTS} hosts (one at {SLOW_LATENCY}s, the rest at {FAST_LATENCY}s)")
+    print(f"   sequential: {seq_time:.2f}s")
+    print(f"   async:      {async_time:.2f}s, first result after {first[0] * 1000:.0f}ms "
+          f"→ {seq_time / async_time:.1f}x faster")
+    print(f"   {sum(async_verdicts.values())} validated; verdicts match: "
+          f"{'✅' if seq_verdicts == async_verdicts else '❌'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100))
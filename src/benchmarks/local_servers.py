@@ -0,0 +1,431 @@
+"""
+Digital Sentinel - Local Stand-in Servers
+=========================================
+Small aiohttp servers used by the benchmarks so every run stays offline.
+"""
+
+import os
+import ssl
+import socket
+import json
+import struct
+import random
+import asyncio
+import datetime
+import tempfile
+import subprocess
+from contextlib import asynccontextmanager
+
+from aiohttp import web
+from aiohttp.abc import AbstractResolver
+
+BENCH_ZONE = "bench.local"
+SITE_STATS = web.AppKey("site_stats", dict)
+THROTTLE_STATS = web.AppKey("throttle_stats", dict)
+COMPLETION_STATS = web.AppKey("completion_stats", dict)
+WEBHOOK_STATS = web.AppKey("webhook_stats", dict)
+FEED_STATS = web.AppKey("feed_stats", dict)
+FEED_DATA = web.AppKey("feed_data", dict)
+
+
+class LoopbackResolver(AbstractResolver):
+    """Resolves every hostname to 127.0.0.1 so thousands of virtual hosts share one server."""
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        return [{
+            "hostname": host, "host": "127.0.0.1", "port": port,
+            "family": socket.AF_INET, "proto": 0, "flags": socket.AI_NUMERICHOST,
+        }]
+
+    async def close(self):
+        pass
+
+
+class PortMapResolver(LoopbackResolver):
+    """Loopback resolver that also redirects well-known ports, e.g. {80: blackhole, 443: tls_port}."""
+
+    def __init__(self, ports: dict):
+        self.ports = ports
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        return await super().resolve(host, self.ports.get(port, port), family)
+
+
+def self_signed_context() -> ssl.SSLContext:
+    """Server TLS context with a throwaway self-signed certificate (needs the openssl CLI)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = os.path.join(tmp, "cert.pem"), os.path.join(tmp, "key.pem")
+        subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                        "-subj", f"/CN={BENCH_ZONE}", "-keyout", key, "-out", cert],
+                       check=True, capture_output=True)
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(cert, key)
+    return context
+
+
+@asynccontextmanager
+async def blackhole():
+    """A port that accepts connections and never answers — a filtered port 80 as the client sees it."""
+    held = []
+
+    async def hold(reader, writer):
+        held.append(writer)
+        try:
+            await reader.read()   # never respond; return once the client gives up
+        except ConnectionError:
+            pass
+        writer.close()
+
+    server = await asyncio.start_server(hold, "127.0.0.1", 0)
+    try:
+        yield server.sockets[0].getsockname()[1]
+    finally:
+        for writer in held:
+            writer.close()
+        server.close()
+
+
+@asynccontextmanager
+async def serve(app: web.Application, ssl_context: ssl.SSLContext = None):
+    """Run an aiohttp app on a random loopback port and yield the port."""
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=ssl_context)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield port
+    finally:
+        await runner.cleanup()
+
+
+def vhost_name(idx: int) -> str:
+    return f"vhost{idx}.{BENCH_ZONE}"
+
+
+def vhost_is_alive(host: str) -> bool:
+    """Every third virtual host answers 404, the rest answer 200."""
+    label = host.split(".", 1)[0]
+    return not label.startswith("vhost") or int(label[5:]) % 3 != 0
+
+
+def make_vhost_app() -> web.Application:
+    async def handler(request):
+        host = request.host.split(":", 1)[0]
+        if vhost_is_alive(host):
+            return web.Response(text=f"hello from {host}")
+        return web.Response(status=404, text="not here")
+
+    app = web.Application()
+    app.router.add_route("GET", "/{tail:.*}", handler)
+    return app
+
+
+def make_site_app(num_pages: int = 10000, fanout: int = 8, etags: bool = False) -> web.Application:
+    """
+    Generated site: /page/{n} links to its `fanout` children, back to the
+    root (with a fragment, to exercise dedup) and loads one shared script.
+    With `etags`, pages carry an ETag and answer If-None-Match with 304.
+    app[SITE_STATS] counts full responses and 304s.
+    """
+    stats = {"full": 0, "not_modified": 0}
+
+    async def page(request):
+        n = int(request.match_info.get("n", 0))
+        children = range(n * fanout + 1, min(n * fanout + fanout, num_pages - 1) + 1)
+        links = "".join(f'<li><a href="/page/{c}">page {c}</a></li>' for c in children)
+        html = (
+            f"<html><head><title>page {n}</title><script src=\"/static/app.js\"></script></head>"
+            f"<body><a href=\"/page/0#top\">home</a><ul>{links}</ul>"
+            f"<a href=\"https://elsewhere.example/\">external</a></body></html>"
+        )
+        if etags:
+            tag = f'"p{n}-{num_pages}"'
+            if request.headers.get("If-None-Match") == tag:
+                stats["not_modified"] += 1
+                return web.Response(status=304, headers={"ETag": tag})
+            stats["full"] += 1
+            return web.Response(text=html, content_type="text/html", headers={"ETag": tag})
+        stats["full"] += 1
+        return web.Response(text=html, content_type="text/html")
+
+    app = web.Application()
+    app[SITE_STATS] = stats
+    app.router.add_get("/", page)
+    app.router.add_get("/page/{n}", page)
+    return app
+
+
+def make_latency_app(latency: float = 0.05) -> web.Application:
+    """
+    Answers every request after `latency` seconds. Paths under /reflect/
+    echo the `test` query parameter back, everything else returns a fixed page.
+    """
+    async def handler(request):
+        await asyncio.sleep(latency)
+        if request.path.startswith("/reflect/"):
+            return web.Response(text=f"<html><body>{request.query.get('test', '')}</body></html>",
+                                content_type="text/html")
+        return web.Response(text="<html><body>nothing to see</body></html>", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_route("GET", "/{tail:.*}", handler)
+    return app
+
+
+def throttle(app: web.Application, rate: float, burst: int = 10, retry_after: int = 1) -> web.Application:
+    """
+    Make `app` enforce its own per-Host token bucket: requests beyond `rate`/s
+    (after a burst of `burst`) get 429 with Retry-After, like a WAF would.
+    app[THROTTLE_STATS] counts served and throttled requests.
+    """
+    stats = {"served": 0, "throttled": 0}
+    buckets = {}
+
+    @web.middleware
+    async def limit(request, handler):
+        now = asyncio.get_running_loop().time()
+        tokens, updated = buckets.get(request.host, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        if tokens < 1:
+            buckets[request.host] = (tokens, now)
+            stats["throttled"] += 1
+            return web.Response(status=429, headers={"Retry-After": str(retry_after)})
+        buckets[request.host] = (tokens - 1, now)
+        stats["served"] += 1
+        return await handler(request)
+
+    app[THROTTLE_STATS] = stats
+    app.middlewares.append(limit)
+    return app
+
+
+def make_completion_app(latency: float = 0.5, per_token: float = 0.0) -> web.Application:
+    """
+    Stand-in for an OpenAI-compatible /v1/chat/completions endpoint: answers
+    after `latency` + `per_token` × prompt tokens (≈ chars/4) with a short
+    summary and a usage block. app[COMPLETION_STATS] counts requests and
+    prompt characters received.
+    """
+    stats = {"requests": 0, "prompt_chars": 0}
+
+    async def completions(request):
+        payload = await request.json()
+        prompt = "".join(message["content"] for message in payload["messages"])
+        stats["requests"] += 1
+        stats["prompt_chars"] += len(prompt)
+        await asyncio.sleep(latency + per_token * len(prompt) / 4)
+        items = prompt.count("\n") + 1
+        text = (f"Triage of {items} lines: High: {items % 4}, Medium: {items % 3}, Low: {items % 2}. "
+                f"Overall risk {len(prompt) % 101}/100. Patch input validation.")
+        return web.json_response({
+            "id": f"stub-{stats['requests']}", "object": "chat.completion", "model": payload.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt) // 4 + 1, "completion_tokens": len(text) // 4 + 1},
+        })
+
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app[COMPLETION_STATS] = stats
+    app.router.add_post("/v1/chat/completions", completions)
+    return app
+
+
+def make_webhook_app(limit: int = 5, window: float = 2.0, latency: float = 0.02) -> web.Application:
+    """
+    Stand-in for a Discord webhook (POST /webhook): `limit` messages per
+    `window` seconds, announced through X-RateLimit-* headers; over the limit
+    it answers 429 with a JSON retry_after, like Discord. Payloads with more
+    than 10 embeds or 6000 embed characters get 400. app[WEBHOOK_STATS]
+    counts accepted messages and embeds, 429s and 400s.
+    """
+    stats = {"messages": 0, "embeds": 0, "throttled": 0, "rejected": 0}
+    window_state = {"start": 0.0, "used": 0}
+
+    async def webhook(request):
+        await asyncio.sleep(latency)
+        now = asyncio.get_running_loop().time()
+        if now - window_state["start"] >= window:
+            window_state.update(start=now, used=0)
+        reset_after = window - (now - window_state["start"])
+        if window_state["used"] >= limit:
+            stats["throttled"] += 1
+            return web.json_response({"message": "You are being rate limited.", "retry_after": round(reset_after, 3),
+                                      "global": False}, status=429,
+                                     headers={"Retry-After": str(int(reset_after) + 1)})
+        payload = await request.json()
+        embeds = payload.get("embeds", [])
+        chars = sum(len(e.get("title", "")) + len(e.get("description", "")) +
+                    sum(len(f.get("name", "")) + len(f.get("value", "")) for f in e.get("fields", []))
+                    for e in embeds)
+        if len(embeds) > 10 or chars > 6000 or not (embeds or payload.get("content")):
+            stats["rejected"] += 1
+            return web.json_response({"message": "Invalid Form Body"}, status=400)
+        window_state["used"] += 1
+        stats["messages"] += 1
+        stats["embeds"] += len(embeds)
+        return web.Response(status=204, headers={
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(limit - window_state["used"]),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+        })
+
+    app = web.Application()
+    app[WEBHOOK_STATS] = stats
+    app.router.add_post("/webhook", webhook)
+    return app
+
+
+def _feed_time(tick: int) -> str:
+    return (datetime.datetime(2026, 1, 1) + datetime.timedelta(minutes=tick)).strftime("%Y-%m-%dT%H:%M:%S.000000")
+
+
+def make_feed_app(pulses: int = 500, indicators: int = 40, kevs: int = 1200, ips: int = 10000,
+                  latency: float = 0.1, bandwidth: float = 2_000_000) -> web.Application:
+    """
+    Stand-ins for the three threat feeds, each answering after `latency` plus
+    the body size over `bandwidth` (bytes/s):
+
+      GET /otx/pulses/subscribed   OTX: limit/page pagination with a "next"
+                                   URL, honours modified_since
+      GET /kev/feed.json           CISA KEV: one file with an ETag, 304 on
+                                   a matching If-None-Match
+      GET /abuseipdb/blacklist     AbuseIPDB: the whole list every time
+
+    update_feeds() changes the data between syncs. app[FEED_STATS] counts
+    requests, 304s and body bytes served.
+    """
+    rng = random.Random(5)
+    stats = {"requests": 0, "not_modified": 0, "bytes": 0}
+    data = {"tick": 1, "kev_version": 1, "generated": _feed_time(1), "rng": rng, "kev_body": None}
+    data["pulses"] = [{"id": f"pulse{p}", "name": f"Campaign {p}", "modified": _feed_time(1), "indicators": [
+        {"type": rng.choice(("IPv4", "domain", "URL", "FileHash-SHA256")), "indicator": f"ioc-{p}-{i}.example"}
+        for i in range(indicators)]} for p in range(pulses)]
+    data["kev"] = [{"cveID": f"CVE-2024-{10000 + k}", "vendorProject": f"vendor{k % 97}",
+                    "product": f"product{k % 211}", "vulnerabilityName": f"Remote code execution {k}",
+                    "dateAdded": "2026-01-01", "shortDescription": "Improper input validation allows RCE. " * 3,
+                    "requiredAction": "Apply mitigations per vendor instructions.", "dueDate": "2026-02-01"}
+                   for k in range(kevs)]
+    data["ips"] = [{"ipAddress": f"198.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+                    "abuseConfidenceScore": 100, "lastReportedAt": _feed_time(1)} for i in range(ips)]
+
+    async def send(payload, headers=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        stats["requests"] += 1
+        stats["bytes"] += len(body)
+        await asyncio.sleep(latency + len(body) / bandwidth)
+        return web.Response(body=body, content_type="application/json", headers=headers)
+
+    async def otx(request):
+        since = request.query.get("modified_since", "")
+        limit, page = int(request.query.get("limit", 50)), int(request.query.get("page", 1))
+        matching = [p for p in data["pulses"] if p["modified"] > since]
+        next_url = None
+        if page * limit < len(matching):
+            next_url = str(request.url.update_query(page=page + 1))
+        return await send({"count": len(matching), "next": next_url,
+                           "results": matching[(page - 1) * limit: page * limit]})
+
+    async def kev(request):
+        etag = f'"kev-{data["kev_version"]}"'
+        if request.headers.get("If-None-Match") == etag:
+            stats["requests"] += 1
+            stats["not_modified"] += 1
+            await asyncio.sleep(latency)
+            return web.Response(status=304, headers={"ETag": etag})
+        if data["kev_body"] is None:
+            data["kev_body"] = json.dumps({"catalogVersion": f"2026.{data['kev_version']}", "count": len(data["kev"]),
+                                           "vulnerabilities": data["kev"]}).encode()
+        return await send(data["kev_body"], {"ETag": etag})
+
+    async def abuseipdb(request):
+        return await send({"meta": {"generatedAt": data["generated"]}, "data": data["ips"]})
+
+    app = web.Application()
+    app[FEED_STATS] = stats
+    app[FEED_DATA] = data
+    app.router.add_get("/otx/pulses/subscribed", otx)
+    app.router.add_get("/kev/feed.json", kev)
+    app.router.add_get("/abuseipdb/blacklist", abuseipdb)
+    return app
+
+
+def update_feeds(app: web.Application, pulses: int = 0, kevs: int = 0, ips: int = 0):
+    """Touch `pulses` pulses (one new indicator each), add `kevs` KEV entries, replace `ips` blacklisted IPs."""
+    data = app[FEED_DATA]
+    rng = data["rng"]
+    data["tick"] += 1
+    now = _feed_time(data["tick"])
+    for pulse in rng.sample(data["pulses"], pulses):
+        pulse["indicators"].append({"type": "IPv4", "indicator": f"203.0.113.{len(pulse['indicators']) % 256}"})
+        pulse["modified"] = now
+    data["pulses"].sort(key=lambda p: p["modified"])
+    if kevs:
+        start = len(data["kev"])
+        data["kev"] += [{"cveID": f"CVE-2026-{start + k}", "vendorProject": "vendor", "product": "product",
+                         "dateAdded": now[:10]} for k in range(kevs)]
+        data["kev_version"] += 1
+        data["kev_body"] = None
+    if ips:
+        for idx in rng.sample(range(len(data["ips"])), ips):
+            data["ips"][idx] = {"ipAddress": f"192.{data['tick']}.{idx // 256 % 256}.{idx % 256}",
+                                "abuseConfidenceScore": 90, "lastReportedAt": now}
+        data["generated"] = now
+
+
+class StubDnsServer(asyncio.DatagramProtocol):
+    """
+    Minimal authoritative A-record server.
+    `records` maps exact names to IPs, `wildcards` maps zones to the IP every
+    other name under them gets; anything else is NXDOMAIN. `drop_rate`
+    silently drops that share of queries to exercise client retries.
+    """
+
+    def __init__(self, records: dict, wildcards: dict = None, ttl: int = 300, drop_rate: float = 0.0):
+        self.records = records
+        self.wildcards = wildcards or {}
+        self.ttl = ttl
+        self.drop_rate = drop_rate
+        self.queries = 0
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)
+
+    def _lookup(self, name: str):
+        if name in self.records:
+            return self.records[name]
+        for zone, ip in self.wildcards.items():
+            if name.endswith("." + zone):
+                return ip
+        return None
+
+    def datagram_received(self, data, addr):
+        self.queries += 1
+        if self.drop_rate and random.random() < self.drop_rate:
+            return
+        qid = data[:2]
+        offset, labels = 12, []
+        while data[offset]:
+            labels.append(data[offset + 1:offset + 1 + data[offset]].decode())
+            offset += 1 + data[offset]
+        question = data[12:offset + 5]
+        ip = self._lookup(".".join(labels).lower())
+
+        flags = 0x8180 if ip else 0x8183
+        header = qid + struct.pack(">HHHHH", flags, 1, 1 if ip else 0, 0, 0)
+        answer = b""
+        if ip:
+            answer = struct.pack(">HHHIH", 0xC00C, 1, 1, self.ttl, 4) + socket.inet_aton(ip)
+        self.transport.sendto(header + question + answer, addr)
+
+
+@asynccontextmanager
+async def serve_dns(server: StubDnsServer):
+    """Run a StubDnsServer on a random loopback UDP port and yield the port."""
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=("127.0.0.1", 0))
+    try:
+        yield transport.get_extra_info("sockname")[1]
+    finally:
+        transport.close()
@@ -1,7 +1,7 @@
-import json
-import os
 import datetime
 
+from core.record_stream import RecordWriter, jsonl_path, materialize_json
+
 REPORT_PATH = "data/reports/ai_intel_summary.json"
 
 def run_ai_oracle():
@@ -23,9 +23,10 @@ def run_ai_oracle():
         ]
     }
 
-    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
-    with open(REPORT_PATH, "w") as f:
-        json.dump(analysis, f, indent=2)
+    with RecordWriter(jsonl_path(REPORT_PATH), append=False) as out:
+        out.write_many(analysis["findings"])
+    materialize_json(out.path, REPORT_PATH, key="findings",
+                     extra={k: v for k, v in analysis.items() if k != "findings"})
 
     print(f"📄 Report saved to: {REPORT_PATH}")
     print(f"🧩 AI Summary: {analysis['risk_summary']}")
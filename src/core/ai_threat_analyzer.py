@@ -1,36 +1,239 @@
+import os
 import json
-import random
 import datetime
-import os
+from collections import Counter
+from itertools import repeat
+from operator import itemgetter
+
+import numpy as np
+
+from core.feed_sync import FeedStore
+from core.ioc_index import IOCIndex, parse_technologies, shared_index
+from core.dns_resolver import RESOLVED_IPS_FILE
+from core.probing_engine import RESULTS_FILE as PROBE_RESULTS_FILE
+from core.crawling_engine import OUTPUT_FILE as CRAWL_FILE
+from core.record_stream import RecordWriter, jsonl_path, materialize_json
 
 REPORT_PATH = "data/reports/ai_threat_analysis.json"
+SOURCE_LABELS = {"alienvault": "AlienVault", "cisa_kev": "CISA KEV", "abuseipdb": "AbuseIPDB"}
+PRIORITY_MAP = {"Critical": 5, "High": 4, "Medium": 3, "Low": 2}
+SOURCE_CONFIDENCE = {"CISA KEV": 1.0, "AbuseIPDB": 0.9, "AlienVault": 0.7}   # how much a feed hit is trusted
+DEFAULT_CONFIDENCE = 0.5
+UNVERIFIED_CONFIDENCE = 0.2   # KEV hit on a product name alone: KEV lists no affected versions
+UNVERIFIED_SEVERITY = "Medium"
+RECENCY_HALF_LIFE = 30.0   # days until a report counts half as much
+EXPOSURE_WEIGHT = 0.25     # score gain per doubling of the assets an indicator touches
+KEV_WEIGHT = 0.5           # multiplier added when the asset has a known-exploited CVE (× that match's confidence)
+ANOMALY_Z = 3.5            # robust z-score beyond which a feature is anomalous
+ANOMALY_FEATURES = ("severity", "confidence", "age_days", "exposure")
+SKEWED_FEATURES = ("age_days", "exposure")   # compared on a log scale
+
+
+def _load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ Could not read {path}: {e}")
+        return default
+
+
+def collect_artifacts() -> dict:
+    """
+    What recon found, keyed for the IOC joins:
+      ips           address → hosts resolving to it
+      hosts         every resolved or probed host
+      urls          crawled URLs
+      technologies  (product, version) → hosts announcing it (Server / X-Powered-By)
+    """
+    artifacts = {"ips": {}, "hosts": set(), "urls": set(), "technologies": {}}
+    for host, addresses in _load_json(RESOLVED_IPS_FILE, {}).items():
+        artifacts["hosts"].add(host)
+        for address in addresses:
+            artifacts["ips"].setdefault(address, set()).add(host)
+    for probe in _load_json(PROBE_RESULTS_FILE, []):
+        artifacts["hosts"].add(probe["host"])
+        for value in (probe.get("server"), probe.get("powered_by")):
+            for tech in parse_technologies(value):
+                artifacts["technologies"].setdefault(tech, set()).add(probe["host"])
+    if os.path.exists(CRAWL_FILE):
+        with open(CRAWL_FILE, "r", encoding="utf-8") as f:
+            artifacts["urls"].update(line.strip() for line in f if line.strip())
+    return artifacts
+
+
+def match_severity(source: str, record: dict) -> str:
+    if source == "cisa_kev":
+        return "Critical"
+    if source == "abuseipdb":
+        return "High" if record.get("abuseConfidenceScore", 0) >= 90 else "Medium"
+    if source == "alienvault":
+        return "High"
+    return "Medium"
+
+
+def find_threats(index: IOCIndex, store: FeedStore, artifacts: dict) -> list:
+    """
+    One threat per (asset, indicator, feed) hit, with the feed record's
+    details. A technology matched to KEV entries by product name is not
+    known to run an affected version: it is marked "verified": False, with
+    UNVERIFIED_CONFIDENCE and UNVERIFIED_SEVERITY instead of the feed's.
+    """
+    hits = []
+    for ip, refs in index.match_ips(artifacts["ips"]):
+        hits += [(host, ip, ref, None) for host in sorted(artifacts["ips"][ip]) for ref in refs]
+    for host, refs in index.match_domains(artifacts["hosts"]):
+        hits += [(host, host, ref, None) for ref in refs]
+    for url, refs in index.match_many("url", artifacts["urls"]):
+        hits += [(url, url, ref, None) for ref in refs]
+    for tech, refs in index.match_technologies(artifacts["technologies"]):
+        hits += [(host, tech[0], ref, tech[1]) for host in sorted(artifacts["technologies"][tech]) for ref in refs]
+
+    records, threats = {}, []
+    for asset, observed, ref, version in hits:
+        source, kind, value = index.entry(ref)
+        if (source, kind, value) not in records:
+            matches = [r for s, r in store.by_indicator(kind, value) if s == source]
+            records[(source, kind, value)] = matches[0] if matches else {}
+        record = records[(source, kind, value)]
+        label = SOURCE_LABELS.get(source, source)
+        confidence = record["abuseConfidenceScore"] / 100 if "abuseConfidenceScore" in record else \
+            SOURCE_CONFIDENCE.get(label, DEFAULT_CONFIDENCE)
+        threat = {"asset": asset, "indicator": value, "kind": kind, "source": label,
+                  "severity": match_severity(source, record),
+                  "title": record.get("title") or record.get("vulnerabilityName") or "",
+                  "confidence": confidence,
+                  "reported": record.get("date") or record.get("lastReportedAt") or record.get("dateAdded")}
+        if kind == "ip" or kind == "cidr":
+            threat["ip"] = observed
+        if kind == "cve":
+            threat["technology"] = observed
+            threat["version"] = version
+            threat["verified"] = False
+            threat["severity"] = UNVERIFIED_SEVERITY
+            threat["confidence"] = min(confidence, UNVERIFIED_CONFIDENCE)
+        threats.append(threat)
+    return threats
 
-def run_threat_analyzer():
+
+def _reported_at(value: str) -> np.datetime64:
+    """A feed's report timestamp to the second; NaT when it is not ISO 8601."""
+    try:
+        return np.datetime64(value, "s")
+    except ValueError:
+        return np.datetime64("NaT")
+
+
+def reported_column(threats: list) -> np.ndarray:
+    """Every threat's report time (NaT when missing); one malformed value only costs that threat its age."""
+    values = [reported[:19] if isinstance(reported, str) and reported else "NaT"
+              for reported in map(dict.get, threats, repeat("reported"))]
+    try:
+        return np.array(values, dtype="datetime64[s]")
+    except ValueError:
+        return np.array([_reported_at(value) for value in values], dtype="datetime64[s]")
+
+
+def threat_columns(threats: list, now: datetime.datetime = None) -> dict:
+    """
+    The scoring features of `threats` as NumPy columns:
+      severity    1–5 (PRIORITY_MAP, 0 when unknown)
+      confidence  0–1, how much the feed hit is trusted
+      age_days    days since the feed last reported it (NaN when unknown)
+      exposure    how many matches share the same indicator
+      kev         0–1, the asset's strongest CISA KEV match, weighted by its
+                  confidence (a product-name-only match counts at most
+                  UNVERIFIED_CONFIDENCE)
+    """
+    count = len(threats)
+    now = np.datetime64((now or datetime.datetime.utcnow()).replace(tzinfo=None), "s")
+    severity = np.fromiter(map(PRIORITY_MAP.get, map(itemgetter("severity"), threats), repeat(0)),
+                           dtype=np.float64, count=count)
+    confidence = np.array([t.get("confidence", DEFAULT_CONFIDENCE) for t in threats], dtype=np.float64)
+    reported = reported_column(threats)
+    age_days = (now - reported).astype(np.float64) / 86400.0
+    age_days[np.isnat(reported)] = np.nan
+
+    indicators = list(map(itemgetter("indicator"), threats))
+    exposure = np.fromiter(map(Counter(indicators).__getitem__, indicators), dtype=np.float64, count=count)
+    assets = list(map(itemgetter("asset"), threats))
+    kev_assets = {}
+    for asset, t, trust in zip(assets, threats, confidence):
+        if t["source"] == "CISA KEV":
+            kev_assets[asset] = max(kev_assets.get(asset, 0.0), trust)
+    kev = np.fromiter(map(kev_assets.get, assets, repeat(0.0)), dtype=np.float64, count=count)
+    return {"severity": severity, "confidence": confidence, "age_days": age_days, "exposure": exposure, "kev": kev}
+
+
+def robust_z(values: np.ndarray) -> np.ndarray:
+    """|x − median| / (1.4826 · MAD); mean absolute deviation when MAD is 0; NaN counts as 0."""
+    known = values[~np.isnan(values)]
+    if not len(known):
+        return np.zeros_like(values)
+    median = np.median(known)
+    deviation = np.abs(known - median)
+    scale = 1.4826 * np.median(deviation)
+    if scale == 0:
+        scale = 1.2533 * deviation.mean()
+    if scale == 0:
+        return np.zeros_like(values)
+    return np.nan_to_num(np.abs(values - median) / scale)
+
+
+def score_threats(columns: dict) -> tuple:
+    """
+    (priority_scores, anomaly_flags) for a batch, deterministic and vectorised:
+      score = severity × (0.5 + 0.5·confidence) × (0.5 + 0.5·recency)
+                       × (1 + EXPOSURE_WEIGHT·log2(exposure)) × (1 + KEV_WEIGHT·kev)
+    with recency = 0.5 ** (age_days / RECENCY_HALF_LIFE) (0.5 when the age is
+    unknown). A threat is anomalous when any of ANOMALY_FEATURES sits more
+    than ANOMALY_Z robust z-scores from the batch median; ages and exposure
+    are long-tailed, so they are compared as log1p().
+    """
+    age = columns["age_days"]
+    recency = np.where(np.isnan(age), 0.5, np.exp2(-np.clip(np.nan_to_num(age), 0, None) / RECENCY_HALF_LIFE))
+    scores = (columns["severity"]
+              * (0.5 + 0.5 * columns["confidence"])
+              * (0.5 + 0.5 * recency)
+              * (1 + EXPOSURE_WEIGHT * np.log2(np.maximum(columns["exposure"], 1)))
+              * (1 + KEV_WEIGHT * columns["kev"]))
+    anomalies = np.zeros(len(scores), dtype=bool)
+    for feature in ANOMALY_FEATURES:
+        values = columns[feature]
+        if feature in SKEWED_FEATURES:
+            values = np.log1p(np.clip(values, 0, None))
+        anomalies |= robust_z(values) > ANOMALY_Z
+    return np.round(scores, 3), anomalies
+
+
+def run_threat_analyzer(store: FeedStore = None, artifacts: dict = None):
     print("⚡ [Phase 11: AI Threat Prioritization & Anomaly Detection Started]")
 
-    # Mock threat data (would come from Phase 10 feeds)
-    threat_feed = [
-        {"ip": "192.168.0.5", "severity": "Critical", "source": "AbuseIPDB"},
-        {"ip": "8.8.8.8", "severity": "Medium", "source": "ThreatFox"},
-        {"ip": "10.10.10.10", "severity": "High", "source": "AlienVault"},
-        {"ip": "203.0.113.15", "severity": "Low", "source": "GreyNoise"}
-    ]
+    store = store or FeedStore()
+    index = shared_index(store)
+    artifacts = artifacts if artifacts is not None else collect_artifacts()
+    threat_feed = find_threats(index, store, artifacts)
+    print(f"🔎 {len(index):,} feed indicators joined against {len(artifacts['hosts'])} hosts, "
+          f"{len(artifacts['ips'])} IPs, {len(artifacts['urls'])} URLs, "
+          f"{len(artifacts['technologies'])} technologies — {len(threat_feed)} matches")
 
-    # Simulate AI prioritization
-    priority_map = {"Critical": 5, "High": 4, "Medium": 3, "Low": 2}
     analyzed = []
-    for t in threat_feed:
-        t["priority_score"] = priority_map[t["severity"]] * random.uniform(0.8, 1.2)
-        t["anomaly_detected"] = random.choice([True, False])
-        analyzed.append(t)
-
-    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
-    with open(REPORT_PATH, "w") as f:
-        json.dump({
-            "timestamp": str(datetime.datetime.utcnow()),
-            "total_analyzed": len(analyzed),
-            "results": analyzed
-        }, f, indent=2)
+    with RecordWriter(jsonl_path(REPORT_PATH), append=False) as out:
+        if threat_feed:
+            scores, anomalies = score_threats(threat_columns(threat_feed))
+            for idx in np.argsort(-scores, kind="stable").tolist():
+                t = threat_feed[idx]
+                t["priority_score"] = float(scores[idx])
+                t["anomaly_detected"] = bool(anomalies[idx])
+                out.write(t)
+                analyzed.append(t)
+
+    materialize_json(out.path, REPORT_PATH, key="results", extra={
+        "timestamp": str(datetime.datetime.utcnow()),
+        "total_analyzed": out.count,
+    })
 
     print(f"📊 Threat prioritization completed — {len(analyzed)} items analyzed.")
     print(f"💾 Saved report to: {REPORT_PATH}")
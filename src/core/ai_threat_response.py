@@ -1,9 +1,9 @@
-import json
-import os
 import random
 import datetime
 import time
 
+from core.record_stream import RecordWriter, jsonl_path, materialize_json
+
 REPORT_PATH = "data/reports/ai_threat_response.json"
 
 def run_threat_response():
@@ -18,23 +18,22 @@ def run_threat_response():
     ]
 
     responses = []
-    for t in simulated_threats:
-        response = {
-            "ip": t["ip"],
-            "severity": t["severity"],
-            "action": random.choice(["Blocked", "Quarantined", "Flagged for Review"]),
-            "timestamp": str(datetime.datetime.utcnow())
-        }
-        print(f"⚔️ Responding to threat {t['ip']} — Action: {response['action']}")
-        time.sleep(0.3)
-        responses.append(response)
+    with RecordWriter(jsonl_path(REPORT_PATH), append=False) as out:
+        for t in simulated_threats:
+            response = {
+                "ip": t["ip"],
+                "severity": t["severity"],
+                "action": random.choice(["Blocked", "Quarantined", "Flagged for Review"]),
+                "timestamp": str(datetime.datetime.utcnow())
+            }
+            print(f"⚔️ Responding to threat {t['ip']} — Action: {response['action']}")
+            time.sleep(0.3)
+            out.write(response)
+            responses.append(response)
 
-    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
-    with open(REPORT_PATH, "w") as f:
-        json.dump({
-            "timestamp": str(datetime.datetime.utcnow()),
-            "responses": responses
-        }, f, indent=2)
+    materialize_json(out.path, REPORT_PATH, key="responses", extra={
+        "timestamp": str(datetime.datetime.utcnow()),
+    })
 
     print(f"💾 Threat response simulation report saved → {REPORT_PATH}")
     print("✅ [Phase 12: AI Threat Response Simulation Completed]")
@@ -1,31 +1,93 @@
 """
 Digital Sentinel - Crawling Engine
 ==================================
-Simulates crawling step by saving results to data/cache/crawled/.
+Crawls the alive hosts found in Phase 2 with the shared crawler package and
+streams every fetched page URL to data/cache/crawled/crawl_results.txt as
+soon as it is crawled, so Phase 4 can start scanning before the crawl ends.
+
+Every response — HTTP error pages included — is also recorded to
+crawl_responses.jsonl.gz (url, status, headers, body) for Phase 4's
+signature scan, so scanning never depends on the optional response cache.
 """
 
 import os
-import time
+import asyncio
+
+from crawler import CrawlConfig, CrawlEngine, PageResult, load_targets
+from core.probing_engine import OUTPUT_FILE as ALIVE_HOSTS_FILE
+from core.rate_limiter import shared_limiter
+from core.record_stream import RecordWriter, iter_records
+
+OUTPUT_DIR = os.path.join("data", "cache", "crawled")
+OUTPUT_FILE = os.path.join(OUTPUT_DIR, "crawl_results.txt")
+RESPONSES_FILE = os.path.join(OUTPUT_DIR, "crawl_responses.jsonl.gz")
+
+
+async def stream_crawl_pages(targets, config: CrawlConfig = None, output_file: str = OUTPUT_FILE,
+                             responses_file: str = RESPONSES_FILE, engine: CrawlEngine = None):
+    """
+    Async generator of every PageResult that got a response (HTTP errors included).
+    Successful URLs are appended to crawl_results.txt and every response to
+    `responses_file` (None to skip it) before the page is yielded.
+    """
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    engine = engine or CrawlEngine(config or CrawlConfig(limiter=shared_limiter()))
+    responses = RecordWriter(responses_file, append=False, flush_every=100) if responses_file else None
+    try:
+        with open(output_file, "w") as f:
+            async for item in engine.crawl(targets):
+                if not isinstance(item, PageResult) or not item.answered:
+                    continue
+                if item.ok:
+                    f.write(item.url + "\n")
+                    f.flush()
+                if responses is not None:
+                    responses.write([item.url, item.status, item.headers or {}, item.text])
+                yield item
+    finally:
+        if responses is not None:
+            responses.close()
+
 
-def run_crawling():
-    """Main crawling phase — simulates basic site crawling."""
+def iter_crawl_responses(path: str = RESPONSES_FILE):
+    """(url, status, headers, body) for every response recorded by the last crawl."""
+    for url, status, headers, body in iter_records(path):
+        yield url, status, headers, body
+
+
+async def stream_crawl_urls(targets, config: CrawlConfig = None, output_file: str = OUTPUT_FILE,
+                            engine: CrawlEngine = None):
+    """
+    Async generator of crawled page URLs.
+    Each URL is appended to crawl_results.txt before it is yielded.
+    """
+    async for page in stream_crawl_pages(targets, config, output_file, None, engine):
+        if page.ok:
+            yield page.url
+
+
+def run_crawling(targets=None, config: CrawlConfig = None):
+    """Main crawling phase — crawls alive hosts from Phase 2."""
     print("🚀 [Phase 3: Crawling Engine Started]")
 
-    output_dir = os.path.join("data", "cache", "crawled")
-    os.makedirs(output_dir, exist_ok=True)
+    targets = targets if targets is not None else load_targets(ALIVE_HOSTS_FILE)
+    if not targets:
+        print(f"⚠️ No alive hosts to crawl (looked in {ALIVE_HOSTS_FILE})")
+        return []
+
+    engine = CrawlEngine(config or CrawlConfig(limiter=shared_limiter()))
 
-    output_file = os.path.join(output_dir, "crawl_results.txt")
+    async def _drain():
+        return [page.url async for page in stream_crawl_pages(targets, engine=engine) if page.ok]
 
-    # Simulate crawling
-    print("🔍 Crawling in progress...")
-    time.sleep(2)  # simulate delay
-    with open(output_file, "w") as f:
-        f.write("https://example.com/page1\n")
-        f.write("https://example.com/page2\n")
-        f.write("https://example.com/page3\n")
+    print(f"🔍 Crawling {len(targets)} alive hosts...")
+    urls = asyncio.run(_drain())
 
-    print(f"✅ Crawling results saved to {output_file}")
+    print(f"✅ {len(urls)} crawled URLs saved to {OUTPUT_FILE} (responses in {RESPONSES_FILE})")
+    if engine.memo:
+        engine.memo.report("Phase 3")
     print("🔚 [Phase 3: Crawling Completed]")
+    return urls
 
 
 if __name__ == "__main__":
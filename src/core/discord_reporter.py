@@ -1,8 +1,9 @@
 import json
 import os
-import requests
 from datetime import datetime
 
+from core.notifier import shared_notifier
+
 def send_discord_report():
     print("📡 [Phase 9: Discord Reporter Started]")
 
@@ -46,13 +47,9 @@ def send_discord_report():
         ],
     }
 
-    # Send to Discord
-    response = requests.post(webhook_url, json=embed)
-
-    if response.status_code == 204:
-        print("✅ Discord notification sent successfully.")
-    else:
-        print(f"❌ Failed to send Discord message. Status: {response.status_code}")
-        print(response.text)
+    # Queue for Discord — delivered in the background, paced and retried by core.notifier
+    if shared_notifier().notify(embeds=embed["embeds"], username=embed["username"],
+                                avatar_url=embed["avatar_url"], webhook_url=webhook_url):
+        print("📨 Discord notification queued for delivery.")
 
-    print("📡 [Phase 9 Completed: Discord Report Sent]")
+    print("📡 [Phase 9 Completed: Discord Report Queued]")
@@ -0,0 +1,365 @@
+"""
+Digital Sentinel - DNS Resolution Engine
+========================================
+Async stub resolver that sits between enumeration and probing:
+  • Thousands of queries in flight over one UDP socket
+  • TTL-aware answer cache (plus a short negative cache for NXDOMAIN and
+    NODATA; SERVFAIL / REFUSED are never cached)
+  • Retries that rotate through the configured nameservers, on timeouts and
+    on SERVFAIL / REFUSED from one of them
+  • Wildcard zone detection, so names that only "resolve" because of a
+    *.zone record are dropped before they cost an HTTP timeout — root
+    targets are exempt (foo.github.io is real even though *.github.io is)
+"""
+
+import os
+import json
+import time
+import random
+import socket
+import string
+import struct
+import asyncio
+from collections import OrderedDict
+
+DATA_DIR = "data"
+RESULTS_DIR = os.path.join(DATA_DIR, "results")
+SUBDOMAINS_FILE = os.path.join(RESULTS_DIR, "subdomains.txt")
+RESOLVED_FILE = os.path.join(RESULTS_DIR, "resolved.txt")
+RESOLVED_IPS_FILE = os.path.join(RESULTS_DIR, "resolved_ips.json")
+
+FALLBACK_NAMESERVERS = [("8.8.8.8", 53), ("1.1.1.1", 53)]
+CONCURRENCY = 1000      # queries in flight
+TIMEOUT = 2.0           # seconds per attempt
+RETRIES = 2             # extra attempts after the first
+CACHE_SIZE = 200000     # cached names
+MIN_TTL, MAX_TTL = 30, 3600
+NEGATIVE_TTL = 300      # how long NXDOMAIN / NODATA answers are cached
+WILDCARD_PROBES = 3     # random labels checked per zone
+SOCKET_BUFFER = 4 << 20 # receive buffer so bursts of answers are not dropped by the kernel
+
+QTYPE_A, QTYPE_CNAME = 1, 5
+RCODE_NOERROR, RCODE_SERVFAIL, RCODE_NXDOMAIN, RCODE_REFUSED = 0, 2, 3, 5
+RETRY_RCODES = (RCODE_SERVFAIL, RCODE_REFUSED)  # that server failed, another may answer
+
+
+def system_nameservers(path: str = "/etc/resolv.conf") -> list:
+    servers = []
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver" and ":" not in parts[1]:
+                    servers.append((parts[1], 53))
+    except OSError:
+        pass
+    return servers or FALLBACK_NAMESERVERS
+
+
+def build_query(qid: int, name: str, qtype: int = QTYPE_A) -> bytes:
+    header = struct.pack(">HHHHHH", qid, 0x0100, 1, 0, 0, 0)  # RD set, one question
+    qname = b"".join(bytes([len(l)]) + l.encode("idna") for l in name.strip(".").split(".") if l) + b"\x00"
+    return header + qname + struct.pack(">HH", qtype, 1)
+
+
+def _skip_name(data: bytes, offset: int) -> int:
+    while True:
+        length = data[offset]
+        if length == 0:
+            return offset + 1
+        if length & 0xC0 == 0xC0:
+            return offset + 2
+        offset += 1 + length
+
+
+def _read_name(data: bytes, offset: int) -> str:
+    labels = []
+    for _ in range(128):  # guards against pointer loops
+        length = data[offset]
+        if length == 0:
+            break
+        if length & 0xC0 == 0xC0:
+            offset = struct.unpack(">H", data[offset:offset + 2])[0] & 0x3FFF
+            continue
+        labels.append(data[offset + 1:offset + 1 + length].decode("ascii", "replace"))
+        offset += 1 + length
+    return ".".join(labels).lower()
+
+
+def parse_response(data: bytes):
+    """Returns (qid, rcode, question_name, [(type, value, ttl), ...])."""
+    qid, flags, qdcount, ancount, _, _ = struct.unpack(">HHHHHH", data[:12])
+    offset = 12
+    question = _read_name(data, offset) if qdcount else ""
+    for _ in range(qdcount):
+        offset = _skip_name(data, offset) + 4
+    answers = []
+    for _ in range(ancount):
+        offset = _skip_name(data, offset)
+        rtype, _, ttl, rdlength = struct.unpack(">HHIH", data[offset:offset + 10])
+        offset += 10
+        if rtype == QTYPE_A and rdlength == 4:
+            answers.append((rtype, socket.inet_ntoa(data[offset:offset + 4]), ttl))
+        elif rtype == QTYPE_CNAME:
+            answers.append((rtype, _read_name(data, offset), ttl))
+        offset += rdlength
+    return qid, flags & 0x000F, question, answers
+
+
+class DnsAnswer:
+    __slots__ = ("name", "addresses", "cnames", "ttl", "rcode", "error")
+
+    def __init__(self, name: str, addresses=(), cnames=(), ttl: int = 0, rcode: int = None, error: str = None):
+        self.name = name
+        self.addresses = list(addresses)
+        self.cnames = list(cnames)
+        self.ttl = ttl
+        self.rcode = rcode
+        self.error = error
+
+    @property
+    def resolved(self) -> bool:
+        return bool(self.addresses)
+
+
+class _DnsProtocol(asyncio.DatagramProtocol):
+    def __init__(self, pending: dict):
+        self.pending = pending
+
+    def datagram_received(self, data, addr):
+        if len(data) < 12:
+            return
+        qid = struct.unpack(">H", data[:2])[0]
+        entry = self.pending.get(qid)
+        if entry and entry[1] == addr and not entry[0].done():
+            entry[0].set_result(data)
+
+    def error_received(self, exc):
+        pass
+
+
+class AsyncResolver:
+    """A-record resolver with caching, retries and wildcard detection."""
+
+    def __init__(self, nameservers: list = None, timeout: float = TIMEOUT, retries: int = RETRIES,
+                 concurrency: int = CONCURRENCY, cache_size: int = CACHE_SIZE):
+        self.nameservers = nameservers or system_nameservers()
+        self.timeout = timeout
+        self.retries = retries
+        self.cache_size = cache_size
+        self.slots = asyncio.Semaphore(concurrency)
+        self.cache = OrderedDict()
+        self.inflight = {}
+        self.wildcards = {}
+        self.pending = {}
+        self.transport = None
+        self.stats = {"queries": 0, "cache_hits": 0, "timeouts": 0, "wildcard_filtered": 0}
+
+    async def _ensure_socket(self):
+        if self.transport is None:
+            loop = asyncio.get_running_loop()
+            self.transport, _ = await loop.create_datagram_endpoint(
+                lambda: _DnsProtocol(self.pending), local_addr=("0.0.0.0", 0))
+            sock = self.transport.get_extra_info("socket")
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER)
+            except OSError:
+                pass
+
+    async def close(self):
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    async def __aenter__(self):
+        await self._ensure_socket()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _cache_get(self, name: str):
+        entry = self.cache.get(name)
+        if entry is None:
+            return None
+        expires, answer = entry
+        if expires < time.monotonic():
+            del self.cache[name]
+            return None
+        self.cache.move_to_end(name)
+        return answer
+
+    def _cache_put(self, answer: DnsAnswer):
+        if answer.error:
+            return
+        if answer.resolved:
+            ttl = min(max(answer.ttl, MIN_TTL), MAX_TTL)
+        elif answer.rcode in (RCODE_NXDOMAIN, RCODE_NOERROR):
+            ttl = NEGATIVE_TTL
+        else:
+            return
+        self.cache[answer.name] = (time.monotonic() + ttl, answer)
+        self.cache.move_to_end(answer.name)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    async def _query(self, name: str) -> DnsAnswer:
+        await self._ensure_socket()
+        loop = asyncio.get_running_loop()
+        last_error = "timeout"
+        for attempt in range(self.retries + 1):
+            server = self.nameservers[attempt % len(self.nameservers)]
+            qid = random.getrandbits(16)
+            while qid in self.pending:
+                qid = random.getrandbits(16)
+            future = loop.create_future()
+            self.pending[qid] = (future, server)
+            try:
+                self.stats["queries"] += 1
+                self.transport.sendto(build_query(qid, name), server)
+                data = await asyncio.wait_for(future, self.timeout)
+                _, rcode, question, records = parse_response(data)
+                if question and question != name.lower():
+                    last_error = "question mismatch"
+                    continue
+                if rcode in RETRY_RCODES:
+                    last_error = f"rcode {rcode} from {server[0]}"
+                    continue
+                addresses = [v for t, v, _ in records if t == QTYPE_A]
+                cnames = [v for t, v, _ in records if t == QTYPE_CNAME]
+                ttl = min((ttl for _, _, ttl in records), default=0)
+                return DnsAnswer(name, addresses, cnames, ttl, rcode)
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                last_error = "timeout"
+            except (struct.error, IndexError, UnicodeError) as e:
+                last_error = f"malformed response: {e}"
+            finally:
+                self.pending.pop(qid, None)
+        return DnsAnswer(name, error=last_error)
+
+    async def resolve(self, name: str) -> DnsAnswer:
+        name = name.strip().lower().rstrip(".")
+        cached = self._cache_get(name)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+        if name in self.inflight:
+            return await asyncio.shield(self.inflight[name])
+
+        task = asyncio.ensure_future(self._resolve_uncached(name))
+        self.inflight[name] = task
+        try:
+            return await task
+        finally:
+            self.inflight.pop(name, None)
+
+    async def _resolve_uncached(self, name: str) -> DnsAnswer:
+        async with self.slots:
+            answer = await self._query(name)
+        self._cache_put(answer)
+        return answer
+
+    async def wildcard_addresses(self, zone: str) -> set:
+        """IPs that random labels under `zone` resolve to (empty set = no wildcard)."""
+        if zone not in self.wildcards:
+            self.wildcards[zone] = asyncio.ensure_future(self._detect_wildcard(zone))
+        return await asyncio.shield(self.wildcards[zone])
+
+    async def _detect_wildcard(self, zone: str) -> set:
+        labels = ["".join(random.choices(string.ascii_lowercase + string.digits, k=16))
+                  for _ in range(WILDCARD_PROBES)]
+        answers = await asyncio.gather(*(self._query(f"{label}.{zone}") for label in labels))
+        return {ip for a in answers for ip in a.addresses}
+
+    async def is_wildcard_hit(self, answer: DnsAnswer) -> bool:
+        """True when every address of `answer` is one its parent zone's wildcard returns."""
+        if not answer.resolved or "." not in answer.name:
+            return False
+        wildcard = await self.wildcard_addresses(answer.name.split(".", 1)[1])
+        return bool(wildcard) and set(answer.addresses) <= wildcard
+
+    async def resolve_live(self, name: str, filter_wildcards: bool = True):
+        """Resolve and return the answer only if it is real (resolves, not a wildcard echo)."""
+        answer = await self.resolve(name)
+        if not answer.resolved:
+            return None
+        if filter_wildcards and await self.is_wildcard_hit(answer):
+            self.stats["wildcard_filtered"] += 1
+            return None
+        return answer
+
+
+async def resolve_names(names, resolver: AsyncResolver, workers: int = CONCURRENCY,
+                        filter_wildcards: bool = True, roots=()):
+    """
+    Async generator of DnsAnswer for every name that really resolves.
+    Names in `roots` (the root targets) are never wildcard-filtered.
+    """
+    pending = iter(names)
+    roots = {root.strip().lower().rstrip(".") for root in roots}
+    out = asyncio.Queue(maxsize=workers * 2)
+    done = object()
+
+    async def worker():
+        for name in pending:
+            exempt = name.strip().lower().rstrip(".") in roots
+            answer = await resolver.resolve_live(name, filter_wildcards and not exempt)
+            if answer:
+                await out.put(answer)
+
+    async def drive():
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        await out.put(done)
+
+    driver = asyncio.create_task(drive())
+    try:
+        while True:
+            item = await out.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        driver.cancel()
+        await asyncio.gather(driver, return_exceptions=True)
+
+
+def run_resolution(names: list = None, nameservers: list = None, roots=()) -> list:
+    """
+    Phase 1.5 — resolve enumerated names and keep only the real ones.
+    `roots` are the root targets, kept even when their parent zone is a wildcard.
+    Writes resolved.txt (names) and resolved_ips.json (name → addresses).
+    """
+    print("🚀 [Phase 1.5: DNS Resolution Started]")
+    if names is None:
+        if not os.path.exists(SUBDOMAINS_FILE):
+            print(f"⚠️ Subdomain list not found at {SUBDOMAINS_FILE}")
+            return []
+        with open(SUBDOMAINS_FILE, "r", encoding="utf-8") as f:
+            names = [line.strip() for line in f if line.strip()]
+
+    async def _resolve_all():
+        async with AsyncResolver(nameservers) as resolver:
+            answers = [a async for a in resolve_names(names, resolver, roots=roots)]
+        return answers, resolver.stats
+
+    start = time.perf_counter()
+    answers, stats = asyncio.run(_resolve_all())
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(RESOLVED_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(a.name for a in answers))
+    with open(RESOLVED_IPS_FILE, "w", encoding="utf-8") as f:
+        json.dump({a.name: a.addresses for a in answers}, f, indent=2)
+
+    print(f"🧭 {len(answers)}/{len(names)} names resolved in {elapsed:.2f}s "
+          f"({stats['queries']} queries, {stats['timeouts']} timeouts, "
+          f"{stats['wildcard_filtered']} wildcard echoes dropped)")
+    print(f"💾 Resolved hosts saved to {RESOLVED_FILE}")
+    print("🔚 [Phase 1.5: DNS Resolution Completed]")
+    return [a.name for a in answers]
+
+
+if __name__ == "__main__":
+    run_resolution()
@@ -7,15 +7,23 @@ Responsible for discovering active subdomains and preparing the intelligence lay
 
 import os
 import subprocess
-import time
+import asyncio
 from datetime import datetime
 
+from core.subdomain_store import SubdomainStore, EnumerationDelta
+from core.enumeration_sources import default_sources, enumerate_domains
+
 
 # ===================== ⚙️ Configuration =====================
 DATA_DIR = "data"
 TARGET_FILE = os.path.join(DATA_DIR, "targets.txt")
 RESULTS_DIR = os.path.join(DATA_DIR, "results")
 ENUM_LOG = os.path.join(RESULTS_DIR, "enumeration.log")
+SUBDOMAINS_FILE = os.path.join(RESULTS_DIR, "subdomains.txt")
+NEW_SUBDOMAINS_FILE = os.path.join(RESULTS_DIR, "subdomains_new.txt")
+GONE_SUBDOMAINS_FILE = os.path.join(RESULTS_DIR, "subdomains_gone.txt")
+WORDLIST_FILE = os.path.join(DATA_DIR, "wordlists", "subdomains.txt")   # optional brute-force list
+PASSIVE_DIR = os.path.join(DATA_DIR, "passive")                        # optional *.txt passive datasets
 
 os.makedirs(RESULTS_DIR, exist_ok=True)
 # ============================================================
@@ -41,49 +49,74 @@ def read_targets():
     return targets
 
 
-def enumerate_subdomains(domain: str):
+def build_sources() -> list:
+    """Static prefixes plus any wordlist / passive datasets present under data/."""
+    return default_sources(WORDLIST_FILE, PASSIVE_DIR)
+
+
+async def enumerate_all(targets: list, sources: list = None) -> dict:
+    """Run every source concurrently across all targets; returns domain → names."""
+    sources = sources or build_sources()
+    results = {t: [] for t in targets}
+    async for domain, name in enumerate_domains(targets, sources):
+        results[domain].append(name)
+    for domain, names in results.items():
+        log_event(f"✅ Enumeration for {domain} finished — {len(names)} subdomains found.")
+    return results
+
+
+def enumerate_subdomains(domain: str, sources: list = None):
     """
     Perform subdomain enumeration for a given domain.
-    You can later replace this mock implementation with real tools like subfinder or amass.
+    Sources are plugins (see enumeration_sources); add real tools like subfinder or amass as new sources.
     """
     log_event(f"🌐 Enumerating subdomains for: {domain}")
-    # Example simulation
-    subdomains = [
-        f"api.{domain}",
-        f"dev.{domain}",
-        f"staging.{domain}",
-        f"mail.{domain}",
-        f"www.{domain}"
-    ]
-    time.sleep(1)
-    log_event(f"✅ Enumeration for {domain} finished — {len(subdomains)} subdomains found.")
-    return subdomains
+    return asyncio.run(enumerate_all([domain], sources))[domain]
 
 
-def run_enumeration(targets_file: str = TARGET_FILE):
+def run_incremental_enumeration(targets_file: str = TARGET_FILE) -> EnumerationDelta:
     """
-    Main entrypoint for enumeration — called by main_controller_v11_4_quantum.py.
-    Reads targets from file, enumerates subdomains, and stores results.
+    Enumerate every target and sync the results against the persistent
+    subdomain store. Writes the full list plus the new/disappeared names for
+    this cycle, and returns the delta so later phases can skip unchanged hosts.
     """
     log_event("🚀 Enumeration engine started.")
     targets = read_targets()
-    all_subdomains = []
-
-    for target in targets:
-        try:
-            found = enumerate_subdomains(target)
-            all_subdomains.extend(found)
-        except Exception as e:
-            log_event(f"❌ Error enumerating {target}: {e}")
+    delta = EnumerationDelta()
+    found_by_target = asyncio.run(enumerate_all(targets))
+    store = SubdomainStore()
+
+    try:
+        for target, found in found_by_target.items():
+            try:
+                new, gone = store.sync(target, found)
+                delta.extend(found, new, gone)
+            except Exception as e:
+                log_event(f"❌ Error enumerating {target}: {e}")
+    finally:
+        store.close()
+
+    # A name under two overlapping targets is listed once
+    delta.all, delta.new, delta.gone = (list(dict.fromkeys(names)) for names in (delta.all, delta.new, delta.gone))
 
     # Save results
-    out_file = os.path.join(RESULTS_DIR, "subdomains.txt")
-    with open(out_file, "w", encoding="utf-8") as f:
-        f.write("\n".join(all_subdomains))
+    for path, names in ((SUBDOMAINS_FILE, delta.all), (NEW_SUBDOMAINS_FILE, delta.new),
+                        (GONE_SUBDOMAINS_FILE, delta.gone)):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(names))
 
-    log_event(f"💾 Saved {len(all_subdomains)} total subdomains → {out_file}")
+    log_event(f"💾 Saved {len(delta.all)} total subdomains → {SUBDOMAINS_FILE}")
+    log_event(f"🆕 {len(delta.new)} new, 🕳️ {len(delta.gone)} disappeared since last cycle.")
     log_event("✅ Enumeration phase complete.\n")
-    return all_subdomains
+    return delta
+
+
+def run_enumeration(targets_file: str = TARGET_FILE):
+    """
+    Main entrypoint for enumeration — called by main_controller_v11_4_quantum.py.
+    Reads targets from file, enumerates subdomains, and stores results.
+    """
+    return run_incremental_enumeration(targets_file).all
 
 
 # Standalone execution (for testing)
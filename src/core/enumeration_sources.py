@@ -0,0 +1,179 @@
+"""
+Digital Sentinel - Enumeration Sources
+======================================
+Pluggable async subdomain sources and the runner that fans them out.
+
+A source is any EnumerationSource subclass whose async generator
+`enumerate(domain, known)` yields candidate names. Sources marked
+`derived = True` (e.g. permutations) run after the others and receive the
+names already found for that domain through `known`.
+
+enumerate_domains() runs every source concurrently per domain and across
+domains under one global cap, and yields (domain, name) pairs as they
+stream in, deduplicated per domain: overlapping targets (example.com and
+api.example.com) each get every name that falls under them.
+"""
+
+import os
+import glob
+import asyncio
+
+GLOBAL_CONCURRENCY = 50   # source jobs in flight across all domains
+DOMAIN_CONCURRENCY = 20   # domains being enumerated at once
+
+_DONE = object()
+
+
+class EnumerationSource:
+    """Base plugin: yield subdomains of `domain`."""
+
+    name = "base"
+    derived = False
+
+    async def enumerate(self, domain: str, known=()):
+        return
+        yield
+
+
+class StaticSource(EnumerationSource):
+    """The built-in prefixes the engine has always produced."""
+
+    name = "static"
+    PREFIXES = ("api", "dev", "staging", "mail", "www")
+
+    def __init__(self, prefixes=PREFIXES):
+        self.prefixes = prefixes
+
+    async def enumerate(self, domain: str, known=()):
+        for prefix in self.prefixes:
+            yield f"{prefix}.{domain}"
+
+
+class WordlistSource(EnumerationSource):
+    """Brute-force candidates: one name per wordlist entry. Resolution filters the misses."""
+
+    name = "wordlist"
+
+    def __init__(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            self.words = [w.strip().lower() for w in f if w.strip() and not w.startswith("#")]
+
+    async def enumerate(self, domain: str, known=()):
+        for idx, word in enumerate(self.words):
+            yield f"{word}.{domain}"
+            if idx % 1000 == 999:
+                await asyncio.sleep(0)  # let other sources run during big wordlists
+
+
+class PassiveFileSource(EnumerationSource):
+    """
+    Passive datasets on disk (one hostname per line, e.g. exported
+    certificate-transparency or DNS dumps). Loaded once and indexed by every
+    parent suffix, so each domain lookup is a dict hit.
+    """
+
+    name = "passive"
+
+    def __init__(self, paths):
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.index = None
+
+    def _build_index(self):
+        index = {}
+        for path in self.paths:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                for line in f:
+                    name = line.strip().lower().rstrip(".")
+                    if not name or name.startswith("#"):
+                        continue
+                    labels = name.split(".")
+                    for i in range(1, len(labels) - 1):
+                        index.setdefault(".".join(labels[i:]), []).append(name)
+        self.index = index
+
+    async def enumerate(self, domain: str, known=()):
+        if self.index is None:
+            await asyncio.to_thread(self._build_index)
+        for name in self.index.get(domain.lower(), ()):
+            yield name
+
+
+class PermutationSource(EnumerationSource):
+    """Derive new candidates from names already found (api → api-dev, dev-api, api2 …)."""
+
+    name = "permutations"
+    derived = True
+    WORDS = ("dev", "staging", "test", "prod", "internal", "old", "new")
+
+    def __init__(self, words=WORDS, max_per_domain: int = 5000):
+        self.words = words
+        self.max_per_domain = max_per_domain
+
+    async def enumerate(self, domain: str, known=()):
+        produced = 0
+        suffix = "." + domain
+        for name in list(known):
+            if not name.endswith(suffix):
+                continue
+            label = name[: -len(suffix)].split(".", 1)[0]
+            candidates = [f"{label}{n}" for n in (1, 2)]
+            for word in self.words:
+                if word != label:
+                    candidates += [f"{label}-{word}", f"{word}-{label}"]
+            for candidate in candidates:
+                yield f"{candidate}{suffix}"
+                produced += 1
+                if produced >= self.max_per_domain:
+                    return
+
+
+def default_sources(wordlist: str = None, passive_dir: str = None) -> list:
+    """Static prefixes, wordlist / passive datasets when the files exist, then permutations of it all."""
+    sources = [StaticSource()]
+    if wordlist and os.path.exists(wordlist):
+        sources.append(WordlistSource(wordlist))
+    passive_files = sorted(glob.glob(os.path.join(passive_dir, "*.txt"))) if passive_dir else []
+    if passive_files:
+        sources.append(PassiveFileSource(passive_files))
+    sources.append(PermutationSource())
+    return sources
+
+
+async def enumerate_domains(domains, sources: list, concurrency: int = GLOBAL_CONCURRENCY,
+                            domain_concurrency: int = DOMAIN_CONCURRENCY):
+    """Async generator of (domain, name) pairs from all sources, unique per domain, as they arrive."""
+    slots = asyncio.Semaphore(concurrency)
+    out = asyncio.Queue(maxsize=10000)
+    pending = iter(domains)
+
+    async def run_source(source, domain, found):
+        async with slots:
+            try:
+                async for name in source.enumerate(domain, found):
+                    name = name.strip().lower().rstrip(".")
+                    if name and name not in found:
+                        found.add(name)
+                        await out.put((domain, name))
+            except Exception as e:
+                print(f"⚠️ [Enumeration:{source.name}] {domain}: {e}")
+
+    async def domain_worker():
+        for domain in pending:
+            found = set()
+            await asyncio.gather(*(run_source(s, domain, found) for s in sources if not s.derived))
+            await asyncio.gather(*(run_source(s, domain, found) for s in sources if s.derived))
+
+    async def drive():
+        await asyncio.gather(*(domain_worker() for _ in range(domain_concurrency)))
+        await out.put(_DONE)
+
+    driver = asyncio.create_task(drive())
+    try:
+        while True:
+            item = await out.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        driver.cancel()
+        await asyncio.gather(driver, return_exceptions=True)
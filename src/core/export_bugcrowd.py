@@ -2,44 +2,73 @@
 Digital Sentinel - Export Bugcrowd
 ==================================
 Simulates exporting vulnerability results to Bugcrowd-compatible format.
+Findings are read as core.findings.Finding records from the scanner's
+findings.jsonl (older runs' scan_report.txt lines are parsed as a fallback),
+streamed to bugcrowd_export.jsonl and then materialised as
+bugcrowd_export.json.
+
+With the findings store populated, only findings that are new or changed
+since the last export are written, and are then marked exported. Each
+finding is exported under its fingerprint, which stays the same across
+cycles (the scanner's per-scan sequence number does not).
 """
 
 import os
-import json
 import time
 
-def export_bugcrowd():
+from core.findings import Finding, iter_findings
+from core.findings_store import FindingsStore
+from core.record_stream import RecordWriter, materialize_json
+from core.vulnerability_scanner import FINDINGS_FILE, OUTPUT_FILE as SCAN_REPORT_FILE
+
+EXPORT_CHANNEL = "bugcrowd_export"
+
+
+def load_findings():
+    """Findings from the last scan, or None when there was no scan."""
+    if os.path.exists(FINDINGS_FILE):
+        return iter_findings(FINDINGS_FILE)
+    if os.path.exists(SCAN_REPORT_FILE):
+        with open(SCAN_REPORT_FILE, "r") as f:
+            lines = [line.strip() for line in f if line.strip()]
+        return (Finding.from_report_line(line, idx) for idx, line in enumerate(lines, start=1))
+    return None
+
+
+def export_bugcrowd(store=None):
     """Simulated export to Bugcrowd format."""
     print("🚀 [Phase 5: Export Bugcrowd Started]")
 
-    input_file = os.path.join("data", "cache", "vulnerabilities", "scan_report.txt")
     output_dir = os.path.join("data", "exports")
     os.makedirs(output_dir, exist_ok=True)
     output_file = os.path.join(output_dir, "bugcrowd_export.json")
+    stream_file = os.path.join(output_dir, "bugcrowd_export.jsonl")
+
+    store = store or FindingsStore()
+    tracked = store.count() > 0
+    if tracked:
+        findings = store.pending_export(EXPORT_CHANNEL)
+        print(f"🗃️ {len(findings)} new or changed findings to export")
+    else:
+        findings = load_findings()
+        if findings is None:
+            print(f"⚠️ Vulnerability scan report not found at {SCAN_REPORT_FILE}")
+            return
+
+    with RecordWriter(stream_file, append=False, flush_every=1000) as out:
+        for finding in findings:
+            if finding.clean:
+                continue
+            out.write({
+                "id": finding.fingerprint(),
+                "severity": finding.severity,
+                "description": finding.as_report_line(),
+                "status": finding.status
+            })
 
-    if not os.path.exists(input_file):
-        print(f"⚠️ Vulnerability scan report not found at {input_file}")
-        return
-
-    with open(input_file, "r") as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
-
-    data = []
-    for idx, line in enumerate(lines, start=1):
-        severity = "info"
-        if "[HIGH]" in line:
-            severity = "high"
-        elif "[MEDIUM]" in line:
-            severity = "medium"
-        data.append({
-            "id": idx,
-            "severity": severity,
-            "description": line,
-            "status": "open"
-        })
-
-    with open(output_file, "w") as f:
-        json.dump({"findings": data}, f, indent=4)
+    materialize_json(stream_file, output_file, key="findings", indent=4)
+    if tracked:
+        store.mark_exported(findings, EXPORT_CHANNEL)
 
     time.sleep(1)
     print(f"💾 Bugcrowd-compatible export created at {output_file}")
@@ -0,0 +1,466 @@
+"""
+Digital Sentinel - Threat Feed Sync
+===================================
+Concurrent, incremental sync of threat-intel feeds into one keyed store.
+
+  • A source is any FeedSource subclass: where it lives, how to ask for
+    "only what changed since <cursor>", how to page, and how to turn a
+    payload into keyed records. Adding a feed is one small class.
+  • Every source is fetched at the same time over one aiohttp session
+  • Conditional requests: the ETag / Last-Modified of the last sync go out
+    as If-None-Match / If-Modified-Since, so an unchanged feed costs a 304
+  • Incremental parameters where the API has them (OTX modified_since);
+    full-snapshot feeds (KEV, AbuseIPDB blacklist) are skipped when their
+    version marker hasn't moved, and are polled no more often than
+    `min_interval` allows
+  • Records are merged into data/feeds/feeds.db keyed by (source, key):
+    only new or changed records are written; records that drop out of a
+    snapshot feed are marked inactive rather than deleted
+
+FeedStore is what later phases read: by_indicator() for lookups, records()
+to iterate a source or an indicator kind.
+"""
+
+import os
+import time
+import random
+import asyncio
+import sqlite3
+import hashlib
+
+import aiohttp
+
+from core.rate_limiter import retry_after_seconds
+from core.record_stream import encode, decode
+
+FEED_DB = os.path.join("data", "feeds", "feeds.db")
+FEED_CONCURRENCY = 8     # connections across all sources
+FEED_TIMEOUT = 60        # seconds per page
+MAX_RETRIES = 3          # per page, on 429 / 5xx
+MAX_PAGES = 500          # safety stop for paginated sources
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Indicator type (as the feeds spell it) → the kind lookups are indexed by
+INDICATOR_KINDS = {
+    "ipv4": "ip", "ipv6": "ip", "ip": "ip", "cidr": "cidr",
+    "domain": "domain", "hostname": "domain", "url": "url", "uri": "url",
+    "filehash-md5": "hash", "filehash-sha1": "hash", "filehash-sha256": "hash", "md5": "hash", "sha1": "hash",
+    "sha256": "hash", "cve": "cve", "email": "email",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed_records (
+    source     TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    kind       TEXT,
+    value      TEXT,
+    hash       TEXT NOT NULL,
+    record     TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen  REAL NOT NULL,
+    active     INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (source, key)
+);
+CREATE INDEX IF NOT EXISTS idx_feed_records_indicator ON feed_records (kind, value);
+CREATE INDEX IF NOT EXISTS idx_feed_records_last_seen ON feed_records (last_seen);
+CREATE TABLE IF NOT EXISTS feed_state (
+    source        TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    cursor        TEXT,
+    synced_at     REAL,
+    status        INTEGER
+);
+"""
+
+
+def indicator_kind(type_name) -> str:
+    return INDICATOR_KINDS.get(str(type_name or "").lower())
+
+
+class FeedState:
+    """What the last successful sync of one source left behind."""
+
+    def __init__(self, etag=None, last_modified=None, cursor=None, synced_at=None, status=None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.cursor = cursor
+        self.synced_at = synced_at
+        self.status = status
+
+
+class SyncResult:
+    """One source's outcome for one sync."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "pending"   # updated | not-modified | unchanged | skipped | error
+        self.pages = 0
+        self.bytes = 0
+        self.fetched = 0
+        self.new = 0
+        self.changed = 0
+        self.retired = 0
+        self.elapsed = 0.0
+        self.error = None
+
+    def summary(self) -> str:
+        if self.status == "error":
+            return f"error: {self.error}"
+        if self.status != "updated":
+            return self.status
+        return (f"{self.fetched} records in {self.pages} page(s), {self.bytes / 1024:.0f} KiB — "
+                f"{self.new} new, {self.changed} changed, {self.retired} retired")
+
+
+class FeedSource:
+    """
+    Base plugin. Subclasses set `name` and `url` and implement items(); the
+    rest are hooks with sensible defaults.
+
+      params(cursor)        query parameters, given the cursor of the last sync
+      next_page(payload)    URL of the next page, or None
+      cursor_of(payload, c) the cursor to store after this page
+      snapshot              True when each sync returns the whole feed, so keys
+                            that stop appearing are retired
+      min_interval          seconds to wait between syncs (API quotas)
+      api_key_env           environment variable holding the API key; the
+                            source is skipped while it is unset
+    """
+
+    name = "base"
+    url = None
+    snapshot = False
+    min_interval = 0
+    api_key_env = None
+
+    def __init__(self, url: str = None, api_key: str = None):
+        if url:
+            self.url = url
+        self.api_key = api_key if api_key is not None else os.getenv(self.api_key_env or "", "")
+
+    def enabled(self) -> bool:
+        return not self.api_key_env or bool(self.api_key)
+
+    def headers(self) -> dict:
+        return {"Accept": "application/json"}
+
+    def params(self, cursor) -> dict:
+        return {}
+
+    def next_page(self, payload):
+        return None
+
+    def cursor_of(self, payload, cursor):
+        return cursor
+
+    def items(self, payload):
+        """Yield (key, kind, value, record) for every record in one page."""
+        return
+        yield
+
+
+class AlienVaultSource(FeedSource):
+    """OTX subscribed pulses; only pulses modified since the last sync are requested."""
+
+    name = "alienvault"
+    url = "https://otx.alienvault.com/api/v1/pulses/subscribed"
+    api_key_env = "OTX_API_KEY"
+    PAGE_SIZE = 50
+
+    def headers(self) -> dict:
+        return {"Accept": "application/json", "X-OTX-API-KEY": self.api_key}
+
+    def params(self, cursor) -> dict:
+        params = {"limit": self.PAGE_SIZE}
+        if cursor:
+            params["modified_since"] = cursor
+        return params
+
+    def next_page(self, payload):
+        return payload.get("next")
+
+    def cursor_of(self, payload, cursor):
+        modified = [p.get("modified") for p in payload.get("results", []) if p.get("modified")]
+        return max(modified + ([cursor] if cursor else []), default=cursor)
+
+    def items(self, payload):
+        for pulse in payload.get("results", []):
+            for ioc in pulse.get("indicators", []):
+                indicator = ioc.get("indicator")
+                if not indicator:
+                    continue
+                record = {"type": ioc.get("type"), "indicator": indicator, "title": pulse.get("name"),
+                          "date": pulse.get("modified")}
+                yield f"{ioc.get('type')}:{indicator}", indicator_kind(ioc.get("type")), indicator, record
+
+
+class CisaKevSource(FeedSource):
+    """CISA Known Exploited Vulnerabilities: one file, served with ETag / Last-Modified."""
+
+    name = "cisa_kev"
+    url = "https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json"
+    snapshot = True
+
+    def cursor_of(self, payload, cursor):
+        return payload.get("catalogVersion") or payload.get("dateReleased") or cursor
+
+    def items(self, payload):
+        for vuln in payload.get("vulnerabilities", []):
+            cve = vuln.get("cveID")
+            if cve:
+                yield cve, "cve", cve, vuln
+
+
+class AbuseIPDBSource(FeedSource):
+    """
+    AbuseIPDB blacklist. No conditional or incremental API, and a small daily
+    quota, so it is polled at most every `min_interval` and merged only when
+    meta.generatedAt moved.
+    """
+
+    name = "abuseipdb"
+    url = "https://api.abuseipdb.com/api/v2/blacklist"
+    api_key_env = "ABUSEIPDB_API_KEY"
+    snapshot = True
+    min_interval = 6 * 3600
+
+    def headers(self) -> dict:
+        return {"Accept": "application/json", "Key": self.api_key}
+
+    def cursor_of(self, payload, cursor):
+        return (payload.get("meta") or {}).get("generatedAt") or cursor
+
+    def items(self, payload):
+        for entry in payload.get("data", []):
+            ip = entry.get("ipAddress")
+            if ip:
+                yield ip, "ip", ip, entry
+
+
+def default_sources() -> list:
+    return [AlienVaultSource(), CisaKevSource(), AbuseIPDBSource()]
+
+
+class FeedStore:
+    """SQLite-backed, keyed record of every feed entry plus per-source sync state."""
+
+    def __init__(self, path: str = FEED_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def state(self, source: str) -> FeedState:
+        row = self.conn.execute(
+            "SELECT etag, last_modified, cursor, synced_at, status FROM feed_state WHERE source = ?", (source,)
+        ).fetchone()
+        return FeedState(*row) if row else FeedState()
+
+    def save_state(self, source: str, state: FeedState):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO feed_state (source, etag, last_modified, cursor, synced_at, status) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(source) DO UPDATE SET etag = excluded.etag, "
+                "last_modified = excluded.last_modified, cursor = excluded.cursor, "
+                "synced_at = excluded.synced_at, status = excluded.status",
+                (source, state.etag, state.last_modified, state.cursor, state.synced_at, state.status),
+            )
+
+    def known(self, source: str) -> dict:
+        """key → (hash, active) for every record of `source`."""
+        rows = self.conn.execute("SELECT key, hash, active FROM feed_records WHERE source = ?", (source,))
+        return {key: (digest, active) for key, digest, active in rows}
+
+    def merge(self, source: str, items, known: dict, seen_at: float = None) -> tuple:
+        """
+        Write the new and changed (key, kind, value, record) items of `source`.
+        `known` (from known()) is updated in place. Returns (new, changed).
+        """
+        seen_at = seen_at or time.time()
+        rows, new, changed = {}, 0, 0
+        for key, kind, value, record in items:
+            data = encode(record)
+            digest = hashlib.sha1(data.encode()).hexdigest()
+            before = known.get(key)
+            if before is not None and before == (digest, 1):
+                continue
+            if key not in rows:
+                if before is None:
+                    new += 1
+                else:
+                    changed += 1
+            known[key] = (digest, 1)
+            rows[key] = (source, key, kind, value, digest, data, seen_at, seen_at)
+        if rows:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO feed_records (source, key, kind, value, hash, record, first_seen, last_seen, active) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1) ON CONFLICT(source, key) DO UPDATE SET kind = excluded.kind, "
+                    "value = excluded.value, hash = excluded.hash, record = excluded.record, "
+                    "last_seen = excluded.last_seen, active = 1",
+                    rows.values(),
+                )
+        return new, changed
+
+    def retire(self, source: str, seen_keys, known: dict) -> int:
+        """Mark active records of `source` that are not in `seen_keys` inactive."""
+        gone = [key for key, (_, active) in known.items() if active and key not in seen_keys]
+        if gone:
+            with self.conn:
+                self.conn.executemany("UPDATE feed_records SET active = 0 WHERE source = ? AND key = ?",
+                                      [(source, key) for key in gone])
+            for key in gone:
+                known[key] = (known[key][0], 0)
+        return len(gone)
+
+    def records(self, source: str = None, kind: str = None, active_only: bool = True):
+        """Lazily yield (source, kind, value, record) rows, optionally filtered."""
+        query, args = "SELECT source, kind, value, record FROM feed_records WHERE 1 = 1", []
+        if source:
+            query += " AND source = ?"
+            args.append(source)
+        if kind:
+            query += " AND kind = ?"
+            args.append(kind)
+        if active_only:
+            query += " AND active = 1"
+        for src, knd, value, record in self.conn.execute(query, args):
+            yield src, knd, value, decode(record)
+
+    def indicators(self, kind: str = None):
+        """Lazily yield (source, kind, value) for active records, without decoding them."""
+        if kind is None:
+            return self.conn.execute("SELECT source, kind, value FROM feed_records WHERE active = 1")
+        return self.conn.execute("SELECT source, kind, value FROM feed_records WHERE kind = ? AND active = 1",
+                                 (kind,))
+
+    def stamp(self) -> tuple:
+        """Changes whenever the active record set may have: (count, newest last_seen)."""
+        return self.conn.execute("SELECT COUNT(*), MAX(last_seen) FROM feed_records WHERE active = 1").fetchone()
+
+    def by_indicator(self, kind: str, value: str) -> list:
+        rows = self.conn.execute(
+            "SELECT source, record FROM feed_records WHERE kind = ? AND value = ? AND active = 1", (kind, value)
+        )
+        return [(source, decode(record)) for source, record in rows]
+
+    def count(self, source: str = None) -> int:
+        if source is None:
+            return self.conn.execute("SELECT COUNT(*) FROM feed_records WHERE active = 1").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM feed_records WHERE source = ? AND active = 1",
+                                 (source,)).fetchone()[0]
+
+
+class FeedSync:
+    """Fetches every source concurrently and merges what changed into a FeedStore."""
+
+    def __init__(self, sources: list = None, store: FeedStore = None, concurrency: int = FEED_CONCURRENCY,
+                 timeout: float = FEED_TIMEOUT, force: bool = False):
+        self.sources = sources if sources is not None else default_sources()
+        self.store = store or FeedStore()
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.force = force
+
+    async def _get(self, session, url, params, headers):
+        """(status, headers, body) for one page, retrying throttled and failed responses."""
+        attempt = 0
+        while True:
+            async with session.get(url, params=params, headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                body = await response.read()
+                status, response_headers = response.status, response.headers
+            if status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                delay = retry_after_seconds(response_headers)
+                if delay is not None and delay > self.timeout:
+                    # e.g. a spent daily quota: try again next cycle rather than sleep for hours
+                    raise RuntimeError(f"HTTP {status} with Retry-After {delay:.0f}s — skipped this cycle")
+                await asyncio.sleep(delay if delay is not None else 2 ** attempt * random.uniform(0.8, 1.2))
+                attempt += 1
+                continue
+            return status, response_headers, body
+
+    async def _sync_source(self, session, source: FeedSource) -> SyncResult:
+        result = SyncResult(source.name)
+        started = time.perf_counter()
+        state = self.store.state(source.name)
+        if not source.enabled():
+            result.status = "skipped"
+            result.error = f"{source.api_key_env} not set"
+            return result
+        if not self.force and source.min_interval and state.synced_at and \
+                time.time() - state.synced_at < source.min_interval:
+            result.status = "skipped"
+            return result
+
+        headers = source.headers()
+        if not self.force:
+            if state.etag:
+                headers["If-None-Match"] = state.etag
+            if state.last_modified:
+                headers["If-Modified-Since"] = state.last_modified
+
+        try:
+            seen_at = time.time()
+            url, params = source.url, source.params(None if self.force else state.cursor)
+            known, seen_keys, cursor = None, set(), state.cursor
+            etag = last_modified = None
+            status = None
+            while url and result.pages < MAX_PAGES:
+                status, response_headers, body = await self._get(session, url, params, headers)
+                if status == 304:
+                    result.status = "not-modified"
+                    break
+                if status != 200:
+                    raise RuntimeError(f"HTTP {status}: {body[:200].decode(errors='replace')}")
+                if result.pages == 0:
+                    etag, last_modified = response_headers.get("ETag"), response_headers.get("Last-Modified")
+                    headers.pop("If-None-Match", None)
+                    headers.pop("If-Modified-Since", None)
+                payload = decode(body)
+                result.pages += 1
+                result.bytes += len(body)
+                previous, cursor = cursor, source.cursor_of(payload, cursor)
+                if source.snapshot and not self.force and previous and cursor == previous:
+                    result.status = "unchanged"
+                    break
+                if known is None:
+                    known = self.store.known(source.name)
+                items = list(source.items(payload))
+                result.fetched += len(items)
+                seen_keys.update(item[0] for item in items)
+                new, changed = self.store.merge(source.name, items, known, seen_at)
+                result.new += new
+                result.changed += changed
+                url, params = source.next_page(payload), None
+
+            if result.status == "pending" and not result.fetched:
+                result.status = "unchanged"
+            if result.status == "pending":
+                result.status = "updated"
+                if source.snapshot:
+                    result.retired = self.store.retire(source.name, seen_keys, known)
+            if result.status in ("updated", "unchanged"):
+                state = FeedState(etag, last_modified, cursor, seen_at, status)
+            else:
+                state.synced_at, state.status = seen_at, status
+            self.store.save_state(source.name, state)
+        except Exception as e:
+            result.status = "error"
+            result.error = str(e) or type(e).__name__
+            print(f"[!] {source.name} fetch error: {result.error}")
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    async def sync_async(self) -> list:
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return list(await asyncio.gather(*(self._sync_source(session, s) for s in self.sources)))
+
+    def sync(self) -> list:
+        return asyncio.run(self.sync_async())
@@ -0,0 +1,187 @@
+"""
+Digital Sentinel - Finding Model
+================================
+The one record type findings travel in from scanning to export.
+
+  • Finding — a __slots__ class (no per-instance dict) with a fixed field order
+  • Compact codec: a finding is stored as a positional JSON array rather than
+    a keyed object, encoded with orjson when installed (see core.record_stream)
+  • Finding.from_dict() normalises the loosely shaped issue dicts other tools
+    produce (signature / vuln_type / type, url / target / endpoint, ...)
+  • Finding.from_report_line() / as_report_line() convert to and from the
+    legacy "[HIGH] ..." scan_report.txt lines
+
+New fields are only ever appended to FIELDS, so older rows still decode.
+"""
+
+import re
+import hashlib
+from urllib.parse import urlparse, parse_qsl
+
+from core.record_stream import RecordWriter, iter_records, encode, decode
+
+SEVERITIES = ("critical", "high", "medium", "low", "info")
+SEVERITY_RANK = {name: rank for rank, name in enumerate(reversed(SEVERITIES))}
+
+FIELDS = ("id", "url", "host", "severity", "signature", "parameter", "description", "status",
+          "validated", "validated_timestamp", "error", "found_at", "extra")
+DEFAULTS = (None, "", "", "info", "", "", "", "open", None, None, None, None, None)
+
+# Alternative keys other modules and reports use for the same field
+ALIASES = {
+    "signature": ("signature", "vuln_type", "type", "vulnerability_type", "vrt_category"),
+    "url": ("url", "target", "endpoint"),
+    "severity": ("severity", "risk"),
+    "description": ("description", "details", "summary"),
+}
+
+NO_ISSUES = "No issues found"   # description of a scanner's per-URL "clean" placeholder
+REPORT_LINE = re.compile(r"^\[(\w+)\]\s*(.*)$")
+SIGNATURE_WORDS = (("sqli", "sqli"), ("sql injection", "sqli"), ("xss", "xss"), ("csrf", "csrf"),
+                   ("ssrf", "ssrf"), ("lfi", "lfi"), ("rce", "rce"), ("open redirect", "redirect"))
+
+
+def url_path(url: str) -> str:
+    """The path of `url` ("/" when empty) — string slicing, as urlparse is the bulk of fingerprinting."""
+    rest = url.split("#", 1)[0].split("?", 1)[0]
+    scheme = rest.find("://")
+    if scheme >= 0:
+        slash = rest.find("/", scheme + 3)
+        rest = rest[slash:] if slash >= 0 else ""
+    return rest or "/"
+
+
+def normalize_severity(value) -> str:
+    value = str(value or "info").strip().lower()
+    return value if value in SEVERITY_RANK else "info"
+
+
+class Finding:
+    __slots__ = FIELDS
+
+    def __init__(self, url: str = "", severity: str = "info", signature: str = "", description: str = "",
+                 parameter: str = "", host: str = "", status: str = "open", validated: bool = None,
+                 validated_timestamp: str = None, error: str = None, found_at: float = None, id: int = None,
+                 extra: dict = None):
+        self.id = id
+        self.url = url
+        if not host or not parameter:
+            parts = urlparse(url)
+            host = host or parts.netloc
+            parameter = parameter or next((k for k, _ in parse_qsl(parts.query)), "")
+        self.host = host
+        self.severity = normalize_severity(severity)
+        self.signature = signature.lower()
+        self.parameter = parameter
+        self.description = description
+        self.status = status
+        self.validated = validated
+        self.validated_timestamp = validated_timestamp
+        self.error = error
+        self.found_at = found_at
+        self.extra = extra
+
+    def __repr__(self) -> str:
+        return f"Finding({self.severity}, {self.signature or '-'}, {self.url})"
+
+    @property
+    def rank(self) -> int:
+        """Higher is more severe."""
+        return SEVERITY_RANK[self.severity]
+
+    def fingerprint(self) -> str:
+        """Stable identity across cycles: host + path + parameter + signature."""
+        key = f"{self.host.lower()}|{url_path(self.url)}|{self.parameter}|{self.signature}"
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    @property
+    def clean(self) -> bool:
+        """A scanner's "No issues found" placeholder rather than an issue."""
+        return self.severity == "info" and not self.signature and self.description.startswith(NO_ISSUES)
+
+    def content_hash(self) -> str:
+        """
+        Changes when what was found changes, even though the fingerprint stays
+        the same. The finding's own URL is taken out of the description: like
+        the fingerprint, it must not depend on query values.
+        """
+        path = url_path(self.url)
+        description = self.description.replace(self.url, path) if self.url else self.description
+        key = f"{self.host.lower()}|{path}|{self.parameter}|{self.signature}|{self.severity}|{description}"
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    # ---------- positional rows (the compact codec) ----------
+    def to_row(self) -> list:
+        return [self.id, self.url, self.host, self.severity, self.signature, self.parameter, self.description,
+                self.status, self.validated, self.validated_timestamp, self.error, self.found_at, self.extra]
+
+    @classmethod
+    def from_row(cls, row) -> "Finding":
+        if len(row) != len(FIELDS):
+            row = (list(row) + list(DEFAULTS[len(row):]))[:len(FIELDS)]
+        finding = cls.__new__(cls)
+        (finding.id, finding.url, finding.host, finding.severity, finding.signature, finding.parameter,
+         finding.description, finding.status, finding.validated, finding.validated_timestamp, finding.error,
+         finding.found_at, finding.extra) = row
+        return finding
+
+    def encode(self) -> str:
+        return encode(self.to_row())
+
+    @classmethod
+    def decode(cls, line) -> "Finding":
+        return cls.from_row(decode(line))
+
+    # ---------- dicts ----------
+    def to_dict(self) -> dict:
+        """Keyed form for JSON exports: unset optional fields are left out, unknown keys come back."""
+        data = {field: getattr(self, field) for field in FIELDS[:-1]
+                if getattr(self, field) not in (None, "")}
+        data.update(self.extra or {})
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Finding":
+        values = {}
+        used = set()
+        for field, keys in ALIASES.items():
+            for key in keys:
+                if data.get(key):
+                    values[field] = str(data[key])
+                    used.add(key)
+                    break
+        for field in ("id", "host", "parameter", "status", "validated", "validated_timestamp", "error",
+                      "found_at"):
+            if field in data:
+                values[field] = data[field]
+                used.add(field)
+        extra = {k: v for k, v in data.items() if k not in used and k not in ALIASES and k != "extra"}
+        extra.update(data.get("extra") or {})
+        return cls(extra=extra or None, **values)
+
+    # ---------- legacy scan_report.txt lines ----------
+    def as_report_line(self) -> str:
+        return f"[{self.severity.upper()}] {self.description}"
+
+    @classmethod
+    def from_report_line(cls, line: str, id: int = None) -> "Finding":
+        match = REPORT_LINE.match(line.strip())
+        severity, text = match.groups() if match else ("info", line.strip())
+        url = next((token for token in reversed(text.split()) if token.startswith("http")), "")
+        lowered = text.lower()
+        signature = next((sig for word, sig in SIGNATURE_WORDS if word in lowered), "")
+        return cls(url=url, severity=severity, signature=signature, description=text, id=id)
+
+
+def write_findings(path: str, findings, append: bool = False) -> int:
+    """Stream findings to a .jsonl file as positional rows; returns how many were written."""
+    with RecordWriter(path, append=append, flush_every=1000) as out:
+        for finding in findings:
+            out.write(finding.to_row())
+    return out.count
+
+
+def iter_findings(path: str):
+    """Lazily decode a findings stream written by write_findings()."""
+    for row in iter_records(path):
+        yield Finding.from_row(row) if isinstance(row, list) else Finding.from_dict(row)
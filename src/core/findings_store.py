@@ -0,0 +1,181 @@
+"""
+Digital Sentinel - Findings Store
+=================================
+Persistent, indexed record of every finding across cycles, keyed by its
+stable fingerprint (host + path + parameter + signature, see
+core.findings.Finding.fingerprint).
+
+Each row tracks first-seen / last-seen times, the content hash it was last
+validated at and, per export channel, the content hash it was last exported
+at. Validation and export ask the store for what is pending — new findings
+and findings whose content changed since — instead of reprocessing every
+finding every loop.
+"""
+
+import os
+import time
+import sqlite3
+
+from core.findings import Finding, url_path
+from core.record_stream import encode, decode
+
+STORE_PATH = os.path.join("data", "results", "findings.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS findings (
+    fingerprint    TEXT PRIMARY KEY,
+    host           TEXT NOT NULL,
+    path           TEXT NOT NULL,
+    parameter      TEXT NOT NULL,
+    signature      TEXT NOT NULL,
+    severity       TEXT NOT NULL,
+    content_hash   TEXT NOT NULL,
+    first_seen     REAL NOT NULL,
+    last_seen      REAL NOT NULL,
+    validated      INTEGER,
+    validated_hash TEXT,
+    validated_at   REAL,
+    record         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_findings_severity_last_seen ON findings (severity, last_seen);
+CREATE INDEX IF NOT EXISTS idx_findings_host ON findings (host);
+CREATE INDEX IF NOT EXISTS idx_findings_first_seen ON findings (first_seen);
+CREATE INDEX IF NOT EXISTS idx_findings_last_seen ON findings (last_seen);
+CREATE INDEX IF NOT EXISTS idx_findings_validated ON findings (validated);
+CREATE TABLE IF NOT EXISTS exports (
+    fingerprint  TEXT NOT NULL,
+    channel      TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    exported_at  REAL NOT NULL,
+    PRIMARY KEY (fingerprint, channel)
+);
+"""
+
+class FindingsStore:
+    """SQLite-backed findings index."""
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _findings(self, sql: str, params=()) -> list:
+        return [Finding.from_row(decode(r[0])) for r in self.conn.execute(sql, params)]
+
+    # ---------- writes ----------
+    def upsert(self, findings, seen_at: float = None):
+        """
+        Record this cycle's findings.
+        Returns (new, changed): findings never seen before, and known ones
+        whose content (Finding.content_hash) differs from what was stored.
+        "No issues found" placeholders are not findings and are skipped.
+        """
+        seen_at = seen_at or time.time()
+        latest = {}
+        for finding in findings:
+            if not finding.clean:
+                latest[finding.fingerprint()] = finding
+
+        known = {}
+        keys = list(latest)
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT fingerprint, content_hash FROM findings WHERE fingerprint IN ({','.join('?' * len(chunk))})",
+                chunk)
+            known.update(rows)
+
+        new, changed, rows = [], [], []
+        for fp, finding in latest.items():
+            content = finding.content_hash()
+            if fp not in known:
+                new.append(finding)
+            elif known[fp] != content:
+                changed.append(finding)
+            rows.append((fp, finding.host.lower(), url_path(finding.url), finding.parameter,
+                         finding.signature, finding.severity, content, seen_at, seen_at, encode(finding.to_row())))
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO findings (fingerprint, host, path, parameter, signature, severity, content_hash, "
+                "first_seen, last_seen, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(fingerprint) DO UPDATE SET severity = excluded.severity, "
+                "content_hash = excluded.content_hash, last_seen = excluded.last_seen, record = excluded.record",
+                rows,
+            )
+        return new, changed
+
+    def mark_validated(self, findings, validated_at: float = None):
+        """Remember each finding's verdict and the content it was reached on."""
+        validated_at = validated_at or time.time()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE findings SET validated = ?, validated_hash = ?, validated_at = ? WHERE fingerprint = ?",
+                [(None if f.validated is None else int(f.validated), f.content_hash(), validated_at,
+                  f.fingerprint()) for f in findings],
+            )
+
+    def mark_exported(self, findings, channel: str, exported_at: float = None):
+        exported_at = exported_at or time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO exports (fingerprint, channel, content_hash, exported_at) VALUES (?, ?, ?, ?)",
+                [(f.fingerprint(), channel, f.content_hash(), exported_at) for f in findings],
+            )
+
+    # ---------- what still needs work ----------
+    def pending_validation(self) -> list:
+        """New findings and findings that changed since they were last validated."""
+        findings = self._findings(
+            "SELECT record FROM findings WHERE validated_hash IS NULL OR validated_hash != content_hash "
+            "ORDER BY first_seen")
+        return [f for f in findings if not f.clean]   # placeholders stored by older scans
+
+    def pending_export(self, channel: str, validated_only: bool = False) -> list:
+        """Findings `channel` has not exported yet, or has only exported an older version of."""
+        rows = self.conn.execute(
+            "SELECT f.record, f.validated FROM findings f LEFT JOIN exports e "
+            "ON e.fingerprint = f.fingerprint AND e.channel = ? "
+            f"WHERE (e.content_hash IS NULL OR e.content_hash != f.content_hash)"
+            f"{' AND f.validated = 1' if validated_only else ''} ORDER BY f.first_seen",
+            (channel,))
+        findings = []
+        for record, validated in rows:
+            finding = Finding.from_row(decode(record))
+            if finding.clean:
+                continue
+            finding.validated = None if validated is None else bool(validated)
+            findings.append(finding)
+        return findings
+
+    # ---------- queries ----------
+    def get(self, fingerprint: str):
+        found = self._findings("SELECT record FROM findings WHERE fingerprint = ?", (fingerprint,))
+        return found[0] if found else None
+
+    def by_severity(self, severity: str, since: float = None) -> list:
+        if since is None:
+            return self._findings("SELECT record FROM findings WHERE severity = ? ORDER BY last_seen DESC",
+                                  (severity,))
+        return self._findings("SELECT record FROM findings WHERE severity = ? AND last_seen >= ? "
+                              "ORDER BY last_seen DESC", (severity, since))
+
+    def by_host(self, host: str) -> list:
+        return self._findings("SELECT record FROM findings WHERE host = ? ORDER BY last_seen DESC", (host.lower(),))
+
+    def seen_between(self, start: float, end: float = None) -> list:
+        """Findings first seen in [start, end)."""
+        return self._findings("SELECT record FROM findings WHERE first_seen >= ? AND first_seen < ? "
+                              "ORDER BY first_seen", (start, end or time.time() + 1))
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM findings").fetchone()[0]
+
+    def severity_counts(self) -> dict:
+        return dict(self.conn.execute("SELECT severity, COUNT(*) FROM findings GROUP BY severity"))
@@ -1,8 +1,10 @@
+import sys
 import time
 from datetime import datetime
 
 # === Core Engines ===
-from core.enumeration_engine import run_enumeration
+from core.enumeration_engine import run_enumeration, run_incremental_enumeration, read_targets
+from core.dns_resolver import run_resolution
 from core.probing_engine import run_probing
 from core.crawling_engine import run_crawling
 from core.vulnerability_scanner import run_vulnerability_scan
@@ -11,33 +13,77 @@ from core.validator import validate_targets
 from core.parallel_engine import run_parallel
 from core.ai_intelligence_oracle import analyze_reports
 from core.discord_reporter import send_discord_report
+from core.notifier import shared_notifier
+from core.pipeline import run_recon_pipeline
+from core.response_cache import shared_cache
+from core.rate_limiter import shared_limiter
+from crawler import CrawlConfig
 
 
-def digital_sentinel_controller():
+def digital_sentinel_controller(pipelined: bool = False, incremental: bool = False, use_cache: bool = False,
+                                recrawl: bool = False):
     print("🚀 [Digital Sentinel vInfinity Quantum Controller Initialized]")
     start_time = time.time()
     print(f"🕒 Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 70)
+    crawl_config = CrawlConfig(cache=shared_cache(), recrawl=recrawl, limiter=shared_limiter()) \
+        if use_cache or recrawl else None
 
-    # === Phase 1: Subdomain Enumeration ===
-    print("\n🌐 Phase 1: Enumeration Engine Starting...")
-    run_enumeration()
-    print("✅ Phase 1 Completed.")
+    if incremental and recrawl:
+        # Incremental cycles only crawl hosts that are new, so there is nothing cached to revalidate
+        print("⚠️ --recrawl has no effect with --incremental (only new hosts are crawled).")
 
-    # === Phase 2: HTTP Probing ===
-    print("\n🔍 Phase 2: HTTP Probing Starting...")
-    run_probing()
-    print("✅ Phase 2 Completed.")
+    if incremental:
+        # === Phases 1–4: Only What Changed Since Last Cycle ===
+        print("\n🌐 Phase 1: Incremental Enumeration Starting...")
+        delta = run_incremental_enumeration()
+        print("✅ Phase 1 Completed.")
 
-    # === Phase 3: Crawling Engine ===
-    print("\n🕷️ Phase 3: Crawling Engine Starting...")
-    run_crawling()
-    print("✅ Phase 3 Completed.")
+        if not delta.new:
+            print("\n💤 No new subdomains this cycle — skipping Phases 2–4.")
+        else:
+            print(f"\n🔍 Phases 2–4: Processing {len(delta.new)} new subdomains...")
+            alive = run_probing(targets=run_resolution(delta.new, roots=read_targets()), use_cache=use_cache)
+            if not alive:
+                print("💤 No new subdomain resolved and answered — skipping Phases 3–4.")
+            else:
+                run_crawling(targets=alive, config=crawl_config)
+                run_vulnerability_scan()
+                print("✅ Phases 2–4 Completed.")
+    elif pipelined:
+        # === Phases 1–4: Streaming Pipeline ===
+        print("\n🌊 Phases 1–4: Streaming Recon Pipeline Starting...")
+        run_recon_pipeline()
+        print("✅ Phases 1–4 Completed.")
+    else:
+        # === Phase 1: Subdomain Enumeration ===
+        print("\n🌐 Phase 1: Enumeration Engine Starting...")
+        subdomains = run_enumeration()
+        print("✅ Phase 1 Completed.")
 
-    # === Phase 4: Vulnerability Scanning ===
-    print("\n🧪 Phase 4: Vulnerability Scanning Starting...")
-    run_vulnerability_scan()
-    print("✅ Phase 4 Completed.")
+        # === Phase 1.5: DNS Resolution ===
+        print("\n🧭 Phase 1.5: DNS Resolution Starting...")
+        targets = read_targets()
+        resolved = run_resolution(targets + subdomains, roots=targets)
+        print("✅ Phase 1.5 Completed.")
+
+        # === Phase 2: HTTP Probing ===
+        print("\n🔍 Phase 2: HTTP Probing Starting...")
+        alive = run_probing(targets=resolved, use_cache=use_cache)
+        print("✅ Phase 2 Completed.")
+
+        if not alive:
+            print("\n💤 No alive hosts this cycle — skipping Phases 3–4.")
+        else:
+            # === Phase 3: Crawling Engine ===
+            print("\n🕷️ Phase 3: Crawling Engine Starting...")
+            run_crawling(targets=alive, config=crawl_config)
+            print("✅ Phase 3 Completed.")
+
+            # === Phase 4: Vulnerability Scanning ===
+            print("\n🧪 Phase 4: Vulnerability Scanning Starting...")
+            run_vulnerability_scan()
+            print("✅ Phase 4 Completed.")
 
     # === Phase 5: Export Bugcrowd Format ===
     print("\n📦 Phase 5: Exporting Results to Bugcrowd Format...")
@@ -67,6 +113,10 @@ def digital_sentinel_controller():
     print("🛰️ Digital Sentinel Quantum Infinity Full Cycle Completed Successfully.")
 
     # === Wrap-up ===
+    shared_limiter().report("cycle")
+    shared_notifier().report("cycle")
+    if use_cache or recrawl:
+        shared_cache().report("cycle")
     end_time = time.time()
     duration = (end_time - start_time) / 60
     print("=" * 70)
@@ -75,4 +125,5 @@ def digital_sentinel_controller():
 
 
 if __name__ == "__main__":
-    digital_sentinel_controller()
+    digital_sentinel_controller(pipelined="--pipelined" in sys.argv, incremental="--incremental" in sys.argv,
+                                use_cache="--cache" in sys.argv, recrawl="--recrawl" in sys.argv)
@@ -1,8 +1,9 @@
 import os
 import json
-import requests
 from datetime import datetime
 
+from core.notifier import shared_notifier
+
 def run_discord_reporter():
     """
     Sends a final AI summary report to Discord via webhook.
@@ -39,13 +40,7 @@ def run_discord_reporter():
         }]
     }
 
-    try:
-        response = requests.post(webhook_url, json=content)
-        if response.status_code == 204:
-            print("✅ Discord notification sent successfully.")
-        else:
-            print(f"⚠️ Discord webhook response: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Failed to send Discord report: {e}")
+    if shared_notifier().notify(embeds=content["embeds"], username=content["username"], webhook_url=webhook_url):
+        print("📨 Discord notification queued for delivery.")
 
     print("✅ [Phase 9: Discord Reporter Completed]")
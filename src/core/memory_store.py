@@ -0,0 +1,245 @@
+"""
+Digital Sentinel - Memory Store
+===============================
+Shared persistence for the learning / intel memories that used to rewrite a
+whole JSON file on every update.
+
+  • In-memory dict index; reads never touch disk
+  • Every update is one line appended to the current log generation
+    (<store>/<generation>.log), so a write costs the same at 10 entries or
+    10 million
+  • Operations: set, delete, incr, append (to a list value)
+  • Compaction: once the logs hold more operations than COMPACT_RATIO × the
+    live entries, writes roll over to a new log generation and a background
+    thread writes snapshot.json (covering every older generation) to a temp
+    file and swaps it in with os.replace before deleting the old logs
+  • Recovery: snapshot + replay of newer logs; a torn last line (the process
+    died mid-write) is skipped, and a half-written snapshot is never seen
+
+Values must be JSON-serialisable and keys strings. Values handed out by
+get() are the live ones — don't mutate them, write through the store.
+"""
+
+import os
+import re
+import json
+import threading
+from itertools import islice
+
+from core.record_stream import encode, decode
+
+SNAPSHOT_FILE = "snapshot.json"
+LOG_NAME = re.compile(r"^(\d+)\.log$")
+
+COMPACT_RATIO = 1.0    # compact once logged operations exceed this many × live entries
+COMPACT_MIN = 10_000   # ... and never for fewer logged operations than this
+SNAPSHOT_CHUNK = 5_000  # entries encoded per step while writing a snapshot
+
+
+def _apply(data: dict, op: str, key: str, value):
+    if op == "set":
+        data[key] = value
+    elif op == "delete":
+        data.pop(key, None)
+    elif op == "incr":
+        data[key] = data.get(key, 0) + value
+    elif op == "append":
+        data.setdefault(key, []).append(value)
+    else:
+        raise ValueError(f"unknown memory operation {op!r}")
+
+
+class MemoryStore:
+    """Append-only, self-compacting key/value memory backed by a directory."""
+
+    def __init__(self, path: str, compact_ratio: float = COMPACT_RATIO, compact_min: int = COMPACT_MIN,
+                 background: bool = True, sync: bool = False):
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.compact_min = compact_min
+        self.background = background
+        self.sync = sync  # fsync every write (survives power loss, not just a crash)
+        os.makedirs(path, exist_ok=True)
+
+        self.data = {}
+        self.lock = threading.RLock()
+        self.compactor = None
+        self.copied = None  # during compaction: list keys already copied away from the snapshot
+        self.generation, self.log_ops = self._recover()
+        self.log = open(self._log_path(self.generation), "a", encoding="utf-8")
+        with self.lock:
+            self._maybe_compact()
+
+    # ---------- files ----------
+    def _log_path(self, generation: int) -> str:
+        return os.path.join(self.path, f"{generation:08d}.log")
+
+    def _log_generations(self) -> list:
+        return sorted(int(m.group(1)) for m in map(LOG_NAME.match, os.listdir(self.path)) if m)
+
+    def _recover(self):
+        """Load the snapshot and replay newer logs; returns (next generation, operations replayed)."""
+        covered = -1
+        snapshot = os.path.join(self.path, SNAPSHOT_FILE)
+        if os.path.exists(snapshot):
+            with open(snapshot, "r", encoding="utf-8") as f:
+                state = decode(f.read())
+            covered, self.data = state["generation"], state["data"]
+
+        generations = self._log_generations()
+        replayed = 0
+        for generation in generations:
+            path = self._log_path(generation)
+            if generation <= covered:
+                os.remove(path)  # already in the snapshot; left behind by an interrupted compaction
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        op, key, value = decode(line)
+                    except ValueError:
+                        print(f"⚠️ Skipping torn memory record in {path}")
+                        continue
+                    _apply(self.data, op, key, value)
+                    replayed += 1
+        return max(generations + [covered]) + 1, replayed
+
+    # ---------- reads ----------
+    def get(self, key: str, default=None):
+        return self.data.get(key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def keys(self):
+        return self.data.keys()
+
+    def items(self):
+        return self.data.items()
+
+    # ---------- writes ----------
+    def _write(self, op: str, key: str, value=None):
+        with self.lock:
+            if op == "append" and self.copied is not None and key not in self.copied:
+                # The snapshot being written still holds this list — append to a copy
+                self.copied.add(key)
+                if key in self.data:
+                    self.data[key] = list(self.data[key])
+            _apply(self.data, op, key, value)
+            self.log.write(encode([op, key, value]) + "\n")
+            self.log.flush()
+            if self.sync:
+                os.fsync(self.log.fileno())
+            self.log_ops += 1
+            self._maybe_compact()
+
+    def set(self, key: str, value):
+        self._write("set", key, value)
+
+    def delete(self, key: str):
+        self._write("delete", key)
+
+    def incr(self, key: str, amount=1):
+        self._write("incr", key, amount)
+        return self.data[key]
+
+    def append(self, key: str, value):
+        self._write("append", key, value)
+
+    # ---------- compaction ----------
+    def _maybe_compact(self):
+        if self.compactor is None and self.log_ops >= max(self.compact_min, self.compact_ratio * len(self.data)):
+            self._start_compaction()
+
+    def _start_compaction(self):
+        """Roll the log over and snapshot everything before it. Caller holds the lock."""
+        covered = self.generation
+        self.log.close()
+        self.generation += 1
+        self.log = open(self._log_path(self.generation), "a", encoding="utf-8")
+        self.log_ops = 0
+        frozen = self.data.copy()  # shallow: appends copy their list first while this is alive
+        self.copied = set()
+        if self.background:
+            self.compactor = threading.Thread(target=self._write_snapshot, args=(frozen, covered), daemon=True)
+            self.compactor.start()
+        else:
+            self.compactor = threading.current_thread()
+            self._write_snapshot(frozen, covered)
+
+    def _write_snapshot(self, frozen: dict, covered: int):
+        try:
+            snapshot = os.path.join(self.path, SNAPSHOT_FILE)
+            tmp = f"{snapshot}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                # Encoded in chunks so writers on other threads get the GIL back in between
+                f.write(f'{{"generation":{covered},"data":{{')
+                items = iter(frozen.items())
+                separator = ""
+                while True:
+                    chunk = dict(islice(items, SNAPSHOT_CHUNK))
+                    if not chunk:
+                        break
+                    f.write(separator + encode(chunk)[1:-1])
+                    separator = ","
+                f.write("}}")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, snapshot)
+            for generation in self._log_generations():
+                if generation <= covered:
+                    os.remove(self._log_path(generation))
+        except OSError as e:
+            print(f"⚠️ Memory compaction failed for {self.path}: {e}")
+        finally:
+            with self.lock:
+                self.copied = None
+                self.compactor = None
+
+    def compact(self):
+        """Snapshot now and wait for it (e.g. before shipping the directory elsewhere)."""
+        while True:
+            self.wait()
+            with self.lock:
+                if self.compactor is None:
+                    self._start_compaction()
+                    break
+        self.wait()
+
+    def wait(self):
+        compactor = self.compactor
+        if compactor is not None and compactor is not threading.current_thread():
+            compactor.join()
+
+    # ---------- lifecycle ----------
+    def import_json(self, legacy_path: str, convert=None) -> int:
+        """
+        One-off migration from a pre-store JSON memory file: only into an
+        empty store, via `convert(data) -> iterable of (key, value)` (default:
+        the top-level object's items). Returns the number of entries imported.
+        """
+        if len(self.data) or not os.path.exists(legacy_path):
+            return 0
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        count = 0
+        for key, value in (convert(data) if convert else data.items()):
+            self.set(key, value)
+            count += 1
+        self.compact()
+        print(f"🧬 Migrated {count} entries from {legacy_path} → {self.path}")
+        return count
+
+    def close(self):
+        self.wait()
+        with self.lock:
+            self.log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,331 @@
+"""
+Digital Sentinel - Notifier
+===========================
+The one way anything reaches Discord.
+
+  • notify() only writes to a durable SQLite outbox and returns — reporting
+    never blocks a scan, and whatever wasn't delivered when the process
+    exits goes out on the next run
+  • A background thread drains the outbox over one persistent
+    requests.Session, merging queued embeds for the same webhook into
+    messages of up to MAX_EMBEDS embeds (and MAX_MESSAGE_CHARS characters)
+  • Pacing: a token bucket per webhook (core.rate_limiter.TokenBucket),
+    tightened by Discord's X-RateLimit-Remaining / X-RateLimit-Reset-After
+    headers; a 429 pauses the webhook for its retry_after without using up
+    an attempt
+  • Network errors and 5xx are retried with exponential backoff; a payload
+    Discord rejects outright (4xx) is retried alone, then dead-lettered
+
+Senders build their usual webhook payload and call
+shared_notifier().notify(embeds=..., content=..., username=...).
+"""
+
+import os
+import time
+import json
+import atexit
+import random
+import sqlite3
+import threading
+
+import requests
+
+from core.rate_limiter import TokenBucket, retry_after_seconds
+
+OUTBOX_PATH = os.path.join("data", "cache", "notifications", "outbox.db")
+
+MAX_EMBEDS = 10             # embeds Discord accepts per message
+MAX_MESSAGE_CHARS = 6000    # characters across all embeds of one message
+WEBHOOK_RATE = 2.5          # messages/s per webhook (Discord allows ~5 per 2s)
+WEBHOOK_BURST = 5
+MAX_ATTEMPTS = 6            # failed deliveries before a payload is dead-lettered
+RETRY_BASE = 2.0            # seconds; doubles per failed attempt
+SEND_TIMEOUT = 15           # seconds per webhook request
+EXIT_FLUSH_TIMEOUT = 20     # seconds spent delivering the outbox when the process exits
+
+# Discord's per-field limits
+EMBED_LIMITS = {"title": 256, "description": 4096}
+FIELD_LIMITS = {"name": 256, "value": 1024}
+FOOTER_LIMIT = 2048
+MAX_FIELDS = 25
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    webhook      TEXT NOT NULL,
+    payload      TEXT NOT NULL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    solo         INTEGER NOT NULL DEFAULT 0,
+    dead         INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    created_at   REAL NOT NULL,
+    last_error   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (dead, next_attempt);
+"""
+
+
+def _clip(text, limit: int) -> str:
+    text = str(text)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def clamp_embed(embed: dict) -> dict:
+    """`embed` trimmed to Discord's field limits, so one long summary can't get a whole batch rejected."""
+    embed = dict(embed)
+    for key, limit in EMBED_LIMITS.items():
+        if key in embed:
+            embed[key] = _clip(embed[key], limit)
+    if "fields" in embed:
+        embed["fields"] = [dict(field, **{k: _clip(field[k] or "-", limit)
+                                          for k, limit in FIELD_LIMITS.items() if k in field})
+                           for field in embed["fields"][:MAX_FIELDS]]
+    if isinstance(embed.get("footer"), dict) and "text" in embed["footer"]:
+        embed["footer"] = dict(embed["footer"], text=_clip(embed["footer"]["text"], FOOTER_LIMIT))
+    return embed
+
+
+def embed_chars(embed: dict) -> int:
+    """Characters Discord counts against MAX_MESSAGE_CHARS."""
+    total = len(embed.get("title", "")) + len(embed.get("description", ""))
+    total += sum(len(f.get("name", "")) + len(f.get("value", "")) for f in embed.get("fields", []))
+    total += len((embed.get("footer") or {}).get("text", "")) + len((embed.get("author") or {}).get("name", ""))
+    return total
+
+
+class WebhookState:
+    __slots__ = ("bucket", "paused_until")
+
+    def __init__(self, rate: float, burst: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.paused_until = 0.0
+
+
+class DiscordNotifier:
+    def __init__(self, webhook_url=None, path=OUTBOX_PATH, rate=WEBHOOK_RATE, burst=WEBHOOK_BURST,
+                 session=None, background=True):
+        self.webhook_url = (webhook_url or os.getenv("DISCORD_WEBHOOK_URL", "")).strip()
+        self.rate = rate
+        self.burst = burst
+        self.session = session or requests.Session()
+        self.background = background
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopping = False
+        self.worker = None
+        self.webhooks = {}
+        self.stats = {"queued": 0, "messages": 0, "embeds": 0, "throttled": 0, "retries": 0, "dead": 0}
+
+    # ---------- enqueue ----------
+    def notify(self, embeds=None, content=None, username=None, avatar_url=None, webhook_url=None) -> bool:
+        """Queue one webhook payload; returns at once. False when no webhook is configured."""
+        webhook = webhook_url or self.webhook_url
+        if not webhook:
+            print("⚠️ Discord webhook not configured (missing DISCORD_WEBHOOK_URL). Skipping send.")
+            return False
+        payload = {"embeds": [clamp_embed(e) for e in embeds or []]}
+        if content:
+            payload["content"] = _clip(content, 2000)
+        if username:
+            payload["username"] = username
+        if avatar_url:
+            payload["avatar_url"] = avatar_url
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute("INSERT INTO outbox (webhook, payload, next_attempt, created_at) VALUES (?, ?, ?, ?)",
+                              (webhook, json.dumps(payload), now, now))
+        self.stats["queued"] += 1
+        if self.background:
+            self.start()
+            self.wakeup.set()
+        return True
+
+    def pending(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM outbox WHERE dead = 0").fetchone()[0]
+
+    # ---------- batching ----------
+    def _due(self, now: float) -> list:
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, webhook, payload, attempts, solo FROM outbox WHERE dead = 0 AND next_attempt <= ? "
+                "ORDER BY id LIMIT 500", (now,)).fetchall()
+
+    @staticmethod
+    def _batches(rows) -> list:
+        """
+        Group due rows into messages: embed-only payloads for the same webhook
+        and sender identity are merged up to MAX_EMBEDS / MAX_MESSAGE_CHARS;
+        payloads with text content (or marked solo) go out as they are.
+        """
+        batches, open_batches = [], {}
+        for row_id, webhook, payload, attempts, solo in rows:
+            payload = json.loads(payload)
+            embeds = payload.get("embeds", [])
+            if solo or payload.get("content") or not embeds:
+                batches.append((webhook, payload, [(row_id, attempts)]))
+                continue
+            key = (webhook, payload.get("username"), payload.get("avatar_url"))
+            chars = sum(embed_chars(e) for e in embeds)
+            current = open_batches.get(key)
+            if current is None or len(current[1]["embeds"]) + len(embeds) > MAX_EMBEDS \
+                    or current[3] + chars > MAX_MESSAGE_CHARS:
+                current = [webhook, dict(payload, embeds=[]), [], 0]
+                open_batches[key] = current
+                batches.append(current)
+            current[1]["embeds"].extend(embeds)
+            current[2].append((row_id, attempts))
+            current[3] += chars
+        return [(b[0], b[1], b[2]) for b in batches]
+
+    # ---------- delivery ----------
+    def _state(self, webhook: str) -> WebhookState:
+        state = self.webhooks.get(webhook)
+        if state is None:
+            state = self.webhooks[webhook] = WebhookState(self.rate, self.burst)
+        return state
+
+    def _wait_turn(self, state: WebhookState):
+        while True:
+            now = time.monotonic()
+            if state.paused_until > now:
+                time.sleep(state.paused_until - now)
+                continue
+            wait = state.bucket.reserve(now)
+            if wait > 0:
+                time.sleep(wait)
+            return
+
+    def _post(self, webhook: str, payload: dict):
+        """(status, seconds to pause the webhook for or None, error text)."""
+        state = self._state(webhook)
+        self._wait_turn(state)
+        try:
+            response = self.session.post(webhook, json=payload, timeout=SEND_TIMEOUT)
+        except requests.RequestException as e:
+            return None, None, str(e)
+
+        headers = response.headers
+        pause = None
+        if headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                pause = float(headers.get("X-RateLimit-Reset-After", 0))
+            except ValueError:
+                pause = None
+        if response.status_code == 429:
+            self.stats["throttled"] += 1
+            try:
+                pause = float(response.json().get("retry_after"))
+            except (ValueError, TypeError, AttributeError):
+                pause = retry_after_seconds(headers) or RETRY_BASE
+        if pause:
+            state.paused_until = max(state.paused_until, time.monotonic() + pause)
+        return response.status_code, pause, response.text[:200] if response.status_code >= 400 else None
+
+    def _settle(self, rows, status, error):
+        """Remove delivered rows; reschedule or dead-letter the rest."""
+        now = time.time()
+        with self.lock, self.conn:
+            if status is not None and 200 <= status < 300:
+                self.conn.executemany("DELETE FROM outbox WHERE id = ?", [(row_id,) for row_id, _ in rows])
+                return
+            if status == 429:
+                # Not the payload's fault: try again as soon as the webhook's pause is over
+                return
+            for row_id, attempts in rows:
+                attempts += 1
+                rejected = status is not None and 400 <= status < 500
+                if attempts >= MAX_ATTEMPTS or (rejected and len(rows) == 1):
+                    self.conn.execute("UPDATE outbox SET dead = 1, attempts = ?, last_error = ? WHERE id = ?",
+                                      (attempts, error, row_id))
+                    self.stats["dead"] += 1
+                    print(f"💀 Discord notification {row_id} dead-lettered: {error}")
+                else:
+                    self.stats["retries"] += 1
+                    delay = 0 if rejected else RETRY_BASE * 2 ** (attempts - 1) * random.uniform(0.8, 1.2)
+                    self.conn.execute(
+                        "UPDATE outbox SET attempts = ?, solo = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                        (attempts, int(rejected), now + delay, error, row_id))
+
+    def send_pending(self) -> int:
+        """One pass over the due outbox; returns the number of payloads delivered."""
+        delivered = 0
+        for webhook, payload, rows in self._batches(self._due(time.time())):
+            status, _, error = self._post(webhook, payload)
+            self._settle(rows, status, error)
+            if status is not None and 200 <= status < 300:
+                delivered += len(rows)
+                self.stats["messages"] += 1
+                self.stats["embeds"] += len(payload.get("embeds", []))
+        return delivered
+
+    # ---------- background worker ----------
+    def _next_due_in(self) -> float:
+        with self.lock:
+            row = self.conn.execute("SELECT MIN(next_attempt) FROM outbox WHERE dead = 0").fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def _run(self):
+        while not self.stopping:
+            try:
+                self.send_pending()
+            except Exception as e:  # the worker must outlive any single bad pass
+                print(f"❌ Discord notifier pass failed: {e}")
+                time.sleep(RETRY_BASE)
+            wait = self._next_due_in()
+            self.wakeup.wait(timeout=wait if wait is not None else 60)
+            self.wakeup.clear()
+
+    def start(self):
+        if self.worker is None or not self.worker.is_alive():
+            self.stopping = False
+            self.worker = threading.Thread(target=self._run, name="discord-notifier", daemon=True)
+            self.worker.start()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Deliver everything queued (waiting out pauses/backoff); True when the outbox emptied in time."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if self.worker is None or not self.worker.is_alive():
+            self.start()
+        while self.pending():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self.wakeup.set()
+            time.sleep(0.05)
+        return True
+
+    def stop(self):
+        self.stopping = True
+        self.wakeup.set()
+        if self.worker is not None:
+            self.worker.join()
+
+    def report(self, label: str = "cycle") -> dict:
+        stats = dict(self.stats, pending=self.pending())
+        print(f"📨 Discord [{label}] {stats['embeds']} embeds in {stats['messages']} messages, "
+              f"{stats['throttled']} throttled, {stats['retries']} retried, {stats['dead']} dead-lettered, "
+              f"{stats['pending']} still queued")
+        return stats
+
+
+_shared = None
+
+
+def shared_notifier() -> DiscordNotifier:
+    """Process-wide notifier; the outbox gets a last chance to drain at exit."""
+    global _shared
+    if _shared is None:
+        _shared = DiscordNotifier()
+        atexit.register(_flush_at_exit)
+    return _shared
+
+
+def _flush_at_exit():
+    # Every outbox row carries its own webhook: per-call webhook_url= sends drain even without the env var
+    if _shared is not None and _shared.pending():
+        if not _shared.flush(timeout=EXIT_FLUSH_TIMEOUT):
+            print(f"📨 {_shared.pending()} Discord notifications left in the outbox for the next run")
@@ -0,0 +1,264 @@
+"""
+Digital Sentinel - Pipeline Orchestrator
+========================================
+Runs phases as concurrent stages connected by bounded queues instead of
+strict phase barriers. Subdomains flow into DNS resolution as they are
+found, resolving names flow into probing, alive hosts flow into crawling
+and crawled URLs flow into scanning.
+
+A full queue blocks the stage feeding it, so a fast producer can never run
+further ahead of a slow consumer than `queue_size` items. Each stage writes
+its outputs to a sink (the classic per-phase file) as they are emitted, so
+nothing accumulates in memory however large the run.
+"""
+
+import os
+import time
+import inspect
+import asyncio
+
+import aiohttp
+
+from crawler import CrawlConfig, CrawlEngine, PageResult
+from core.enumeration_engine import RESULTS_DIR, build_sources, read_targets
+from core.enumeration_sources import enumerate_domains
+from core.dns_resolver import RESOLVED_FILE, AsyncResolver
+from core.probing_engine import (OUTPUT_FILE as ALIVE_FILE, load_known_schemes, make_connector,
+                                 probe_host_race, save_probe_results)
+from core.crawling_engine import OUTPUT_FILE as CRAWL_FILE, RESPONSES_FILE
+from core.record_stream import RecordWriter
+from core.rate_limiter import shared_limiter
+from core.vulnerability_scanner import FindingSink, scan_url
+from core.signature_engine import shared_engine
+from core.findings_store import FindingsStore
+
+QUEUE_SIZE = 100  # default bound between two stages
+
+
+class Stage:
+    """
+    One pipeline phase.
+    `handler(item)` may be an async generator, or a coroutine returning a
+    single output, an iterable of outputs, or None.
+    `sink` (anything with write(output) and close()) receives each output as
+    it is emitted, and is closed once the stage has drained.
+    """
+
+    def __init__(self, name: str, handler, workers: int = 1, queue_size: int = QUEUE_SIZE, sink=None):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue_size = queue_size
+        self.sink = sink
+        self.queue = None
+        self.emitted = 0
+        self.processed = 0
+        self.errors = 0
+        self.first_output_at = None
+        self.max_queued = 0
+
+    async def _emit(self, output, downstream, started: float):
+        if self.first_output_at is None:
+            self.first_output_at = time.perf_counter() - started
+        self.emitted += 1
+        if self.sink is not None:
+            self.sink.write(output)
+        if downstream is not None:
+            await downstream.put(output)
+
+    async def _handle(self, item, downstream, started: float):
+        if inspect.isasyncgenfunction(self.handler):
+            async for output in self.handler(item):
+                await self._emit(output, downstream, started)
+            return
+        result = await self.handler(item)
+        if result is None:
+            return
+        if isinstance(result, (list, tuple, set)):
+            for output in result:
+                await self._emit(output, downstream, started)
+        else:
+            await self._emit(result, downstream, started)
+
+    async def worker(self, downstream, started: float):
+        while True:
+            item = await self.queue.get()
+            try:
+                await self._handle(item, downstream, started)
+                self.processed += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ [Pipeline:{self.name}] {item}: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def put(self, item):
+        await self.queue.put(item)
+        self.max_queued = max(self.max_queued, self.queue.qsize())
+
+
+class Pipeline:
+    """Chain of stages; the source feeds the first one."""
+
+    def __init__(self, stages: list):
+        self.stages = stages
+        self.elapsed = 0.0
+
+    async def run(self, source):
+        started = time.perf_counter()
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+
+        tasks, closed = [], []
+        for idx, stage in enumerate(self.stages):
+            downstream = self.stages[idx + 1] if idx + 1 < len(self.stages) else None
+            tasks.append([asyncio.create_task(stage.worker(downstream, started)) for _ in range(stage.workers)])
+
+        try:
+            if hasattr(source, "__aiter__"):
+                async for item in source:
+                    await self.stages[0].put(item)
+            else:
+                for item in source:
+                    await self.stages[0].put(item)
+
+            # Stage N is drained only after everything upstream has been handed over
+            for stage, workers in zip(self.stages, tasks):
+                await stage.queue.join()
+                for w in workers:
+                    w.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                if stage.sink is not None:
+                    stage.sink.close()
+                closed.append(stage)
+        finally:
+            for workers in tasks:
+                for w in workers:
+                    w.cancel()
+            # On error or cancellation the sinks still need closing: a gzip stream gets its trailer,
+            # the findings store its last upsert. Workers are stopped first so nothing writes after.
+            await asyncio.gather(*(w for workers in tasks for w in workers), return_exceptions=True)
+            for stage in self.stages:
+                if stage.sink is not None and stage not in closed:
+                    stage.sink.close()
+
+        self.elapsed = time.perf_counter() - started
+        return {stage.name: stage.emitted for stage in self.stages}
+
+    def report(self):
+        print(f"⏱ Pipeline finished in {self.elapsed:.2f}s")
+        for stage in self.stages:
+            first = f"{stage.first_output_at:.2f}s" if stage.first_output_at is not None else "—"
+            print(f"   • {stage.name:<12} in={stage.processed:<6} out={stage.emitted:<7} "
+                  f"errors={stage.errors:<4} first-out={first:<8} peak-queue={stage.max_queued}/{stage.queue_size}")
+
+
+class LineSink:
+    """One line per output, written (and flushed) as it arrives."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8")
+        self.count = 0
+
+    def write(self, line: str):
+        self.file.write(line + "\n")
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+        print(f"💾 {self.count} lines → {self.path}")
+
+
+class CrawlSink:
+    """Crawled pages: successful URLs to crawl_results.txt, every response to crawl_responses.jsonl.gz."""
+
+    def __init__(self, urls_file: str = CRAWL_FILE, responses_file: str = RESPONSES_FILE):
+        self.urls = LineSink(urls_file)
+        self.responses = RecordWriter(responses_file, append=False, flush_every=100)
+
+    def write(self, page: PageResult):
+        if page.ok:
+            self.urls.write(page.url)
+        self.responses.write([page.url, page.status, page.headers or {}, page.text])
+
+    def close(self):
+        self.responses.close()
+        self.urls.close()
+
+
+async def _recon_pipeline(targets: list):
+    known_schemes = load_known_schemes()
+    sources = build_sources()
+    shared_engine()   # compile the rule set once, before scan workers share it across threads
+    probe_results = []
+    limiter = shared_limiter()
+    crawl_config = CrawlConfig(limiter=limiter)
+    roots = {target.strip().lower().rstrip(".") for target in targets}
+
+    async with aiohttp.ClientSession(connector=make_connector()) as session, AsyncResolver() as resolver:
+
+        emitted = set()   # a name under two overlapping targets goes downstream once
+
+        async def enumerate_stage(domain):
+            root = domain.strip().lower().rstrip(".")
+            if root not in emitted:   # the root itself, as in the barrier flow's read_targets() + subdomains
+                emitted.add(root)
+                yield root
+            async for _, name in enumerate_domains([domain], sources):
+                if name not in emitted:
+                    emitted.add(name)
+                    yield name
+
+        async def resolve_stage(name):
+            # Root targets are real even under a wildcard parent zone (foo.github.io)
+            answer = await resolver.resolve_live(name, filter_wildcards=name.lower() not in roots)
+            return answer.name if answer else None
+
+        async def probe_stage(host):
+            result = await probe_host_race(session, host, known_scheme=known_schemes.get(host),
+                                           limiter=limiter)
+            if result:
+                probe_results.append(result)
+                print(f"✅ Alive: {host} [{result['scheme']} {result['status']}]")
+                return host
+            return None
+
+        async def crawl_stage(host):
+            async for item in CrawlEngine(crawl_config).crawl([host]):
+                if isinstance(item, PageResult) and item.answered:
+                    yield item
+
+        async def scan_stage(page):
+            # Rule matching over the body is CPU-bound: keep it off the event loop
+            return await asyncio.to_thread(scan_url, page.url, page)
+
+        pipeline = Pipeline([
+            Stage("enumeration", enumerate_stage, workers=8,
+                  sink=LineSink(os.path.join(RESULTS_DIR, "subdomains.txt"))),
+            Stage("resolution", resolve_stage, workers=500, queue_size=5000, sink=LineSink(RESOLVED_FILE)),
+            Stage("probing", probe_stage, workers=200, queue_size=1000, sink=LineSink(ALIVE_FILE)),
+            Stage("crawling", crawl_stage, workers=10, sink=CrawlSink()),
+            Stage("scanning", scan_stage, workers=4, queue_size=1000, sink=FindingSink(store=FindingsStore())),
+        ])
+        outputs = await pipeline.run(targets)
+
+    save_probe_results(probe_results, known_schemes)
+    pipeline.report()
+    return outputs
+
+
+def run_recon_pipeline(targets: list = None):
+    """Phases 1–4 (enumeration → resolution → probing → crawling → scanning) as one streaming pipeline."""
+    print("🚀 [Phases 1–4: Streaming Recon Pipeline Started]")
+    if targets is None:
+        targets = read_targets()
+    if not targets:
+        print("⚠️ No targets to run through the pipeline.")
+        return {}
+
+    outputs = asyncio.run(_recon_pipeline(targets))
+    print("🔚 [Phases 1–4: Streaming Recon Pipeline Completed]")
+    return outputs
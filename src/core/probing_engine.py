@@ -2,55 +2,223 @@
 Digital Sentinel - HTTP Probing Engine
 ======================================
 Checks which targets are alive by probing HTTP/HTTPS responses.
+
+Two modes are available:
+  • async    — aiohttp with one shared connection pool (default)
+  • threaded — the original requests + ThreadPoolExecutor prober
+
+In async mode HTTP and HTTPS are raced against each other (HTTP with a short
+head start) and the first scheme that answers wins. Hosts classified in an
+earlier run are probed on their known-good scheme first (see
+probe_schemes.json).
+
+Every probe that goes out on the wire waits for a slot from the shared
+core.rate_limiter scheduler, so hosts are probed politely and 429s back off.
 """
 
 import os
+import json
+import time
+import asyncio
+import aiohttp
 import requests
+from contextlib import nullcontext
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from core.response_cache import fetch_cached, header, shared_cache
+from core.rate_limiter import shared_limiter
+
 # ✅ Ensure output directories exist
 SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 DATA_PATH = os.path.join(SRC_PATH, "data")
 TARGETS_FILE = os.path.join(DATA_PATH, "targets.txt")
 OUTPUT_DIR = os.path.join(DATA_PATH, "cache", "validated")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "alive_hosts.txt")
+RESULTS_FILE = os.path.join(OUTPUT_DIR, "probe_results.json")
+SCHEME_CACHE_FILE = os.path.join(OUTPUT_DIR, "probe_schemes.json")
+
+SCHEMES = ("http", "https")
+
+# ⚙️ Async prober tuning
+MAX_CONCURRENCY = 500      # probes in flight at once
+PER_HOST_LIMIT = 4         # open connections per host in the shared pool
+DNS_CACHE_TTL = 300        # seconds a resolved name stays in the connector cache
+RACE_HEAD_START = 0.25     # seconds HTTP runs alone before HTTPS joins the race
 
 
-def probe_url(domain: str, timeout: int = 5) -> bool:
+def probe_url(domain: str, timeout: int = 5, limiter=None) -> bool:
     """Try to connect via HTTP or HTTPS and check if site is alive."""
     try:
-        resp = requests.get(f"http://{domain}", timeout=timeout)
+        with limiter.slot_sync(f"http://{domain}") if limiter else nullcontext():
+            resp = requests.get(f"http://{domain}", timeout=timeout)
+        if limiter is not None:
+            limiter.feedback(f"http://{domain}", resp.status_code, resp.headers)
         if resp.status_code < 400:
             return True
     except Exception:
         pass
     try:
-        resp = requests.get(f"https://{domain}", timeout=timeout, verify=False)
+        with limiter.slot_sync(f"https://{domain}") if limiter else nullcontext():
+            resp = requests.get(f"https://{domain}", timeout=timeout, verify=False)
+        if limiter is not None:
+            limiter.feedback(f"https://{domain}", resp.status_code, resp.headers)
         return resp.status_code < 400
     except Exception:
         return False
 
 
-def run_probing():
-    """Main orchestrator function — called from main_controller."""
-    print("🚀 [Phase 2: HTTP Probing Started]")
+async def _probe_scheme(session: aiohttp.ClientSession, scheme: str, domain: str, timeout: int = 5,
+                        cache=None, limiter=None):
+    """
+    Probe one scheme; returns a result dict on a <400 answer, else None.
+    With a ResponseCache, a fresh cached answer is reused without a request.
+    With a RateLimiter, the probe waits for the host's turn and retries on 429/503.
+    """
+    start = time.perf_counter()
+    url = f"{scheme}://{domain}"
+    # Socket-level timeouts only: a `total` timeout would also count the wait
+    # for a pool slot, and a busy pool would then report live hosts as dead.
+    client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+    try:
+        if cache is not None:
+            resp = await fetch_cached(session, cache, url, timeout=client_timeout, ssl=False, limiter=limiter)
+            status, final_url, headers = resp.status, resp.url, resp.headers
+        else:
+            attempt = 0
+            while True:
+                async with limiter.slot(url) if limiter else nullcontext():
+                    async with session.get(url, timeout=client_timeout, ssl=False) as resp:
+                        status, final_url = resp.status, str(resp.url)
+                        headers = resp.headers
+                if limiter is None:
+                    break
+                limiter.feedback(url, status, headers)
+                if not limiter.should_retry(status, attempt):
+                    break
+                attempt += 1
+    except Exception:
+        return None
+    if status >= 400:
+        return None
+    return {
+        "host": domain,
+        "scheme": scheme,
+        "status": status,
+        "final_url": final_url,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+        "server": header(headers, "Server"),
+        "powered_by": header(headers, "X-Powered-By"),
+    }
 
-    if not os.path.exists(TARGETS_FILE):
-        print(f"⚠️ Target list not found at {TARGETS_FILE}")
-        return
 
-    with open(TARGETS_FILE, "r") as f:
-        targets = [t.strip() for t in f if t.strip()]
+async def probe_host_sequential(session: aiohttp.ClientSession, domain: str, timeout: int = 5,
+                                known_scheme: str = None, cache=None, limiter=None):
+    """HTTP first, then HTTPS — the same order probe_url() uses."""
+    order = SCHEMES if known_scheme != "https" else tuple(reversed(SCHEMES))
+    for scheme in order:
+        result = await _probe_scheme(session, scheme, domain, timeout, cache, limiter)
+        if result:
+            return result
+    return None
 
-    if not targets:
-        print("⚠️ No targets found in file.")
-        return
 
-    alive = []
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+async def probe_host_race(session: aiohttp.ClientSession, domain: str, timeout: int = 5,
+                          known_scheme: str = None, cache=None, limiter=None,
+                          head_start: float = RACE_HEAD_START):
+    """
+    Race HTTP and HTTPS and return the first successful answer.
+    HTTP gets a `head_start`: HTTPS only goes out once HTTP has failed or is
+    still silent after it, so a host answering HTTP promptly costs one
+    request, and one that blackholes port 80 costs head_start instead of
+    the whole timeout.
+    A host with a known-good scheme gets that scheme alone first; the other
+    one is only tried if it stopped answering.
+    """
+    schemes = list(SCHEMES)
+    if known_scheme in schemes:
+        result = await _probe_scheme(session, known_scheme, domain, timeout, cache, limiter)
+        if result:
+            return result
+        schemes.remove(known_scheme)
+
+    pending = set()
+    try:
+        for idx, scheme in enumerate(schemes):
+            pending.add(asyncio.create_task(_probe_scheme(session, scheme, domain, timeout, cache, limiter)))
+            wait = None if idx == len(schemes) - 1 else head_start
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break  # head start used up: the next scheme joins the race
+                for task in done:
+                    if task.result():
+                        return task.result()
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def probe_url_async(session: aiohttp.ClientSession, domain: str, timeout: int = 5) -> bool:
+    """Async twin of probe_url() that reuses the session's connection pool."""
+    return await probe_host_sequential(session, domain, timeout) is not None
+
+
+def make_connector(concurrency: int = MAX_CONCURRENCY, per_host: int = PER_HOST_LIMIT, resolver=None):
+    """
+    Shared connector: bounded pool, per-host cap and cached DNS lookups.
+    A raced probe has one request in flight per scheme, so the pool holds
+    len(SCHEMES) connections for each of the `concurrency` workers.
+    """
+    return aiohttp.TCPConnector(
+        limit=concurrency * len(SCHEMES),
+        limit_per_host=per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        resolver=resolver,
+    )
+
+
+async def probe_hosts_async(targets, concurrency: int = MAX_CONCURRENCY, per_host: int = PER_HOST_LIMIT,
+                            timeout: int = 5, resolver=None, verbose: bool = True,
+                            strategy: str = "race", known_schemes: dict = None, cache=None,
+                            limiter=None) -> list:
+    """
+    Probe every target through one ClientSession and return one result dict
+    per alive host (host, scheme, status, final_url, latency_ms).
+    A fixed pool of `concurrency` workers pulls from the target iterator, so
+    memory stays flat no matter how many subdomains are fed in.
+    """
+    probe_host = probe_host_race if strategy == "race" else probe_host_sequential
+    known_schemes = known_schemes or {}
+    results = []
+    pending = iter(targets)
+
+    async with aiohttp.ClientSession(connector=make_connector(concurrency, per_host, resolver)) as session:
 
-    with ThreadPoolExecutor(max_workers=50) as executor:
-        futures = {executor.submit(probe_url, t): t for t in targets}
+        async def worker():
+            for t in pending:
+                try:
+                    result = await probe_host(session, t, timeout, known_schemes.get(t), cache, limiter)
+                except Exception as e:
+                    print(f"⚠️ Error probing {t}: {e}")
+                    continue
+                if result:
+                    results.append(result)
+                if verbose:
+                    print(f"✅ Alive: {t} [{result['scheme']} {result['status']}, {result['latency_ms']}ms]"
+                          if result else f"❌ Dead: {t}")
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return results
+
+
+def probe_hosts_threaded(targets, max_workers: int = 50, limiter=None) -> list:
+    """Original blocking prober, kept for environments without an event loop."""
+    alive = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(probe_url, t, 5, limiter): t for t in targets}
         for future in as_completed(futures):
             t = futures[future]
             try:
@@ -61,6 +229,63 @@ def run_probing():
                     print(f"❌ Dead: {t}")
             except Exception as e:
                 print(f"⚠️ Error probing {t}: {e}")
+    return alive
+
+
+def load_known_schemes() -> dict:
+    """host → scheme that answered in a previous run."""
+    if not os.path.exists(SCHEME_CACHE_FILE):
+        return {}
+    try:
+        with open(SCHEME_CACHE_FILE, "r") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_probe_results(results: list, known_schemes: dict):
+    """Write per-host probe details and remember each host's winning scheme."""
+    with open(RESULTS_FILE, "w") as f:
+        json.dump(results, f, indent=2)
+
+    known_schemes.update({r["host"]: r["scheme"] for r in results})
+    with open(SCHEME_CACHE_FILE, "w") as f:
+        json.dump(known_schemes, f, indent=2)
+
+
+def run_probing(mode: str = "async", targets: list = None, use_cache: bool = False):
+    """
+    Main orchestrator function — called from main_controller.
+    `targets` overrides targets.txt, e.g. with only this cycle's new subdomains.
+    `use_cache` routes async probes through the shared HTTP response cache.
+    """
+    print("🚀 [Phase 2: HTTP Probing Started]")
+
+    if targets is None:
+        if not os.path.exists(TARGETS_FILE):
+            print(f"⚠️ Target list not found at {TARGETS_FILE}")
+            targets = []
+        else:
+            with open(TARGETS_FILE, "r") as f:
+                targets = [t.strip() for t in f if t.strip()]
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    if not targets:
+        # Truncate, so Phase 3 never re-crawls the previous cycle's hosts
+        open(OUTPUT_FILE, "w").close()
+        print(f"⚠️ No targets to probe — {OUTPUT_FILE} emptied.")
+        return []
+
+    if mode == "async":
+        known_schemes = load_known_schemes()
+        cache = shared_cache() if use_cache else None
+        results = asyncio.run(probe_hosts_async(targets, known_schemes=known_schemes, cache=cache,
+                                                limiter=shared_limiter()))
+        alive = [r["host"] for r in results]
+        save_probe_results(results, known_schemes)
+    else:
+        alive = probe_hosts_threaded(targets, limiter=shared_limiter())
 
     # ✅ Save alive targets
     with open(OUTPUT_FILE, "w") as out:
@@ -68,6 +293,7 @@ def run_probing():
 
     print(f"\n💾 {len(alive)} alive hosts saved to {OUTPUT_FILE}")
     print("🔚 [Phase 2: HTTP Probing Completed]\n")
+    return alive
 
 
 # 👇 make sure this exists to allow import
@@ -0,0 +1,288 @@
+"""
+Digital Sentinel - Rate Limiter
+===============================
+One politeness scheduler shared by probing, crawling and validation.
+
+  • Token bucket per host (HOST_RATE requests/s, bursts of HOST_BURST)
+  • Token bucket per bug-bounty program, from data/programs.json:
+        {"acme": {"scope": ["acme.com", "acme.io"], "rate": 20, "burst": 40}}
+  • Adaptive backoff: a 429/503 pauses the host for Retry-After (or an
+    exponentially growing delay) and halves its rate; each success adds
+    RECOVERY_STEP back (AIMD, like TCP congestion control)
+  • A global concurrency budget every phase draws from, usable from asyncio
+    (`async with limiter.slot(url)`) and from threads (`with limiter.slot_sync(url)`)
+
+Phases report each response with limiter.feedback(url, status, headers).
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+PROGRAMS_FILE = os.path.join("data", "programs.json")
+
+GLOBAL_CONCURRENCY = 500   # requests in flight across every phase
+HOST_RATE = 10.0           # requests/s per host
+HOST_BURST = 20            # back-to-back requests a host may get
+MIN_RATE = 0.2             # floor a throttled host's rate is halved down to
+BACKOFF_BASE = 1.0         # seconds; first backoff without Retry-After
+BACKOFF_MAX = 300.0        # longest a host is ever paused
+RECOVERY_STEP = 0.5        # requests/s a throttled host regains per successful response
+MAX_RETRIES = 3            # times a throttled request is retried
+THROTTLE_STATUSES = (429, 503)
+
+
+def retry_after_seconds(headers) -> float:
+    """Retry-After as seconds (delta-seconds or HTTP-date), or None."""
+    if not headers:
+        return None
+    value = None
+    for key in headers:
+        if key.lower() == "retry-after":
+            value = headers[key]
+            break
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _host_of(url: str) -> str:
+    return (urlparse(url).hostname or url).lower()
+
+
+class TokenBucket:
+    """Reservation-style bucket: tokens may go negative, the deficit is the wait."""
+
+    def __init__(self, rate: float, burst: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """Take one token; returns seconds until it is actually available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class HostState:
+    __slots__ = ("bucket", "paused_until", "backoff", "program")
+
+    def __init__(self, bucket: TokenBucket, program: str = None):
+        self.bucket = bucket
+        self.paused_until = 0.0
+        self.backoff = 0.0
+        self.program = program
+
+
+class ConcurrencyBudget:
+    """A counting semaphore shared by every event loop and thread in the process."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self.lock = threading.Lock()
+        self.waiters = deque()
+
+    async def acquire(self):
+        with self.lock:
+            if self.in_use < self.limit and not self.waiters:
+                self.in_use += 1
+                return
+            loop = asyncio.get_running_loop()
+            waiter = (loop, loop.create_future())
+            self.waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self.lock:
+                if waiter in self.waiters:
+                    self.waiters.remove(waiter)
+                    raise
+            # The slot was handed over just as we were cancelled — pass it on
+            if waiter[1].done() and not waiter[1].cancelled():
+                self.release()
+            raise
+
+    def acquire_sync(self):
+        with self.lock:
+            if self.in_use < self.limit and not self.waiters:
+                self.in_use += 1
+                return
+            event = threading.Event()
+            self.waiters.append((None, event))
+        event.wait()
+
+    def _wake(self, future):
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+    def release(self):
+        """Hand the slot straight to the oldest waiter, or free it."""
+        with self.lock:
+            while self.waiters:
+                loop, waiter = self.waiters.popleft()
+                if loop is None:
+                    waiter.set()
+                    return
+                if loop.is_closed():
+                    continue
+                loop.call_soon_threadsafe(self._wake, waiter)
+                return
+            self.in_use -= 1
+
+
+class RateLimiter:
+    """Per-host and per-program token buckets behind one global concurrency budget."""
+
+    def __init__(self, concurrency: int = GLOBAL_CONCURRENCY, host_rate: float = HOST_RATE,
+                 host_burst: int = HOST_BURST, programs: dict = None):
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.budget = ConcurrencyBudget(concurrency)
+        self.programs = {}
+        self.scopes = []
+        for name, program in (programs or {}).items():
+            self.programs[name] = TokenBucket(program.get("rate", host_rate), program.get("burst", host_burst))
+            self.scopes.extend((domain.lower().lstrip("*."), name) for domain in program.get("scope", []))
+        self.hosts = {}
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "throttled": 0, "retries": 0, "waited_s": 0.0}
+
+    # ---------- scheduling ----------
+    def _program_for(self, host: str):
+        for domain, name in self.scopes:
+            if host == domain or host.endswith("." + domain):
+                return name
+        return None
+
+    def _host(self, host: str) -> HostState:
+        state = self.hosts.get(host)
+        if state is None:
+            state = HostState(TokenBucket(self.host_rate, self.host_burst), self._program_for(host))
+            self.hosts[host] = state
+        return state
+
+    def reserve(self, url: str):
+        """
+        (seconds to wait, reserved). A paused host hands out no tokens: the
+        caller sleeps out the pause and asks again, so requests queued during
+        a backoff come back spaced at the reduced rate instead of all at once.
+        """
+        now = time.monotonic()
+        with self.lock:
+            state = self._host(_host_of(url))
+            if state.paused_until > now:
+                wait, reserved = state.paused_until - now, False
+            else:
+                wait, reserved = state.bucket.reserve(now), True
+                if state.program is not None:
+                    wait = max(wait, self.programs[state.program].reserve(now))
+                self.stats["requests"] += 1
+            self.stats["waited_s"] += wait
+        return wait, reserved
+
+    def paused_for(self, url: str) -> float:
+        """Seconds left on a backoff the host picked up while we were queued."""
+        with self.lock:
+            return max(0.0, self._host(_host_of(url)).paused_until - time.monotonic())
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Wait for the host's turn, then hold one unit of the global budget."""
+        while True:
+            wait, reserved = self.reserve(url)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            if reserved and not self.paused_for(url):
+                break
+        await self.budget.acquire()
+        try:
+            yield
+        finally:
+            self.budget.release()
+
+    @contextmanager
+    def slot_sync(self, url: str):
+        """Thread-blocking twin of slot() for requests-based callers."""
+        while True:
+            wait, reserved = self.reserve(url)
+            if wait > 0:
+                time.sleep(wait)
+            if reserved and not self.paused_for(url):
+                break
+        self.budget.acquire_sync()
+        try:
+            yield
+        finally:
+            self.budget.release()
+
+    # ---------- feedback ----------
+    def feedback(self, url: str, status: int, headers=None):
+        """Adapt the host's pace to how it answered."""
+        now = time.monotonic()
+        with self.lock:
+            state = self._host(_host_of(url))
+            bucket = state.bucket
+            if status in THROTTLE_STATUSES:
+                self.stats["throttled"] += 1
+                # Responses already in flight when the first 429 landed don't count twice
+                if now >= state.paused_until:
+                    bucket.rate = max(MIN_RATE, bucket.rate / 2)
+                    bucket.tokens = min(bucket.tokens, 0.0)
+                    state.backoff = min(BACKOFF_MAX, state.backoff * 2 or BACKOFF_BASE)
+                retry_after = retry_after_seconds(headers)
+                if retry_after is None:
+                    retry_after = state.backoff * random.uniform(0.8, 1.2)
+                state.paused_until = max(state.paused_until, now + min(retry_after, BACKOFF_MAX))
+            else:
+                state.backoff = 0.0
+                bucket.rate = min(bucket.base_rate, bucket.rate + RECOVERY_STEP)
+
+    def should_retry(self, status: int, attempt: int) -> bool:
+        if status in THROTTLE_STATUSES and attempt < MAX_RETRIES:
+            self.stats["retries"] += 1
+            return True
+        return False
+
+    def report(self, label: str = "cycle") -> dict:
+        stats = dict(self.stats, hosts=len(self.hosts))
+        print(f"🚦 Rate limiter [{label}] {stats['requests']} requests over {stats['hosts']} hosts — "
+              f"{stats['throttled']} throttled, {stats['retries']} retried, {stats['waited_s']:.1f}s spent waiting")
+        return stats
+
+
+def load_programs(path: str = PROGRAMS_FILE) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+_shared = None
+
+
+def shared_limiter() -> RateLimiter:
+    """Process-wide limiter so every phase draws from the same budget."""
+    global _shared
+    if _shared is None:
+        _shared = RateLimiter(programs=load_programs())
+    return _shared
@@ -0,0 +1,177 @@
+"""
+Digital Sentinel - Record Streams
+=================================
+Shared JSON Lines layer for phase results.
+
+  • RecordWriter   — append-only, one compact JSON object per line, flushed
+                     as it goes so a crash keeps everything written so far
+  • iter_records() — lazy reader; never holds more than one record
+  • Compression by file suffix: .jsonl.gz (gzip) or .jsonl.zst (zstandard,
+    optional dependency)
+  • orjson is used for encoding/decoding when installed
+  • materialize_json() — turns a stream into the indented whole-file JSON the
+                     exports and reports have always produced, one record
+                     at a time
+
+Phases write <name>.jsonl while they run and materialise <name>.json at the
+end, so existing consumers of the JSON files keep working.
+"""
+
+import os
+import io
+import json
+import gzip
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional
+    zstandard = None
+
+COMPRESSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+# What a decompressor raises on a stream cut off mid-write (no gzip trailer, partial zstd frame)
+TRUNCATED = (EOFError, OSError) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+def encode(record) -> str:
+    """Compact single-line JSON."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+
+
+def decode(line):
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+
+def stream_path(path: str, compress: str = None) -> str:
+    """`path` with the suffix for `compress` ("gzip", "zstd" or None) added."""
+    suffix = COMPRESSIONS[compress]
+    return path if path.endswith(suffix) else path + suffix
+
+
+def jsonl_path(json_path: str) -> str:
+    """The stream a materialised JSON file is built from: report.json → report.jsonl."""
+    return os.path.splitext(json_path)[0] + ".jsonl"
+
+
+def _open(path: str, mode: str):
+    """Text-mode handle, compressed according to the file suffix."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is not installed; cannot open {path}")
+        if mode == "r":
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True,
+                                                               closefd=True)
+        else:
+            raw = zstandard.ZstdCompressor().stream_writer(open(path, mode + "b"), closefd=True)
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class RecordWriter:
+    """Append-only JSON Lines writer."""
+
+    def __init__(self, path: str, append: bool = True, compress: str = None, flush_every: int = 1):
+        self.path = stream_path(path, compress)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.file = _open(self.path, "a" if append else "w")
+        self.flush_every = flush_every
+        self.count = 0
+
+    def write(self, record):
+        self.file.write(encode(record) + "\n")
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self.file.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_records(path: str):
+    """
+    Lazily yield the records in a .jsonl[.gz|.zst] stream.
+    A .json path is read through its .jsonl stream when one exists, and
+    otherwise loaded whole (its top-level list, or the object itself).
+    A torn last line — the process died mid-write — is skipped; so is the
+    unreadable tail of a compressed stream that was never closed.
+    """
+    if path.endswith(".json"):
+        stream = jsonl_path(path)
+        if not os.path.exists(stream):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            yield from data if isinstance(data, list) else [data]
+            return
+        path = stream
+
+    with _open(path, "r") as f:
+        try:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield decode(line)
+                except ValueError:
+                    print(f"⚠️ Skipping unreadable record in {path}")
+        except TRUNCATED as e:
+            print(f"⚠️ {path} ends early ({e}); keeping the records before the cut")
+
+
+def _json_array(records, out, indent: int, depth: int) -> int:
+    """Write `records` as an indented JSON array nested `depth` levels deep; returns the count."""
+    pad = " " * (indent * (depth + 1))
+    count = 0
+    for record in records:
+        if orjson is not None and indent == 2:
+            body = orjson.dumps(record, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        else:
+            body = json.dumps(record, indent=indent)
+        body = body.replace("\n", "\n" + pad)
+        out.write(("," if count else "[") + "\n" + pad + body)
+        count += 1
+    out.write("\n" + " " * (indent * depth) + "]" if count else "[]")
+    return count
+
+
+def materialize_json(records, json_path: str, key: str = None, extra: dict = None, indent: int = 2) -> int:
+    """
+    Write `records` (an iterable, or a stream path) to `json_path` exactly as
+    json.dump(..., indent=indent) would — as a bare list, or as
+    {**extra, key: [...]} — without building the list in memory. (With
+    orjson, indent=2 output leaves non-ASCII characters unescaped.)
+    The file is swapped in atomically; returns the number of records.
+    """
+    if isinstance(records, str):
+        records = iter_records(records)
+    os.makedirs(os.path.dirname(json_path) or ".", exist_ok=True)
+    tmp = f"{json_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as out:
+        if key is None:
+            count = _json_array(records, out, indent, 0)
+        else:
+            # The list is the last member, so everything around its "[]" placeholder is fixed text
+            shell = json.dumps({**(extra or {}), key: []}, indent=indent)
+            cut = shell.rindex("[]")
+            out.write(shell[:cut])
+            count = _json_array(records, out, indent, 1)
+            out.write(shell[cut + 2:])
+    os.replace(tmp, json_path)
+    return count
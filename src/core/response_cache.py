@@ -0,0 +1,364 @@
+"""
+Digital Sentinel - HTTP Response Cache
+======================================
+On-disk cache shared by probing, crawling and validation.
+
+  • Keyed by method + normalised URL + request parameters
+  • Freshness from Cache-Control max-age (or a default TTL), then
+    ETag / Last-Modified revalidation once stale
+  • Bodies stored gzip-compressed and content-addressed (sha256), so
+    identical pages are kept once no matter how many URLs serve them
+  • Size-bounded: least-recently-used entries are evicted first
+
+Phases opt in by passing a ResponseCache (usually shared_cache()) to their
+fetch path; fetch_cached() / get_cached() do the lookup → conditional
+request → store dance for aiohttp and requests respectively. Given a
+core.rate_limiter.RateLimiter, only requests that actually hit the network
+wait for a slot, and throttled ones are retried after the backoff.
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+
+from crawler.frontier import normalize_url
+
+CACHE_DIR = os.path.join("data", "cache", "http")
+MAX_BYTES = 512 * 1024 * 1024   # compressed body bytes kept on disk
+DEFAULT_TTL = 3600              # seconds a response is fresh without Cache-Control
+MAX_AGE = re.compile(r"max-age=(\d+)")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key           TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    status        INTEGER NOT NULL,
+    headers       TEXT NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    body_hash     TEXT NOT NULL,
+    stored_at     REAL NOT NULL,
+    expires_at    REAL NOT NULL,
+    last_access   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access);
+CREATE INDEX IF NOT EXISTS idx_entries_body_hash ON entries (body_hash);
+CREATE TABLE IF NOT EXISTS blobs (
+    hash     TEXT PRIMARY KEY,
+    size     INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL,
+    refs     INTEGER NOT NULL
+);
+"""
+
+
+def cache_key(method: str, url: str, params: dict = None) -> str:
+    params_part = json.dumps(sorted((params or {}).items()), separators=(",", ":"))
+    return hashlib.sha256(f"{method.upper()} {normalize_url(url)} {params_part}".encode()).hexdigest()
+
+
+def header(headers: dict, name: str, default=None):
+    """Case-insensitive header lookup on a plain dict."""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return default
+
+
+def ttl_from_headers(headers: dict, default_ttl: int):
+    """Seconds of freshness, or None when the response must not be stored."""
+    cache_control = header(headers, "Cache-Control", "").lower()
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0
+    match = MAX_AGE.search(cache_control)
+    return int(match.group(1)) if match else default_ttl
+
+
+class CachedResponse:
+    """A response served from (or just written to) the cache."""
+
+    __slots__ = ("key", "url", "status", "headers", "body", "etag", "last_modified", "body_hash",
+                 "stored_at", "fresh", "from_cache")
+
+    def __init__(self, key, url, status, headers, body, etag, last_modified, body_hash, stored_at,
+                 fresh=True, from_cache=False):
+        self.key = key
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body_hash = body_hash
+        self.stored_at = stored_at
+        self.fresh = fresh
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        content_type = header(self.headers, "Content-Type", "")
+        match = re.search(r"charset=([\w-]+)", content_type)
+        try:
+            return self.body.decode(match.group(1) if match else "utf-8", errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+    def validators(self) -> dict:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CacheStats:
+    FIELDS = ("hits", "misses", "revalidated", "stores", "evictions", "bytes_saved", "bytes_deduped")
+
+    def __init__(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+
+    def snapshot(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.revalidated + self.misses
+        return (self.hits + self.revalidated) / lookups if lookups else 0.0
+
+
+class ResponseCache:
+    """SQLite index + content-addressed gzip blobs."""
+
+    def __init__(self, path: str = CACHE_DIR, max_bytes: int = MAX_BYTES, default_ttl: int = DEFAULT_TTL):
+        self.path = path
+        self.blob_dir = os.path.join(path, "blobs")
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self.lock = threading.Lock()
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(path, "index.db"), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    # ---------- blobs ----------
+    def _blob_path(self, body_hash: str) -> str:
+        return os.path.join(self.blob_dir, body_hash[:2], f"{body_hash}.gz")
+
+    def _read_blob(self, body_hash: str) -> bytes:
+        with gzip.open(self._blob_path(body_hash), "rb") as f:
+            return f.read()
+
+    def _put_blob(self, body: bytes) -> str:
+        body_hash = hashlib.sha256(body).hexdigest()
+        row = self.conn.execute("SELECT refs FROM blobs WHERE hash = ?", (body_hash,)).fetchone()
+        if row:
+            self.conn.execute("UPDATE blobs SET refs = refs + 1 WHERE hash = ?", (body_hash,))
+            self.stats.bytes_deduped += len(body)
+            return body_hash
+        path = self._blob_path(body_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = gzip.compress(body, compresslevel=6)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp, path)
+        self.conn.execute("INSERT INTO blobs (hash, size, raw_size, refs) VALUES (?, ?, ?, 1)",
+                          (body_hash, len(compressed), len(body)))
+        self.total_bytes += len(compressed)
+        return body_hash
+
+    def _release_blob(self, body_hash: str):
+        self.conn.execute("UPDATE blobs SET refs = refs - 1 WHERE hash = ?", (body_hash,))
+        row = self.conn.execute("SELECT size FROM blobs WHERE hash = ? AND refs <= 0", (body_hash,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM blobs WHERE hash = ?", (body_hash,))
+            self.total_bytes -= row[0]
+            try:
+                os.remove(self._blob_path(body_hash))
+            except OSError:
+                pass
+
+    # ---------- entries ----------
+    def lookup(self, method: str, url: str, params: dict = None):
+        """Cached entry for this request (fresh or stale), or None."""
+        key = cache_key(method, url, params)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT url, status, headers, etag, last_modified, body_hash, stored_at, expires_at "
+                "FROM entries WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return None
+            try:
+                body = self._read_blob(row[5])
+            except OSError:
+                self._delete_entry(key, row[5])
+                self.conn.commit()
+                return None
+            self.conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        return CachedResponse(key, row[0], row[1], json.loads(row[2]), body, row[3], row[4], row[5], row[6],
+                              fresh=row[7] > time.time(), from_cache=True)
+
+    def store(self, method: str, url: str, params: dict, status: int, headers: dict, body: bytes,
+              final_url: str = None):
+        """
+        Write a fresh response; returns it as a CachedResponse (stored or not).
+        `final_url` is where redirects ended up — the key always uses the requested `url`.
+        """
+        key = cache_key(method, url, params)
+        headers = {k: v for k, v in headers.items()}
+        final_url = final_url or url
+        now = time.time()
+        ttl = ttl_from_headers(headers, self.default_ttl)
+        etag = header(headers, "ETag")
+        last_modified = header(headers, "Last-Modified")
+        response = CachedResponse(key, final_url, status, headers, body, etag, last_modified,
+                                  hashlib.sha256(body).hexdigest(), now)
+        if ttl is None or status >= 500 or status == 429:
+            return response
+
+        with self.lock:
+            old = self.conn.execute("SELECT body_hash FROM entries WHERE key = ?", (key,)).fetchone()
+            body_hash = self._put_blob(body)
+            if old:
+                self._release_blob(old[0])
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (key, url, status, headers, etag, last_modified, body_hash, "
+                "stored_at, expires_at, last_access) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, final_url, status, json.dumps(headers), etag, last_modified, body_hash, now, now + ttl, now))
+            self.stats.stores += 1
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+            self.conn.commit()
+        return response
+
+    def refresh(self, entry: CachedResponse, headers: dict) -> CachedResponse:
+        """A 304 came back: extend the entry's freshness and count the saved download."""
+        ttl = ttl_from_headers(dict(headers), self.default_ttl) or 0
+        with self.lock:
+            self.conn.execute("UPDATE entries SET expires_at = ?, last_access = ? WHERE key = ?",
+                              (time.time() + ttl, time.time(), entry.key))
+            self.conn.commit()
+        self.stats.revalidated += 1
+        self.stats.bytes_saved += len(entry.body)
+        entry.fresh = True
+        return entry
+
+    def _delete_entry(self, key: str, body_hash: str):
+        self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._release_blob(body_hash)
+
+    def _evict(self):
+        """Drop least-recently-used entries until the blob store fits in max_bytes."""
+        target = int(self.max_bytes * 0.9)
+        rows = self.conn.execute("SELECT key, body_hash FROM entries ORDER BY last_access").fetchall()
+        for key, body_hash in rows:
+            if self.total_bytes <= target:
+                break
+            self._delete_entry(key, body_hash)
+            self.stats.evictions += 1
+
+    def hit(self, entry: CachedResponse) -> CachedResponse:
+        self.stats.hits += 1
+        self.stats.bytes_saved += len(entry.body)
+        return entry
+
+    def report(self, label: str = "cycle") -> dict:
+        """Print and log this cache's hit rate and savings."""
+        snap = self.stats.snapshot()
+        snap.update({"label": label, "hit_rate": round(self.stats.hit_rate, 4),
+                     "disk_bytes": self.total_bytes, "timestamp": datetime.utcnow().isoformat()})
+        print(f"🗃️ HTTP cache [{label}] hit rate {self.stats.hit_rate:.1%} — {snap['hits']} hits, "
+              f"{snap['revalidated']} revalidated, {snap['misses']} misses, "
+              f"{snap['bytes_saved'] / 1024:.0f} KB not downloaded, {snap['bytes_deduped'] / 1024:.0f} KB deduped")
+        with open(os.path.join(self.path, "cache_stats.log"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(snap) + "\n")
+        return snap
+
+
+_shared = None
+
+
+def shared_cache() -> ResponseCache:
+    """Process-wide cache instance so every phase in a cycle shares stats."""
+    global _shared
+    if _shared is None:
+        _shared = ResponseCache()
+    return _shared
+
+
+async def fetch_cached(session, cache: ResponseCache, url: str, params: dict = None, method: str = "GET",
+                       headers: dict = None, revalidate: bool = False, limiter=None, **kwargs) -> CachedResponse:
+    """
+    aiohttp fetch through the cache: fresh hit → no request; stale → conditional request.
+    `revalidate` sends the conditional request even while the entry is still fresh.
+    """
+    entry = cache.lookup(method, url, params)
+    if entry is not None and entry.fresh and not revalidate:
+        return cache.hit(entry)
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        request_headers.update(entry.validators())
+    attempt = 0
+    while True:
+        async with limiter.slot(url) if limiter else nullcontext():
+            async with session.request(method, url, params=params, headers=request_headers, **kwargs) as resp:
+                if limiter is not None:
+                    limiter.feedback(url, resp.status, resp.headers)
+                    if limiter.should_retry(resp.status, attempt):
+                        attempt += 1
+                        continue
+                if resp.status == 304 and entry is not None:
+                    return cache.refresh(entry, resp.headers)
+                body = await resp.read()
+                cache.stats.misses += 1
+                return cache.store(method, url, params, resp.status, dict(resp.headers), body, str(resp.url))
+
+
+def get_cached(cache: ResponseCache, url: str, params: dict = None, session=None, headers: dict = None,
+               limiter=None, **kwargs) -> CachedResponse:
+    """requests twin of fetch_cached()."""
+    import requests
+
+    http = session or requests
+    entry = cache.lookup("GET", url, params)
+    if entry is not None and entry.fresh:
+        return cache.hit(entry)
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        request_headers.update(entry.validators())
+    attempt = 0
+    while True:
+        with limiter.slot_sync(url) if limiter else nullcontext():
+            resp = http.get(url, params=params, headers=request_headers, **kwargs)
+        if limiter is None:
+            break
+        limiter.feedback(url, resp.status_code, resp.headers)
+        if not limiter.should_retry(resp.status_code, attempt):
+            break
+        attempt += 1
+    if resp.status_code == 304 and entry is not None:
+        return cache.refresh(entry, resp.headers)
+    cache.stats.misses += 1
+    return cache.store("GET", url, params, resp.status_code, dict(resp.headers), resp.content, resp.url)
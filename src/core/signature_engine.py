@@ -0,0 +1,370 @@
+"""
+Digital Sentinel - Signature Engine
+===================================
+Rule-based matching of crawled responses: the rule set is compiled once,
+then every response is checked against all rules in one pass.
+
+Rules live in data/signatures/*.json (and *.yaml / *.yml when PyYAML is
+installed), as a list or as {"rules": [...]}:
+
+    {"id": "sqli-mysql-error", "name": "SQL injection (MySQL error)",
+     "signature": "sqli", "severity": "high", "condition": "and",
+     "description": "MySQL error disclosed at {url}",
+     "matchers": [
+        {"part": "body", "type": "word", "words": ["You have an error in your SQL syntax"]},
+        {"part": "header", "name": "Content-Type", "type": "regex", "regex": ["text/html"]},
+        {"part": "status", "type": "status", "status": [200, 500]}]}
+
+  • part: url | status | body | headers (all of them, "Name: value" lines) |
+    header (one, by "name")
+  • type: word (literal substrings) | regex | status; "condition" and/or
+    across a matcher's values, "case_insensitive", "negative" to invert
+  • the rule's own "condition" (and/or) combines its matchers
+
+How one pass works:
+  • every literal — word matcher values, plus the literals each regex
+    requires (its longest plain run, or one per branch of an alternation) —
+    goes into one trie-shaped regex per part and case mode. One scan of the
+    text finds the longest literal starting at each position; literals that
+    are prefixes of it are implied, so every literal present is reported
+    (what Aho-Corasick would give, without a pure-Python state machine in
+    the loop)
+  • a rule is evaluated only when one of its trigger literals was seen;
+    rules with nothing to key on (status-only, literal-free regexes) are
+    checked for every response
+  • a regex none of whose required literals was seen is never run
+"""
+
+import os
+import re
+import glob
+import json
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional; JSON rules always load
+    yaml = None
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+RULES_DIR = os.path.join("data", "signatures")
+RULE_SUFFIXES = (".json", ".yaml", ".yml")
+MIN_LITERAL = 3                 # shorter required literals are too common to key rules on
+MAX_SCAN_CHARS = 2 * 1024 * 1024  # body characters scanned per response
+PARTS = ("url", "status", "body", "headers", "header")
+MATCHER_TYPES = ("word", "regex", "status")
+DEFAULT_DESCRIPTION = "{name} detected at {url}"
+
+
+def _required(items) -> list:
+    """Literals, one of which every match of the parsed `items` contains; alternations give several."""
+    best, run = [], ""
+
+    def shortest(literals):
+        return min(map(len, literals)) if literals else 0
+
+    for op, arg in list(items) + [(None, None)]:
+        if op == sre_parse.LITERAL:
+            run += chr(arg)
+            continue
+        candidate = [run] if run else []
+        run = ""
+        if op == sre_parse.SUBPATTERN:
+            inner = _required(arg[-1])
+            candidate = inner if shortest(inner) > shortest(candidate) else candidate
+        elif op == sre_parse.BRANCH:
+            alternatives = [_required(branch) for branch in arg[1]]
+            if all(alternatives) and shortest(sum(alternatives, [])) > shortest(candidate):
+                candidate = sum(alternatives, [])
+        if shortest(candidate) > shortest(best):
+            best = candidate
+    return best
+
+
+def _scoped_ignore_case(items) -> bool:
+    """True when a (?i:...) group somewhere in the parsed `items` turns case folding on locally."""
+    for op, arg in items:
+        if op == sre_parse.SUBPATTERN and arg[1] & re.IGNORECASE:
+            return True
+        for value in arg if isinstance(arg, (tuple, list)) else ():
+            nested = value if isinstance(value, list) else [value]
+            if any(isinstance(sub, sre_parse.SubPattern) and _scoped_ignore_case(sub) for sub in nested):
+                return True
+    return False
+
+
+def required_literals(pattern: str, flags: int = 0) -> tuple:
+    """
+    (literals, ignore_case): plain strings, one of which every match of
+    `pattern` must contain — ([], …) when there is nothing to key on.
+    A local (?i:...) group folds the whole pattern's literals: keying the
+    rest case-insensitively only runs the regex more often, never less.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return [], False
+    ignore_case = bool(parsed.state.flags & re.IGNORECASE) or _scoped_ignore_case(parsed)
+    literals = _required(parsed)
+    if not literals or min(map(len, literals)) < MIN_LITERAL:
+        return [], ignore_case
+    return sorted({literal.lower() if ignore_case else literal for literal in literals}), ignore_case
+
+
+def trie_pattern(words) -> str:
+    """One regex matching any of `words`, factored by common prefixes; the longest wins."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = None
+
+    def emit(node) -> str:
+        ends = "" in node
+        branches, leaves = [], []
+        for ch in sorted(k for k in node if k):
+            child = node[ch]
+            if list(child) == [""]:
+                leaves.append(re.escape(ch))
+            else:
+                branches.append(re.escape(ch) + emit(child))
+        if leaves:
+            branches.append(leaves[0] if len(leaves) == 1 else "[" + "".join(leaves) + "]")
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if ends else body
+
+    return emit(trie)
+
+
+class LiteralScanner:
+    """All literals of one part and case mode, found in a single scan."""
+
+    def __init__(self, field: str, ignore_case: bool):
+        self.field = field
+        self.ignore_case = ignore_case
+        self.literals = {}      # text → literal id
+        self.implied = {}       # longest match text → ids of every literal that is a prefix of it
+        self.regex = None
+
+    def add(self, text: str, literal_id: int) -> int:
+        return self.literals.setdefault(text.lower() if self.ignore_case else text, literal_id)
+
+    def compile(self):
+        for text in self.literals:
+            self.implied[text] = tuple(self.literals[text[:k]] for k in range(1, len(text) + 1)
+                                       if text[:k] in self.literals)
+        self.regex = re.compile(trie_pattern(self.literals))
+
+    def scan(self, text: str, hits: set):
+        # search() rather than a (?=...) lookahead keeps sre's first-character
+        # prefilter, several times faster; restarting one past each match start
+        # still finds overlapping literals. Case-insensitive literals are stored
+        # lowercased and matched against lowercased text instead of re.IGNORECASE.
+        if self.ignore_case:
+            text = text.lower()
+        search, implied = self.regex.search, self.implied
+        found = search(text)
+        while found is not None:
+            hits.update(implied[found.group()])
+            found = search(text, found.start() + 1)
+
+
+class Matcher:
+    def __init__(self, spec: dict, engine: "SignatureEngine"):
+        self.part = spec.get("part", "body")
+        self.type = spec.get("type") or next((t for t in MATCHER_TYPES if t in spec or t + "s" in spec), None)
+        if self.part not in PARTS:
+            raise ValueError(f"unknown part {self.part!r}")
+        if self.type not in MATCHER_TYPES:
+            raise ValueError(f"unknown matcher type {self.type!r}")
+        if self.part == "header" and not spec.get("name"):
+            raise ValueError("header matchers need a name")
+        self.field = f"header:{spec['name'].lower()}" if self.part == "header" else self.part
+        self.all = str(spec.get("condition", "or")).lower() == "and"
+        self.negative = bool(spec.get("negative"))
+        ignore_case = bool(spec.get("case_insensitive"))
+        values = spec.get(self.type, spec.get(self.type + "s", []))
+        values = values if isinstance(values, list) else [values]
+        if not values:
+            raise ValueError(f"{self.type} matcher without values")
+
+        self.literals, self.regexes, self.statuses = [], [], set()
+        if self.type == "word":
+            self.literals = [engine.literal(self.field, ignore_case, str(word)) for word in values]
+        elif self.type == "regex":
+            flags = re.IGNORECASE if ignore_case else 0
+            for pattern in values:
+                literals, literal_ci = required_literals(pattern, flags)
+                literal_ids = {engine.literal(self.field, literal_ci, literal) for literal in literals} or None
+                self.regexes.append((re.compile(pattern, flags), literal_ids))
+        else:
+            self.statuses = {int(status) for status in values}
+
+    def triggers(self):
+        """Literal ids, one of which must be present for this matcher to match; None when it can't be keyed."""
+        if self.negative or self.type == "status":
+            return None
+        if self.type == "word":
+            return set(self.literals[:1]) if self.all else set(self.literals)
+        keyed = [literal_ids for _, literal_ids in self.regexes]
+        if self.all:
+            return next((literal_ids for literal_ids in keyed if literal_ids), None)
+        return None if None in keyed else set().union(*keyed)
+
+    def matches(self, texts: dict, status, hits: set) -> bool:
+        if self.type == "status":
+            result = status in self.statuses
+        elif self.type == "word":
+            check = all if self.all else any
+            result = check(literal_id in hits for literal_id in self.literals)
+        else:
+            text = texts.get(self.field) or ""
+            outcomes = ((literal_ids is None or not hits.isdisjoint(literal_ids)) and regex.search(text) is not None
+                        for regex, literal_ids in self.regexes)
+            result = all(outcomes) if self.all else any(outcomes)
+        return result != self.negative
+
+
+class Rule:
+    def __init__(self, spec: dict, engine: "SignatureEngine"):
+        self.id = str(spec.get("id") or "")
+        if not self.id:
+            raise ValueError("rule without an id")
+        self.name = spec.get("name") or self.id
+        self.signature = str(spec.get("signature") or self.id).lower()
+        self.severity = str(spec.get("severity") or "medium").lower()
+        self.description = spec.get("description") or DEFAULT_DESCRIPTION.replace("{name}", self.name)
+        self.all = str(spec.get("condition", "and")).lower() == "and"
+        self.matchers = [Matcher(m, engine) for m in spec.get("matchers") or []]
+        if not self.matchers:
+            raise ValueError("rule without matchers")
+
+    def triggers(self):
+        """Literal ids that make this rule worth evaluating; None when it must always be evaluated."""
+        per_matcher = [m.triggers() for m in self.matchers]
+        if self.all:
+            return next((t for t in per_matcher if t), None)
+        if any(t is None for t in per_matcher):
+            return None
+        return set().union(*per_matcher)
+
+    def matches(self, texts: dict, status, hits: set) -> bool:
+        outcomes = (m.matches(texts, status, hits) for m in self.matchers)
+        return all(outcomes) if self.all else any(outcomes)
+
+    def describe(self, url: str) -> str:
+        return self.description.replace("{url}", url)
+
+
+def load_rule_file(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            data = json.load(f)
+        elif yaml is not None:
+            data = yaml.safe_load(f)
+        else:
+            print(f"⚠️ PyYAML is not installed; skipping signature file {path}")
+            return []
+    rules = data.get("rules", []) if isinstance(data, dict) else data
+    return rules or []
+
+
+def load_rules(path: str = RULES_DIR) -> list:
+    """Rule dicts from a rules file, or from every rules file in a directory (sorted by name)."""
+    if os.path.isdir(path):
+        paths = sorted(p for p in glob.glob(os.path.join(path, "*")) if p.endswith(RULE_SUFFIXES))
+    else:
+        paths = [path] if os.path.exists(path) else []
+    rules = []
+    for rules_file in paths:
+        rules.extend(load_rule_file(rules_file))
+    return rules
+
+
+class SignatureEngine:
+    """A compiled rule set."""
+
+    def __init__(self, rules: list):
+        self.scanners = {}                  # (field, ignore_case) → LiteralScanner
+        self.literal_count = 0
+        self.rules = []
+        for spec in rules:
+            try:
+                self.rules.append(Rule(spec, self))
+            except (ValueError, re.error, TypeError) as e:
+                print(f"⚠️ Skipping signature rule {spec.get('id', '?') if isinstance(spec, dict) else spec}: {e}")
+
+        self.always = []                    # rules evaluated for every response
+        self.by_literal = {}                # literal id → rules it triggers
+        for idx, rule in enumerate(self.rules):
+            triggers = rule.triggers()
+            if triggers is None:
+                self.always.append(idx)
+            else:
+                for literal_id in triggers:
+                    self.by_literal.setdefault(literal_id, []).append(idx)
+        for scanner in self.scanners.values():
+            scanner.compile()
+        self.header_fields = {field for field, _ in self.scanners if field.startswith("header:")} | \
+            {m.field for rule in self.rules for m in rule.matchers if m.field.startswith("header:")}
+        self.needs_headers = bool(self.header_fields) or any(field == "headers" for field, _ in self.scanners) or \
+            any(m.field == "headers" for rule in self.rules for m in rule.matchers)
+
+    @classmethod
+    def load(cls, path: str = RULES_DIR) -> "SignatureEngine":
+        return cls(load_rules(path))
+
+    def literal(self, field: str, ignore_case: bool, text: str) -> int:
+        scanner = self.scanners.get((field, ignore_case))
+        if scanner is None:
+            scanner = self.scanners[(field, ignore_case)] = LiteralScanner(field, ignore_case)
+        literal_id = scanner.add(text, self.literal_count)
+        if literal_id == self.literal_count:
+            self.literal_count += 1
+        return literal_id
+
+    def __len__(self):
+        return len(self.rules)
+
+    def texts(self, url: str, headers=None, body: str = "") -> dict:
+        texts = {"url": url or "", "body": (body or "")[:MAX_SCAN_CHARS]}
+        if self.needs_headers and headers:
+            texts["headers"] = "\n".join(f"{name}: {value}" for name, value in headers.items())
+            for name, value in headers.items():
+                field = f"header:{name.lower()}"
+                if field in self.header_fields:
+                    texts[field] = value if field not in texts else f"{texts[field]}\n{value}"
+        return texts
+
+    def match(self, url: str, status: int = None, headers=None, body: str = "") -> list:
+        """Every rule the response matches, in rule-set order."""
+        texts = self.texts(url, headers, body)
+        hits = set()
+        for (field, _), scanner in self.scanners.items():
+            text = texts.get(field)
+            if text:
+                scanner.scan(text, hits)
+        candidates = set(self.always)
+        by_literal = self.by_literal
+        for literal_id in hits:
+            candidates.update(by_literal.get(literal_id, ()))
+        return [self.rules[idx] for idx in sorted(candidates) if self.rules[idx].matches(texts, status, hits)]
+
+    def match_response(self, response) -> list:
+        """match() for a core.response_cache.CachedResponse."""
+        return self.match(response.url, response.status, response.headers, response.text)
+
+
+_shared = None
+
+
+def shared_engine() -> SignatureEngine:
+    """The default rule set, compiled once per process."""
+    global _shared
+    if _shared is None:
+        _shared = SignatureEngine.load()
+    return _shared
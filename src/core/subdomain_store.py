@@ -0,0 +1,133 @@
+"""
+Digital Sentinel - Subdomain Store
+==================================
+Persistent, indexed record of every subdomain ever enumerated, with
+first-seen / last-seen times. Each enumeration cycle is synced against it
+so only new and disappeared names need to flow into the later phases.
+
+Rows are keyed by (domain, name): overlapping targets (example.com and
+api.example.com) both own www.api.example.com. New and gone are decided
+per name, though — a name is new when no target had it active, and gone
+when no target still has it.
+"""
+
+import os
+import time
+import sqlite3
+
+STORE_PATH = os.path.join("data", "results", "subdomains.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subdomains (
+    name       TEXT NOT NULL,
+    domain     TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen  REAL NOT NULL,
+    active     INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (domain, name)
+);
+CREATE INDEX IF NOT EXISTS idx_subdomains_domain_active ON subdomains (domain, active);
+CREATE INDEX IF NOT EXISTS idx_subdomains_name_active ON subdomains (name, active);
+CREATE INDEX IF NOT EXISTS idx_subdomains_last_seen ON subdomains (last_seen);
+"""
+
+# Stores written before rows were keyed by (domain, name) had `name TEXT PRIMARY KEY`
+MIGRATE_NAME_KEY = """
+ALTER TABLE subdomains RENAME TO subdomains_by_name;
+DROP INDEX IF EXISTS idx_subdomains_domain_active;
+DROP INDEX IF EXISTS idx_subdomains_last_seen;
+{schema}
+INSERT INTO subdomains (name, domain, first_seen, last_seen, active)
+    SELECT name, domain, first_seen, last_seen, active FROM subdomains_by_name;
+DROP TABLE subdomains_by_name;
+"""
+
+
+class EnumerationDelta:
+    """What changed for one cycle."""
+
+    def __init__(self):
+        self.all = []
+        self.new = []
+        self.gone = []
+
+    def extend(self, names: list, new: list, gone: list):
+        self.all.extend(names)
+        self.new.extend(new)
+        self.gone.extend(gone)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.new or self.gone)
+
+
+class SubdomainStore:
+    """SQLite-backed subdomain index."""
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        keys = [row[1] for row in self.conn.execute("PRAGMA table_info(subdomains)") if row[5]]
+        if keys == ["name"]:
+            self.conn.executescript(MIGRATE_NAME_KEY.format(schema=SCHEMA))
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def active(self, domain: str = None) -> set:
+        if domain is None:
+            rows = self.conn.execute("SELECT name FROM subdomains WHERE active = 1")
+        else:
+            rows = self.conn.execute("SELECT name FROM subdomains WHERE domain = ? AND active = 1", (domain,))
+        return {r[0] for r in rows}
+
+    def _active_elsewhere(self, domain: str, names) -> set:
+        """Which of `names` another target still has active."""
+        names, found = list(names), set()
+        for i in range(0, len(names), 500):
+            chunk = names[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT name FROM subdomains WHERE active = 1 AND domain != ? "
+                f"AND name IN ({','.join('?' * len(chunk))})", [domain] + chunk)
+            found.update(r[0] for r in rows)
+        return found
+
+    def sync(self, domain: str, names, seen_at: float = None):
+        """
+        Record this cycle's names for `domain`.
+        Returns (new, gone): names no target had active before, and names
+        `domain` no longer sees that no other target has active either.
+        """
+        seen_at = seen_at or time.time()
+        names = set(names)
+        before = self.active(domain)
+        added, dropped = names - before, before - names
+        new = sorted(added - self._active_elsewhere(domain, added))
+        gone = sorted(dropped - self._active_elsewhere(domain, dropped))
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO subdomains (name, domain, first_seen, last_seen, active) VALUES (?, ?, ?, ?, 1) "
+                "ON CONFLICT(domain, name) DO UPDATE SET last_seen = excluded.last_seen, active = 1",
+                [(n, domain, seen_at, seen_at) for n in names],
+            )
+            self.conn.executemany("UPDATE subdomains SET active = 0 WHERE domain = ? AND name = ?",
+                                  [(domain, n) for n in dropped])
+        return new, gone
+
+    def get(self, name: str):
+        """The name's row — under the target that found it first when several share it."""
+        row = self.conn.execute(
+            "SELECT name, domain, first_seen, last_seen, active FROM subdomains WHERE name = ? "
+            "ORDER BY first_seen LIMIT 1", (name,)
+        ).fetchone()
+        if not row:
+            return None
+        return dict(zip(("name", "domain", "first_seen", "last_seen", "active"), row))
+
+    def seen_since(self, since: float) -> list:
+        rows = self.conn.execute("SELECT name FROM subdomains GROUP BY name HAVING MIN(first_seen) >= ? "
+                                 "ORDER BY MIN(first_seen)", (since,))
+        return [r[0] for r in rows]
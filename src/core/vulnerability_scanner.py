@@ -1,48 +1,165 @@
 """
 Digital Sentinel - Vulnerability Scanner
 ========================================
-Scans crawled data for potential vulnerabilities (simulated phase).
+Scans crawled pages for vulnerabilities with the rule set in
+data/signatures/ (core.signature_engine): every response the crawl
+recorded (crawl_responses.jsonl.gz, or the PageResults themselves when
+scanning alongside the crawl) is checked against every rule in one pass.
+A crawl from before responses were recorded falls back to the URLs in
+crawl_results.txt and their shared response cache entries; URL-only rules
+apply either way.
+
+run_vulnerability_scan() reads the finished crawl_results.txt;
+run_streaming_scan() scans URLs as the crawler produces them.
+
+Every finding is a core.findings.Finding, streamed to findings.jsonl for the
+later phases; scan_report.txt keeps the human-readable "[HIGH] ..." lines.
+When the scan ends the findings are merged into the cross-cycle findings
+store (core.findings_store), which decides what is new or changed.
 """
 
 import os
 import time
+import asyncio
 
-def run_vulnerability_scan():
-    """Main vulnerability scanning phase."""
-    print("🚀 [Phase 4: Vulnerability Scanner Started]")
+from crawler import load_targets
+from core.crawling_engine import ALIVE_HOSTS_FILE, RESPONSES_FILE, iter_crawl_responses, stream_crawl_pages
+from core.findings import NO_ISSUES, Finding, iter_findings
+from core.findings_store import FindingsStore
+from core.record_stream import RecordWriter
+from core.response_cache import shared_cache
+from core.signature_engine import shared_engine
 
-    input_dir = os.path.join("data", "cache", "crawled")
-    output_dir = os.path.join("data", "cache", "vulnerabilities")
-    os.makedirs(output_dir, exist_ok=True)
+INPUT_FILE = os.path.join("data", "cache", "crawled", "crawl_results.txt")
+OUTPUT_DIR = os.path.join("data", "cache", "vulnerabilities")
+OUTPUT_FILE = os.path.join(OUTPUT_DIR, "scan_report.txt")
+FINDINGS_FILE = os.path.join(OUTPUT_DIR, "findings.jsonl")
 
-    input_file = os.path.join(input_dir, "crawl_results.txt")
-    output_file = os.path.join(output_dir, "scan_report.txt")
 
-    if not os.path.exists(input_file):
-        print(f"⚠️ Crawling results not found at {input_file}")
-        return
+def scan_response(url: str, status: int = None, headers: dict = None, body: str = "", engine=None) -> list:
+    """One finding per signature rule the response matches; a single info finding when none does."""
+    engine = engine or shared_engine()
+    rules = engine.match(url, status, headers, body)
+    now = time.time()
+    if not rules:
+        return [Finding(url, "info", "", f"{NO_ISSUES} at {url}", found_at=now)]
+    return [Finding(url, rule.severity, rule.signature, rule.describe(url), found_at=now, extra={"rule": rule.id})
+            for rule in rules]
+
+
+def scan_url(url: str, response=None, engine=None, cache=None) -> list:
+    """
+    scan_response() for one crawled URL. `response` is anything with status,
+    headers and text (a crawler PageResult or a CachedResponse); without one
+    the URL's entry in `cache` (the shared response cache by default) is
+    used, and failing that the URL alone.
+    """
+    if response is None:
+        response = (cache or shared_cache()).lookup("GET", url)
+    if response is None:
+        return scan_response(url, engine=engine)
+    return scan_response(url, response.status, response.headers, response.text, engine)
 
-    print("🔍 Analyzing crawled pages for vulnerabilities...")
-    time.sleep(2)  # simulate scanning delay
 
-    # Simulated vulnerability detection
-    with open(input_file, "r") as f:
-        urls = [line.strip() for line in f.readlines()]
+class FindingSink:
+    """
+    Writes each finding's line to scan_report.txt and the finding to
+    findings.jsonl as it arrives — except "No issues found" placeholders,
+    which are only reported: they are not issues to store, validate or
+    export. On close the scan is merged into `store` (a FindingsStore, or
+    None to skip that).
+    """
 
+    def __init__(self, report_file: str = OUTPUT_FILE, findings_file: str = FINDINGS_FILE, store=None):
+        os.makedirs(os.path.dirname(report_file), exist_ok=True)
+        self.report = open(report_file, "w")
+        self.stream = RecordWriter(findings_file, append=False)
+        self.store = store
+        self.count = 0
+        self.issues = 0
+
+    def write(self, finding: Finding):
+        finding.id = self.count + 1
+        if not finding.clean:
+            self.stream.write(finding.to_row())
+            self.issues += 1
+        self.report.write(("\n" if self.count else "") + finding.as_report_line())
+        self.report.flush()
+        self.count += 1
+
+    def close(self):
+        self.stream.close()
+        self.report.close()
+        if self.store is not None:
+            new, changed = self.store.upsert(iter_findings(self.stream.path))
+            print(f"🗃️ Findings store: {len(new)} new, {len(changed)} changed of {self.issues} this scan")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+async def scan_stream(pages, output_file: str = OUTPUT_FILE, findings_file: str = FINDINGS_FILE,
+                      store=None) -> list:
+    """
+    Consume an async iterable of crawled pages (PageResults, or bare URLs),
+    appending each finding as it is produced.
+    """
     findings = []
-    for url in urls:
-        if "page1" in url:
-            findings.append(f"[HIGH] SQLi vulnerability suspected at {url}")
-        elif "page2" in url:
-            findings.append(f"[MEDIUM] XSS pattern detected at {url}")
-        else:
-            findings.append(f"[INFO] No issues found at {url}")
+    with FindingSink(output_file, findings_file, store) as sink:
+        async for page in pages:
+            for finding in (scan_url(page) if isinstance(page, str) else scan_url(page.url, page)):
+                sink.write(finding)
+                findings.append(finding)
+    return findings
+
+
+def run_streaming_scan(targets=None):
+    """Phases 3+4 overlapped: every crawled URL is scanned the moment it is found."""
+    print("🚀 [Phase 3+4: Streaming Crawl & Vulnerability Scan Started]")
+
+    targets = targets if targets is not None else load_targets(ALIVE_HOSTS_FILE)
+    if not targets:
+        print(f"⚠️ No alive hosts to crawl (looked in {ALIVE_HOSTS_FILE})")
+        return []
+
+    findings = asyncio.run(scan_stream(stream_crawl_pages(targets), store=FindingsStore()))
+    print(f"💾 {len(findings)} scan results saved to {OUTPUT_FILE}")
+    print("🔚 [Phase 3+4: Streaming Crawl & Vulnerability Scan Completed]")
+    return findings
+
+
+def run_vulnerability_scan():
+    """Main vulnerability scanning phase."""
+    print("🚀 [Phase 4: Vulnerability Scanner Started]")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    if not os.path.exists(INPUT_FILE):
+        print(f"⚠️ Crawling results not found at {INPUT_FILE}")
+        return
+
+    engine = shared_engine()
+    print(f"🔍 Analyzing crawled pages against {len(engine)} signature rules...")
 
     # Save scan report
-    with open(output_file, "w") as out:
-        out.write("\n".join(findings))
+    with FindingSink(store=FindingsStore()) as sink:
+        # The recorded responses belong to this crawl unless crawl_results.txt was rewritten after them
+        if os.path.exists(RESPONSES_FILE) and os.path.getmtime(RESPONSES_FILE) >= os.path.getmtime(INPUT_FILE):
+            for url, status, headers, body in iter_crawl_responses():
+                for finding in scan_response(url, status, headers, body, engine):
+                    sink.write(finding)
+        else:
+            cache = shared_cache()
+            with open(INPUT_FILE, "r") as f:
+                for url in (line.strip() for line in f):
+                    if url:
+                        for finding in scan_url(url, engine=engine, cache=cache):
+                            sink.write(finding)
 
-    print(f"💾 Vulnerability scan report saved to {output_file}")
+    print(f"💾 Vulnerability scan report saved to {OUTPUT_FILE}")
     print("🔚 [Phase 4: Vulnerability Scanner Completed]")
 
 
@@ -0,0 +1,25 @@
+"""
+Digital Sentinel - Crawler
+==========================
+Single crawl engine behind every crawling entry point.
+"""
+
+from crawler.engine import CrawlConfig, CrawlEngine, PageResult, DomainSummary, run_crawl
+from crawler.extractors import get_extractor
+from crawler.frontier import normalize_url
+from crawler.recrawl import ExtractionMemo
+from crawler.reports import load_targets, write_domain_report, write_summary
+
+__all__ = [
+    "CrawlConfig",
+    "CrawlEngine",
+    "PageResult",
+    "DomainSummary",
+    "run_crawl",
+    "get_extractor",
+    "normalize_url",
+    "ExtractionMemo",
+    "load_targets",
+    "write_domain_report",
+    "write_summary",
+]
@@ -0,0 +1,315 @@
+"""
+Digital Sentinel - Crawl Engine
+===============================
+One breadth-first crawler for every phase that needs pages.
+
+CrawlEngine.crawl() is an async generator: it yields a PageResult as each
+page finishes (carrying only the links and scripts that page added) and a
+DomainSummary once a domain has nothing left in flight. Targets may be a
+list or an async iterable, so a crawl can start before enumeration or
+probing has finished producing hosts.
+
+With recrawl=True every page is revalidated through the response cache and
+pages whose body has not changed reuse their previous extraction (see
+crawler.recrawl) instead of being parsed again.
+
+Given a core.rate_limiter.RateLimiter, every request waits for its host's
+turn and a slot of the global budget; throttled pages are retried.
+"""
+
+import asyncio
+import aiohttp
+from contextlib import nullcontext
+from urllib.parse import urlparse
+
+from crawler.extractors import get_extractor
+from crawler.frontier import DomainState, target_to_url
+from crawler.recrawl import ExtractionMemo
+from core import response_cache
+
+# 🧠 Base headers for all HTTP requests
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; DigitalSentinelBot/15.0; +https://github.com/hamamadhii3)"
+}
+
+TIMEOUT = 10             # seconds
+VERIFY_SSL = False       # disable SSL verification errors safely
+MAX_DEPTH = 2            # link hops away from the landing page
+MAX_PAGES = 200          # pages fetched per domain
+CONCURRENCY = 50         # pages in flight across all domains
+PER_HOST_LIMIT = 4       # pages in flight per host
+RESULT_BUFFER = 1000     # finished results waiting for the consumer
+
+_DONE = object()
+
+
+class CrawlConfig:
+    """Tunables for one crawl."""
+
+    def __init__(self, max_depth: int = MAX_DEPTH, max_pages: int = MAX_PAGES,
+                 concurrency: int = CONCURRENCY, per_host: int = PER_HOST_LIMIT,
+                 timeout: int = TIMEOUT, verify_ssl: bool = VERIFY_SSL, headers: dict = None,
+                 extractor: str = "auto", result_buffer: int = RESULT_BUFFER, cache=None,
+                 recrawl: bool = False, memo: ExtractionMemo = None, limiter=None, error_pages: bool = False):
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self.headers = headers or HEADERS
+        self.extractor = extractor
+        self.result_buffer = result_buffer
+        self.cache = cache  # optional core.response_cache.ResponseCache
+        self.limiter = limiter  # optional core.rate_limiter.RateLimiter
+        self.recrawl = recrawl
+        self.memo = memo
+        self.error_pages = error_pages  # treat 4xx/5xx responses as pages rather than failures
+        if recrawl:
+            self.cache = cache or response_cache.shared_cache()
+            self.memo = memo or ExtractionMemo()
+
+
+class HTTPStatusError(Exception):
+    """A page answered with an error status; the response is kept so it can still be scanned."""
+
+    def __init__(self, status: int, headers: dict, body):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class PageResult:
+    """
+    One fetched (or failed) page and what it newly contributed to its domain.
+    `headers` and `body` hold the response — also for pages that failed
+    with an HTTP error status; `body` is the page text, or the
+    CachedResponse it came from (decoded on demand by `text`).
+    """
+
+    __slots__ = ("url", "domain", "depth", "status", "links", "scripts", "forms", "js_urls", "error",
+                 "headers", "body")
+
+    def __init__(self, url: str, domain: str, depth: int, status: int = None, links=(), scripts=(),
+                 forms=(), js_urls=(), error: str = None, headers: dict = None, body=None):
+        self.url = url
+        self.domain = domain
+        self.depth = depth
+        self.status = status
+        self.links = links
+        self.scripts = scripts
+        self.forms = forms
+        self.js_urls = js_urls
+        self.error = error
+        self.headers = headers
+        self.body = body
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def answered(self) -> bool:
+        """The server sent a response (successful or an HTTP error), so there is something to scan."""
+        return self.status is not None
+
+    @property
+    def text(self) -> str:
+        if self.body is None or isinstance(self.body, str):
+            return self.body or ""
+        return self.body.text
+
+
+class DomainSummary:
+    """Emitted once per domain when its last page is done."""
+
+    __slots__ = ("domain", "root", "links", "scripts", "pages", "failed")
+
+    def __init__(self, state: DomainState):
+        self.domain = state.domain
+        self.root = state.root
+        self.links = state.links
+        self.scripts = state.js_files
+        self.pages = state.pages
+        self.failed = state.failed
+
+    def as_dict(self) -> dict:
+        return {"domain": self.domain, "links": len(self.links), "scripts": len(self.scripts), "pages": self.pages}
+
+
+class CrawlEngine:
+    """Breadth-first crawl over an asyncio frontier queue."""
+
+    def __init__(self, config: CrawlConfig = None):
+        self.config = config or CrawlConfig()
+        self.extractor = get_extractor(self.config.extractor)
+        self.frontier = None
+        self.results = None
+        self.host_slots = {}
+        self.domains = {}
+        self.pages_fetched = 0
+        self.memo = self.config.memo
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self.host_slots:
+            self.host_slots[host] = asyncio.Semaphore(self.config.per_host)
+        return self.host_slots[host]
+
+    def _enqueue(self, state: DomainState, url: str, depth: int):
+        state.in_flight += 1
+        self.frontier.put_nowait((state, url, depth))
+
+    def seed(self, target: str):
+        url = target_to_url(target)
+        domain = urlparse(url).netloc or target
+        if domain in self.domains:
+            return
+        state = DomainState(domain, url)
+        self.domains[domain] = state
+        self._enqueue(state, url, 0)
+
+    async def _feed(self, targets):
+        try:
+            if hasattr(targets, "__aiter__"):
+                async for t in targets:
+                    self.seed(t)
+            else:
+                for t in targets:
+                    self.seed(t)
+            await self.frontier.join()
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            # `targets` raised: still end the result stream, so crawl() stops waiting and re-raises this
+            await self.results.put(_DONE)
+            raise
+        await self.results.put(_DONE)
+
+    async def _fetch(self, session: aiohttp.ClientSession, url: str):
+        limiter = self.config.limiter
+        async with self._host_slot(url):
+            if self.config.cache is not None:
+                resp = await response_cache.fetch_cached(session, self.config.cache, url,
+                                                         revalidate=self.config.recrawl, limiter=limiter,
+                                                         ssl=self.config.verify_ssl)
+                if resp.status >= 400 and not self.config.error_pages:
+                    raise HTTPStatusError(resp.status, resp.headers, resp)
+                return resp.status, resp.headers, resp
+            attempt = 0
+            while True:
+                async with limiter.slot(url) if limiter else nullcontext():
+                    async with session.get(url, ssl=self.config.verify_ssl) as r:
+                        if limiter is not None:
+                            limiter.feedback(url, r.status, r.headers)
+                            if limiter.should_retry(r.status, attempt):
+                                attempt += 1
+                                continue
+                        headers, text = dict(r.headers), await r.text(errors="replace")
+                        if r.status >= 400 and not self.config.error_pages:
+                            raise HTTPStatusError(r.status, headers, text)
+                        return r.status, headers, text
+
+    def _extract(self, url: str, body):
+        """Parse a fetched body — or, in recrawl mode, reuse the extraction of an unchanged one."""
+        if isinstance(body, str):
+            return self.extractor.extract(body, url)
+        if self.memo is None:
+            return self.extractor.extract(body.text, url)
+        page = self.memo.get(url, body.body_hash)
+        if page is not None:
+            self.memo.stats.skipped += 1
+            return page
+        page = self.extractor.extract(body.text, url)
+        self.memo.put(url, body.body_hash, page)
+        self.memo.stats.parsed += 1
+        return page
+
+    async def _crawl_page(self, session: aiohttp.ClientSession, state: DomainState, url: str, depth: int):
+        try:
+            status, headers, body = await self._fetch(session, url)
+        except HTTPStatusError as e:
+            result = self._failed(state, url, depth, f"HTTP {e.status} on {url}")
+            result.status, result.headers, result.body = e.status, e.headers, e.body
+            return result
+        except aiohttp.ClientSSLError:
+            return self._failed(state, url, depth, f"SSL verification failed for {url} (ignored)")
+        except aiohttp.ClientConnectorError as ce:
+            return self._failed(state, url, depth, f"DNS/Connection error: {url} → {ce}")
+        except asyncio.TimeoutError:
+            return self._failed(state, url, depth, f"Timeout: {url} > {self.config.timeout}s")
+        except Exception as e:
+            return self._failed(state, url, depth, f"Unknown error on {url}: {e}")
+
+        page = self._extract(url, body)
+        links = {href for href in page.links if state.domain in href} - state.links
+        scripts = page.scripts - state.js_files
+        state.links |= links
+        state.js_files |= scripts
+        state.pages += 1
+        self.pages_fetched += 1
+
+        if depth < self.config.max_depth:
+            for link in links:
+                if urlparse(link).netloc == state.domain and state.admit(link, self.config.max_pages):
+                    self._enqueue(state, link, depth + 1)
+
+        return PageResult(url, state.domain, depth, status, links, scripts, page.forms, page.js_urls,
+                          headers=headers, body=body)
+
+    def _failed(self, state: DomainState, url: str, depth: int, message: str) -> PageResult:
+        if depth == 0:
+            state.failed = True
+        return PageResult(url, state.domain, depth, error=message)
+
+    async def _worker(self, session: aiohttp.ClientSession):
+        while True:
+            state, url, depth = await self.frontier.get()
+            try:
+                try:
+                    result = await self._crawl_page(session, state, url, depth)
+                except Exception as e:
+                    result = self._failed(state, url, depth, f"Unknown error on {url}: {e}")
+                await self.results.put(result)
+            finally:
+                state.in_flight -= 1
+                if state.in_flight == 0:
+                    await self.results.put(DomainSummary(state))
+                self.frontier.task_done()
+
+    async def crawl(self, targets):
+        """Yield PageResult / DomainSummary objects as the crawl progresses."""
+        self.frontier = asyncio.Queue()
+        self.results = asyncio.Queue(maxsize=self.config.result_buffer)
+
+        connector = aiohttp.TCPConnector(limit=self.config.concurrency, limit_per_host=self.config.per_host)
+        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+        async with aiohttp.ClientSession(headers=self.config.headers, connector=connector,
+                                         timeout=timeout) as session:
+            workers = [asyncio.create_task(self._worker(session)) for _ in range(self.config.concurrency)]
+            feeder = asyncio.create_task(self._feed(targets))
+            try:
+                while True:
+                    item = await self.results.get()
+                    if item is _DONE:
+                        break
+                    yield item
+                await feeder  # re-raises what broke the target feed
+            finally:
+                for task in workers + [feeder]:
+                    task.cancel()
+                await asyncio.gather(*workers, feeder, return_exceptions=True)
+
+
+def run_crawl(targets, config: CrawlConfig = None, on_result=None) -> CrawlEngine:
+    """Blocking helper: drain a crawl, handing every result to `on_result`."""
+    engine = CrawlEngine(config)
+
+    async def _drain():
+        async for result in engine.crawl(targets):
+            if on_result:
+                on_result(result)
+
+    asyncio.run(_drain())
+    return engine
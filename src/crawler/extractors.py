@@ -0,0 +1,217 @@
+"""
+Digital Sentinel - Link Extractors
+==================================
+Pulls links, script sources, forms and URLs referenced from inline JS out of
+an HTML page without building a DOM.
+
+  • StreamingExtractor — html.parser.HTMLParser callbacks (stdlib, always available)
+  • LxmlExtractor      — lxml's C parser with a target object (used when lxml is installed)
+  • SoupExtractor      — BeautifulSoup reference implementation, kept for parity checks
+
+get_extractor("auto") picks the fastest one that is installed.
+"""
+
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional
+    etree = None
+
+# Quoted absolute URLs or root-relative paths inside <script> bodies
+INLINE_JS_URL = re.compile(r"""["'`]((?:https?:)?//[^"'`\s<>]+|/[A-Za-z0-9_\-./?=&%~+:@!$,;]*)["'`]""")
+FORM_FIELDS = ("input", "textarea", "select", "button")
+
+
+class ExtractedPage:
+    """Everything the crawler needs from one page."""
+
+    __slots__ = ("links", "scripts", "forms", "js_urls")
+
+    def __init__(self):
+        self.links = set()
+        self.scripts = set()
+        self.forms = []
+        self.js_urls = set()
+
+    def as_dict(self) -> dict:
+        return {
+            "links": sorted(self.links),
+            "scripts": sorted(self.scripts),
+            "forms": self.forms,
+            "js_urls": sorted(self.js_urls),
+        }
+
+
+class _Collector:
+    """Tag/data callbacks shared by the streaming and lxml extractors."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.page = ExtractedPage()
+        self._form = None
+        self._script = None
+
+    def start(self, tag: str, attrs: dict):
+        if tag == "a":
+            href = attrs.get("href")
+            if href is not None:
+                self.page.links.add(urljoin(self.base_url, href))
+        elif tag == "script":
+            src = attrs.get("src")
+            if src is not None:
+                self.page.scripts.add(urljoin(self.base_url, src))
+            else:
+                self._script = []
+        elif tag == "form":
+            self._form = {
+                "action": urljoin(self.base_url, attrs.get("action") or ""),
+                "method": (attrs.get("method") or "get").lower(),
+                "inputs": [],
+            }
+            self.page.forms.append(self._form)
+        elif tag in FORM_FIELDS and self._form is not None:
+            name = attrs.get("name")
+            if name:
+                self._form["inputs"].append(name)
+
+    def end(self, tag: str):
+        if tag == "script" and self._script is not None:
+            self._scan_inline_js("".join(self._script))
+            self._script = None
+        elif tag == "form":
+            self._form = None
+
+    def data(self, text: str):
+        if self._script is not None:
+            self._script.append(text)
+
+    def _scan_inline_js(self, code: str):
+        for match in INLINE_JS_URL.finditer(code):
+            self.page.js_urls.add(urljoin(self.base_url, match.group(1)))
+
+
+class LinkExtractor:
+    """Extractor interface: one page of HTML in, one ExtractedPage out."""
+
+    name = "base"
+
+    def extract(self, html: str, base_url: str) -> ExtractedPage:
+        return self.extract_chunks([html], base_url)
+
+    def extract_chunks(self, chunks, base_url: str) -> ExtractedPage:
+        """Parse a body that arrives in pieces (e.g. straight off the socket)."""
+        return self.extract("".join(chunks), base_url)
+
+
+class _StreamingParser(HTMLParser):
+    def __init__(self, collector: _Collector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, {k: (v if v is not None else "") for k, v in attrs})
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        self.collector.end(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+class StreamingExtractor(LinkExtractor):
+    """Tokenizer callbacks only — no tree is ever built."""
+
+    name = "streaming"
+
+    def extract_chunks(self, chunks, base_url: str) -> ExtractedPage:
+        collector = _Collector(base_url)
+        parser = _StreamingParser(collector)
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+        collector.end("script")
+        return collector.page
+
+
+class _LxmlTarget:
+    def __init__(self, collector: _Collector):
+        self.collector = collector
+
+    def start(self, tag, attrib):
+        self.collector.start(tag, attrib)
+
+    def end(self, tag):
+        self.collector.end(tag)
+
+    def data(self, text):
+        self.collector.data(text)
+
+    def close(self):
+        return self.collector.page
+
+
+class LxmlExtractor(LinkExtractor):
+    """lxml's libxml2 HTML tokenizer feeding the same callbacks."""
+
+    name = "lxml"
+
+    def extract_chunks(self, chunks, base_url: str) -> ExtractedPage:
+        collector = _Collector(base_url)
+        parser = etree.HTMLParser(target=_LxmlTarget(collector))
+        fed = False
+        for chunk in chunks:
+            if chunk:
+                parser.feed(chunk)
+                fed = True
+        if not fed:
+            return collector.page
+        return parser.close()
+
+
+class SoupExtractor(LinkExtractor):
+    """The original BeautifulSoup approach — builds the full tree."""
+
+    name = "soup"
+
+    def extract(self, html: str, base_url: str) -> ExtractedPage:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "html.parser")
+        page = ExtractedPage()
+        page.links = {urljoin(base_url, a["href"]) for a in soup.find_all("a", href=True)}
+        page.scripts = {urljoin(base_url, s["src"]) for s in soup.find_all("script", src=True)}
+        for form in soup.find_all("form"):
+            page.forms.append({
+                "action": urljoin(base_url, form.get("action") or ""),
+                "method": (form.get("method") or "get").lower(),
+                "inputs": [f["name"] for f in form.find_all(FORM_FIELDS) if f.get("name")],
+            })
+        for s in soup.find_all("script", src=False):
+            for match in INLINE_JS_URL.finditer(s.string or ""):
+                page.js_urls.add(urljoin(base_url, match.group(1)))
+        return page
+
+
+EXTRACTORS = {
+    StreamingExtractor.name: StreamingExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+    SoupExtractor.name: SoupExtractor,
+}
+
+
+def get_extractor(name: str = "auto") -> LinkExtractor:
+    """Return an extractor by name; "auto" prefers lxml, then the stdlib tokenizer."""
+    if name == "auto":
+        name = "lxml" if etree is not None else "streaming"
+    if name == "lxml" and etree is None:
+        raise ValueError("lxml extractor requested but lxml is not installed")
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown extractor: {name}")
+    return EXTRACTORS[name]()
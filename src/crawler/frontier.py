@@ -0,0 +1,49 @@
+"""
+Digital Sentinel - Crawl Frontier
+=================================
+URL normalisation and per-domain bookkeeping for the crawl engine.
+"""
+
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used for dedup: lowercase scheme/host, no default port, no fragment, sorted query."""
+    parts = urlparse(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunparse((scheme, host, parts.path or "/", "", query, ""))
+
+
+def target_to_url(target: str) -> str:
+    """Bare hostnames are crawled over HTTPS."""
+    return f"https://{target}" if not target.startswith("http") else target
+
+
+class DomainState:
+    """Per-domain crawl bookkeeping: what was seen, found and is still in flight."""
+
+    def __init__(self, domain: str, root: str):
+        self.domain = domain
+        self.root = root
+        self.seen = {normalize_url(root)}
+        self.links = set()
+        self.js_files = set()
+        self.pages = 0
+        self.in_flight = 0
+        self.failed = False
+
+    def admit(self, url: str, max_pages: int) -> bool:
+        """True if `url` is new for this domain and still fits the page budget."""
+        if len(self.seen) >= max_pages:
+            return False
+        key = normalize_url(url)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        return True
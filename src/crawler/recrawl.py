@@ -0,0 +1,95 @@
+"""
+Digital Sentinel - Recrawl Memo
+===============================
+Remembers what was extracted from each page so an unchanged page never has
+to be parsed twice.
+
+The HTTP response cache already keeps every page's ETag / Last-Modified and
+the sha256 of its body. In recrawl mode the engine revalidates each page with
+a conditional GET; when the server answers 304, or sends back a body whose
+hash matches the one recorded here, the stored links / scripts / forms are
+reused instead of running the extractor again.
+
+Entries are keyed per URL (relative links resolve against the page URL, so
+the same body on two URLs can extract differently) and live in
+data/cache/crawled/extractions.db.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from crawler.extractors import ExtractedPage
+from crawler.frontier import normalize_url
+
+MEMO_FILE = os.path.join("data", "cache", "crawled", "extractions.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS extractions (
+    url        TEXT PRIMARY KEY,
+    body_hash  TEXT NOT NULL,
+    page       TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class RecrawlStats:
+    def __init__(self):
+        self.parsed = 0
+        self.skipped = 0
+
+    def snapshot(self) -> dict:
+        return {"parsed": self.parsed, "skipped": self.skipped}
+
+    @property
+    def skip_rate(self) -> float:
+        total = self.parsed + self.skipped
+        return self.skipped / total if total else 0.0
+
+
+class ExtractionMemo:
+    """url → (body hash, ExtractedPage) in SQLite."""
+
+    def __init__(self, path: str = MEMO_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.stats = RecrawlStats()
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, url: str, body_hash: str):
+        """The page extracted last time, if the body has not changed since."""
+        with self.lock:
+            row = self.conn.execute("SELECT body_hash, page FROM extractions WHERE url = ?",
+                                    (normalize_url(url),)).fetchone()
+        if not row or row[0] != body_hash:
+            return None
+        data = json.loads(row[1])
+        page = ExtractedPage()
+        page.links = set(data["links"])
+        page.scripts = set(data["scripts"])
+        page.forms = data["forms"]
+        page.js_urls = set(data["js_urls"])
+        return page
+
+    def put(self, url: str, body_hash: str, page: ExtractedPage):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO extractions (url, body_hash, page, updated_at) VALUES (?, ?, ?, ?)",
+                (normalize_url(url), body_hash, json.dumps(page.as_dict(), separators=(",", ":")), time.time()))
+            self.conn.commit()
+
+    def report(self, label: str = "recrawl") -> dict:
+        snap = self.stats.snapshot()
+        print(f"♻️ [{label}] {snap['skipped']} unchanged pages reused, {snap['parsed']} re-parsed "
+              f"({self.stats.skip_rate:.1%} skipped)")
+        return snap
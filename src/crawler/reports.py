@@ -0,0 +1,63 @@
+"""
+Digital Sentinel - Crawl Reports
+================================
+Writers for the per-domain {domain}.txt reports and summary.txt, shared by
+the crawler entry points so their on-disk formats stay the same.
+"""
+
+import os
+
+
+def load_targets(targets_input):
+    """Accept a list of targets or a path to a targets file; None if neither."""
+    if isinstance(targets_input, list):
+        return targets_input
+    if isinstance(targets_input, str) and os.path.exists(targets_input):
+        with open(targets_input, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+    return None
+
+
+def write_domain_report(output_dir: str, summary, layout: str = "standard") -> str:
+    """
+    layout="standard" — counts header, [Internal Links] / [JavaScript Files]
+    layout="compact"  — the older [Links] / [JS Files] report
+    """
+    out_file = os.path.join(output_dir, f"{summary.domain}.txt")
+    with open(out_file, "w", encoding="utf-8") as f:
+        if layout == "compact":
+            f.write(f"# Report for {summary.domain}\n\n[Links]\n")
+            for l in summary.links:
+                f.write(l + "\n")
+            f.write("\n[JS Files]\n")
+            for j in summary.scripts:
+                f.write(j + "\n")
+        else:
+            f.write(f"# Report for {summary.domain}\n")
+            f.write(f"# Links: {len(summary.links)} | JS Files: {len(summary.scripts)}\n\n")
+            f.write("[Internal Links]\n")
+            for l in summary.links:
+                f.write(l + "\n")
+            f.write("\n[JavaScript Files]\n")
+            for j in summary.scripts:
+                f.write(j + "\n")
+    return out_file
+
+
+def write_summary(output_dir: str, total: int, successful: int, unreachable: list, recrawl: dict = None) -> str:
+    """`recrawl` (parsed/skipped counts) adds a [Recrawl] section when the crawl ran in recrawl mode."""
+    summary_file = os.path.join(output_dir, "summary.txt")
+    with open(summary_file, "w", encoding="utf-8") as s:
+        s.write("# Digital Sentinel Crawl Summary\n")
+        s.write(f"Total targets: {total}\n")
+        s.write(f"Successful: {successful}\n")
+        s.write(f"Failed: {len(unreachable)}\n\n")
+        if recrawl:
+            s.write("[Recrawl]\n")
+            s.write(f"Re-parsed: {recrawl['parsed']}\n")
+            s.write(f"Skipped (unchanged): {recrawl['skipped']}\n\n")
+        if unreachable:
+            s.write("[Unreachable Targets]\n")
+            for u in unreachable:
+                s.write(u + "\n")
+    return summary_file
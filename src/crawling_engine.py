@@ -3,111 +3,87 @@
 """
 crawling_engine.py
 ------------------
-Stable version with:
+Entry point for the concurrent breadth-first crawler (see the crawler package):
+  • Async frontier queue shared by a pool of workers
+  • Per-host concurrency limits
+  • Configurable depth and page budget per domain
+  • URL normalisation + dedup so every page is fetched once
   • SSL verification bypass option
-  • DNS resolution resilience
   • Timeout handling
   • Smart logging for unreachable targets
+  • Recrawl mode: conditional GETs, unchanged pages are not parsed again
+
+Each domain report is written as soon as that domain's crawl finishes and
+every fetched page is appended to pages.txt as it completes.
 """
 
 import os
-import requests
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+import time
 
-# 🧠 Base headers for all HTTP requests
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (compatible; DigitalSentinelBot/15.0; +https://github.com/hamamadhii3)"
-}
+from crawler import CrawlConfig, DomainSummary, run_crawl, load_targets, write_domain_report, write_summary
+from crawler.engine import MAX_DEPTH, MAX_PAGES, CONCURRENCY, PER_HOST_LIMIT
+from core.response_cache import shared_cache
+from core.rate_limiter import shared_limiter
 
 CRAWL_RESULTS_DIR = os.path.join("data", "results", "crawling_reports")
-TIMEOUT = 10  # seconds
-VERIFY_SSL = False  # disable SSL verification errors safely
 
 
-def run_crawling(targets_input):
+def run_crawling(targets_input, max_depth: int = MAX_DEPTH, max_pages: int = MAX_PAGES,
+                 concurrency: int = CONCURRENCY, per_host: int = PER_HOST_LIMIT, use_cache: bool = False,
+                 recrawl: bool = False):
     """
     Crawl list of targets or path to file.
     Returns list of dict results with domain/link/script stats.
+    `use_cache` serves pages from the shared HTTP response cache when possible.
+    `recrawl` revalidates every page and skips parsing the ones that have not changed.
     """
     os.makedirs(CRAWL_RESULTS_DIR, exist_ok=True)
 
-    # Detect type of input
-    if isinstance(targets_input, list):
-        targets = targets_input
-    elif isinstance(targets_input, str) and os.path.exists(targets_input):
-        with open(targets_input, "r", encoding="utf-8") as f:
-            targets = [line.strip() for line in f if line.strip()]
-    else:
+    targets = load_targets(targets_input)
+    if targets is None:
         print(f"⚠️ [Crawler] Invalid input provided: {type(targets_input)}")
         return []
 
-    print(f"🕷️ [Crawler] Starting crawl for {len(targets)} targets...")
+    print(f"🕷️ [Crawler] Starting crawl for {len(targets)} targets "
+          f"(depth={max_depth}, pages/domain={max_pages}, concurrency={concurrency})...")
     results = []
     unreachable = []
-
-    for t in targets:
-        url = f"https://{t}" if not t.startswith("http") else t
-        domain = urlparse(url).netloc or t
-        out_file = os.path.join(CRAWL_RESULTS_DIR, f"{domain}.txt")
-
-        try:
-            print(f"🌐 Crawling {url} ...")
-            r = requests.get(url, headers=HEADERS, timeout=TIMEOUT, verify=VERIFY_SSL)
-            r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
-
-            links = set()
-            js_files = set()
-
-            for a in soup.find_all("a", href=True):
-                href = urljoin(url, a["href"])
-                if domain in href:
-                    links.add(href)
-
-            for s in soup.find_all("script", src=True):
-                js_files.add(urljoin(url, s["src"]))
-
-            with open(out_file, "w", encoding="utf-8") as f:
-                f.write(f"# Report for {domain}\n")
-                f.write(f"# Links: {len(links)} | JS Files: {len(js_files)}\n\n")
-                f.write("[Internal Links]\n")
-                for l in links:
-                    f.write(l + "\n")
-                f.write("\n[JavaScript Files]\n")
-                for j in js_files:
-                    f.write(j + "\n")
-
-            print(f"✅ [Crawler] {domain} → {len(links)} links, {len(js_files)} JS files")
-            results.append({"domain": domain, "links": len(links), "scripts": len(js_files)})
-
-        except requests.exceptions.SSLError:
-            print(f"⚠️ [Crawler] SSL verification failed for {url} (ignored)")
-            unreachable.append(url)
-        except requests.exceptions.ConnectionError as ce:
-            print(f"⚠️ [Crawler] DNS/Connection error: {url} → {ce}")
-            unreachable.append(url)
-        except requests.exceptions.Timeout:
-            print(f"⚠️ [Crawler] Timeout: {url} > {TIMEOUT}s")
-            unreachable.append(url)
-        except Exception as e:
-            print(f"⚠️ [Crawler] Unknown error on {url}: {e}")
-            unreachable.append(url)
+    pages_log = open(os.path.join(CRAWL_RESULTS_DIR, "pages.txt"), "w", encoding="utf-8")
+
+    def on_result(item):
+        if isinstance(item, DomainSummary):
+            if item.failed:
+                unreachable.append(item.root)
+                return
+            write_domain_report(CRAWL_RESULTS_DIR, item)
+            print(f"✅ [Crawler] {item.domain} → {len(item.links)} links, {len(item.scripts)} JS files "
+                  f"({item.pages} pages)")
+            results.append(item.as_dict())
+        elif item.ok:
+            pages_log.write(f"{item.depth}\t{len(item.links)}\t{len(item.scripts)}\t{item.url}\n")
+            pages_log.flush()
+        else:
+            print(f"⚠️ [Crawler] {item.error}")
+
+    config = CrawlConfig(max_depth=max_depth, max_pages=max_pages, concurrency=concurrency, per_host=per_host,
+                         cache=shared_cache() if use_cache or recrawl else None, recrawl=recrawl,
+                         limiter=shared_limiter())
+    start = time.perf_counter()
+    try:
+        engine = run_crawl(targets, config, on_result)
+    finally:
+        pages_log.close()
+    elapsed = time.perf_counter() - start
 
     # Save summary
-    summary_file = os.path.join(CRAWL_RESULTS_DIR, "summary.txt")
-    with open(summary_file, "w", encoding="utf-8") as s:
-        s.write("# Digital Sentinel Crawl Summary\n")
-        s.write(f"Total targets: {len(targets)}\n")
-        s.write(f"Successful: {len(results)}\n")
-        s.write(f"Failed: {len(unreachable)}\n\n")
-        if unreachable:
-            s.write("[Unreachable Targets]\n")
-            for u in unreachable:
-                s.write(u + "\n")
+    recrawl_stats = engine.memo.stats.snapshot() if engine.memo else None
+    write_summary(CRAWL_RESULTS_DIR, len(targets), len(results), unreachable, recrawl_stats)
 
     print("🧩 Crawling complete.")
     print(f"✅ Success: {len(results)} | ⚠️ Failed: {len(unreachable)}")
+    print(f"⏱ {engine.pages_fetched} pages in {elapsed:.2f}s → {engine.pages_fetched / max(elapsed, 1e-9):.1f} pages/sec")
+    if engine.memo:
+        engine.memo.report("Crawler")
     return results
 
 
@@ -2,12 +2,13 @@
 # -*- coding: utf-8 -*-
 """
 Digital Sentinel Discord Reporter vInfinity
-Sends final AI-analyzed vulnerability reports to Discord channels.
+Sends final AI-analyzed vulnerability reports to Discord channels
+(queued through core.notifier, which batches, paces and retries delivery).
 """
 
 import os
-import json
-import requests
+
+from core.notifier import shared_notifier
 
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "").strip()
 
@@ -24,23 +25,17 @@ def send_discord_report(report_path, summary=None):
         print(f"❌ Failed to open report file: {e}")
         return
 
-    payload = {
-        "username": "🛡️ Digital Sentinel",
-        "content": f"📡 **New Quantum Scan Report Uploaded**\nSummary:\n{summary or 'No summary provided.'}",
-        "embeds": [
+    queued = shared_notifier().notify(
+        username="🛡️ Digital Sentinel",
+        content=f"📡 **New Quantum Scan Report Uploaded**\nSummary:\n{summary or 'No summary provided.'}",
+        embeds=[
             {
                 "title": "Scan Report",
                 "description": f"```json\n{report_data[:1500]}\n```",
                 "color": 3447003
             }
-        ]
-    }
-
-    try:
-        response = requests.post(DISCORD_WEBHOOK_URL, json=payload)
-        if response.status_code == 204:
-            print("✅ Discord report sent successfully.")
-        else:
-            print(f"⚠️ Discord send failed — HTTP {response.status_code}")
-    except Exception as e:
-        print(f"💥 Discord reporting error: {e}")
+        ],
+        webhook_url=DISCORD_WEBHOOK_URL,
+    )
+    if queued:
+        print("📨 Discord report queued for delivery.")
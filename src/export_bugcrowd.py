@@ -1,35 +1,51 @@
-import json
 from datetime import datetime
 import os
 
+from core.findings import Finding
+from core.record_stream import RecordWriter, iter_records, materialize_json
+
+EXPORT_CHANNEL = "bugcrowd_submission"
+
+
 class BugcrowdExporter:
-    def __init__(self, validated_path):
+    def __init__(self, validated_path, store=None):
         self.validated_path = validated_path
+        self.store = store  # optional core.findings_store.FindingsStore
 
     def generate_submission(self, issue):
+        finding = issue if isinstance(issue, Finding) else Finding.from_dict(issue)
         template = {
-            "summary_title": f"{issue.get('signature', '').upper()} vulnerability on {issue.get('url', 'unknown')}",
-            "target": issue.get("url", "unknown"),
-            "vrt_category": issue.get("signature", "General Vulnerability"),
-            "vulnerability_type": issue.get("signature", "General"),
-            "url": issue.get("url", "N/A"),
-            "description": f"{issue.get('signature', '').upper()} vulnerability detected and validated.\n"
+            "summary_title": f"{finding.signature.upper()} vulnerability on {finding.url or 'unknown'}",
+            "target": finding.url or "unknown",
+            "vrt_category": finding.signature or "General Vulnerability",
+            "vulnerability_type": finding.signature or "General",
+            "url": finding.url or "N/A",
+            "description": f"{finding.signature.upper()} vulnerability detected and validated.\n"
                            f"Payload confirmed active. See attached report.\n\n"
-                           f"Validation timestamp: {issue.get('validated_timestamp', 'N/A')}",
+                           f"Validation timestamp: {finding.validated_timestamp or 'N/A'}",
             "attachments": [os.path.basename(self.validated_path)]
         }
         return template
 
-    def export_all(self):
-        with open(self.validated_path, "r") as f:
-            validated_data = json.load(f)
+    def _validated(self):
+        """Validated findings to submit: from the store only the ones not yet submitted in this form."""
+        if self.store is not None:
+            return self.store.pending_export(EXPORT_CHANNEL, validated_only=True)
+        return (finding for finding in map(Finding.from_dict, iter_records(self.validated_path))
+                if finding.validated)
 
-        submissions = [self.generate_submission(i) for i in validated_data if i.get("validated")]
+    def export_all(self):
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         output_path = f"data/results/bugcrowd_exports/export_{timestamp}.json"
+        stream_path = f"data/results/bugcrowd_exports/export_{timestamp}.jsonl"
 
-        with open(output_path, "w") as f:
-            json.dump(submissions, f, indent=2)
+        findings = self._validated()
+        with RecordWriter(stream_path, append=False) as out:
+            for finding in findings:
+                out.write(self.generate_submission(finding))
+        materialize_json(stream_path, output_path, indent=2)
+        if self.store is not None:
+            self.store.mark_exported(findings, EXPORT_CHANNEL)
 
         print(f"📦 Bugcrowd export created → {output_path}")
         return output_path
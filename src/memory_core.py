@@ -1,15 +1,24 @@
-import json, os
+import os
+
+from core.memory_store import MemoryStore
+
+LEARNING_PATH = os.path.join("data", "memory", "learning")
+LEGACY_LEARNING_FILE = os.path.join("data", "memory", "learning.json")
+
+_learning = None
+
+
+def learning_memory() -> MemoryStore:
+    """Signature → times seen, kept across cycles (migrated from learning.json on first use)."""
+    global _learning
+    if _learning is None:
+        _learning = MemoryStore(LEARNING_PATH)
+        _learning.import_json(LEGACY_LEARNING_FILE)
+    return _learning
+
 
 def evolve_learning(data):
-    os.makedirs("data/memory", exist_ok=True)
-    path = "data/memory/learning.json"
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            memory = json.load(f)
-    else:
-        memory = {}
+    memory = learning_memory()
     for sig in data.get("signatures", []):
-        memory[sig] = memory.get(sig, 0) + 1
-    with open(path, "w") as f:
-        json.dump(memory, f, indent=2)
+        memory.incr(sig)
     print(f"🧬 Memory evolved — {len(memory)} patterns stored.")
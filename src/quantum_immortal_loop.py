@@ -8,7 +8,9 @@ from datetime import datetime
 def evolve_cycle():
     print(f"\n🚀 [Quantum-∞] Cycle start @ {datetime.now()}")
     subprocess.run(["python3", "src/intel_feed_generator.py"])
-    subprocess.run(["python3", "src/main_controller_v11_4_quantum.py"])
+    # --incremental: later phases only see subdomains that changed since the last cycle
+    # (no --recrawl: only new hosts are crawled, so there is nothing cached to revalidate)
+    subprocess.run(["python3", "src/core/main_controller_v11_4_quantum.py", "--incremental"])
     print("✅ [Quantum-∞] Cycle complete\n")
 
 if __name__ == "__main__":
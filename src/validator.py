@@ -1,11 +1,28 @@
+import os
+import asyncio
+import aiohttp
 import requests
 import json
 from datetime import datetime
 from urllib.parse import urljoin
 
+from core.response_cache import fetch_cached, get_cached
+from core.findings import Finding
+from core.rate_limiter import shared_limiter
+from core.record_stream import RecordWriter, jsonl_path, materialize_json
+
+CONCURRENCY = 100      # issues validated at once in async mode
+PER_HOST_LIMIT = 4     # issues validated at once against one host
+ISSUE_TIMEOUT = 6      # seconds per validation request
+
+
 class AutoValidator:
-    def __init__(self, report_path="data/results/final_reports/report_latest.json"):
+    def __init__(self, report_path="data/results/final_reports/report_latest.json", cache=None, limiter=None,
+                 store=None):
         self.report_path = report_path
+        self.cache = cache  # optional core.response_cache.ResponseCache
+        self.limiter = limiter or shared_limiter()  # core.rate_limiter.RateLimiter
+        self.store = store  # optional core.findings_store.FindingsStore: validate only new/changed findings
         self.validated_issues = []
         self.payloads = {
             "xss": "<script>alert('DigitalSentinel')</script>",
@@ -18,37 +35,151 @@ class AutoValidator:
             data = json.load(f)
         return data
 
+    def _target(self, issue):
+        """Normalise an issue (dict or Finding) to (finding, vuln_type, url, payload)."""
+        finding = issue if isinstance(issue, Finding) else Finding.from_dict(issue)
+        finding.error = None  # a stale error from an earlier attempt must not outlive this one
+        return finding, finding.signature, finding.url, self.payloads.get(finding.signature)
+
+    def _judge(self, issue, vuln_type, url, payload, status, text):
+        if payload in text or status == 500:
+            issue.validated = True
+            issue.validated_timestamp = datetime.utcnow().isoformat()
+            print(f"[✅ VALID] {vuln_type.upper()} confirmed at {url}")
+        else:
+            issue.validated = False
+        return issue
+
     def validate_issue(self, issue):
-        vuln_type = issue.get("signature", "").lower()
-        url = issue.get("url")
-        payload = self.payloads.get(vuln_type)
+        """Validate one issue; returns it as a Finding, or None when it cannot be tested."""
+        issue, vuln_type, url, payload = self._target(issue)
+        if not payload or not url:
+            return None
+
+        try:
+            if self.cache is not None:
+                response = get_cached(self.cache, url, params={"test": payload}, limiter=self.limiter, timeout=6)
+                status, text = response.status, response.text
+            else:
+                attempt = 0
+                while True:
+                    with self.limiter.slot_sync(url):
+                        response = requests.get(url, params={"test": payload}, timeout=6)
+                    self.limiter.feedback(url, response.status_code, response.headers)
+                    if not self.limiter.should_retry(response.status_code, attempt):
+                        break
+                    attempt += 1
+                status, text = response.status_code, response.text
+            self._judge(issue, vuln_type, url, payload, status, text)
+        except Exception as e:
+            issue.validated = False
+            issue.error = str(e)
+
+        return issue
+
+    async def validate_issue_async(self, session, issue, timeout=ISSUE_TIMEOUT):
+        """
+        validate_issue() over a shared aiohttp session. `timeout` bounds each
+        connect and read of this issue's request, not time spent waiting for
+        a pooled connection.
+        """
+        issue, vuln_type, url, payload = self._target(issue)
         if not payload or not url:
             return None
 
+        client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+        params = {"test": payload}
         try:
-            response = requests.get(url, params={"test": payload}, timeout=6)
-            if payload in response.text or response.status_code == 500:
-                issue["validated"] = True
-                issue["validated_timestamp"] = datetime.utcnow().isoformat()
-                print(f"[✅ VALID] {vuln_type.upper()} confirmed at {url}")
+            if self.cache is not None:
+                response = await fetch_cached(session, self.cache, url, params=params, limiter=self.limiter,
+                                              timeout=client_timeout, ssl=False)
+                status, text = response.status, response.text
             else:
-                issue["validated"] = False
+                attempt = 0
+                while True:
+                    async with self.limiter.slot(url):
+                        async with session.get(url, params=params, timeout=client_timeout, ssl=False) as response:
+                            status, headers = response.status, response.headers
+                            text = await response.text(errors="replace")
+                    self.limiter.feedback(url, status, headers)
+                    if not self.limiter.should_retry(status, attempt):
+                        break
+                    attempt += 1
+            self._judge(issue, vuln_type, url, payload, status, text)
+        except asyncio.TimeoutError:
+            issue.validated = False
+            issue.error = f"Timeout after {timeout}s"
         except Exception as e:
-            issue["validated"] = False
-            issue["error"] = str(e)
+            issue.validated = False
+            issue.error = str(e)
 
         return issue
 
-    def run(self):
+    async def validate_all(self, issues, on_result=None, concurrency=CONCURRENCY, per_host=PER_HOST_LIMIT,
+                           timeout=ISSUE_TIMEOUT, resolver=None):
+        """
+        Validate issues concurrently: grouped per host, at most `per_host` in
+        flight against any one host and `concurrency` overall. `on_result`
+        sees each validated issue the moment it finishes, so one slow host
+        only holds up its own group.
+        The overall cap is the connector's: a request only takes a connection
+        once the rate limiter has let it through, so a host the limiter has
+        paused never holds one of the `concurrency` slots.
+        """
+        groups = {}
+        for issue in issues:
+            issue = issue if isinstance(issue, Finding) else Finding.from_dict(issue)
+            groups.setdefault(issue.host, []).append(issue)
+
+        connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host, resolver=resolver)
+        async with aiohttp.ClientSession(connector=connector) as session:
+
+            async def host_worker(pending):
+                for issue in pending:
+                    result = await self.validate_issue_async(session, issue, timeout)
+                    if result and on_result:
+                        on_result(result)
+
+            workers = []
+            for group in groups.values():
+                pending = iter(group)
+                workers.extend(host_worker(pending) for _ in range(min(per_host, len(group))))
+            await asyncio.gather(*workers)
+
+    def load_issues(self):
+        if self.store is not None:
+            issues = self.store.pending_validation()
+            print(f"🗃️ {len(issues)} new or changed findings to validate")
+            return issues
+        return self.load_report().get("issues", [])
+
+    def run(self, mode="async"):
         print("🧪 Running Auto-Validation module...")
-        report = self.load_report()
-        for issue in report.get("issues", []):
-            validated = self.validate_issue(issue)
-            if validated:
-                self.validated_issues.append(validated)
+        issues = self.load_issues()
 
+        os.makedirs("data/cache/validated", exist_ok=True)
         output_path = f"data/cache/validated/validated_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_path, "w") as f:
-            json.dump(self.validated_issues, f, indent=2)
+        stream_path = jsonl_path(output_path)
+        output = RecordWriter(stream_path, append=False)
+
+        def on_result(validated):
+            self.validated_issues.append(validated)
+            output.write(validated.to_dict())
+
+        try:
+            if mode == "async":
+                asyncio.run(self.validate_all(issues, on_result))
+            else:
+                for issue in issues:
+                    validated = self.validate_issue(issue)
+                    if validated:
+                        on_result(validated)
+        finally:
+            output.close()
+        materialize_json(stream_path, output_path, indent=2)
+        if self.store is not None:
+            # Untestable findings are recorded too (verdict None) so they aren't retried until they
+            # change; a check that failed (timeout, connection error) leaves its finding pending
+            self.store.mark_validated([issue for issue in issues if not issue.error])
         print(f"💾 Validation results saved → {output_path}")
         return output_path